@@ -0,0 +1,101 @@
+"""
+This script benchmarks the multi-season comparison engine in compare_seasons.py against running the old
+two-season comparison (merge, one `_Difference` column at a time, `iterrows` formatting) once per pair.
+
+Key Features:
+1. Builds synthetic season totals for N seasons (so it runs offline).
+2. Times the old pairwise loop over every consecutive pair and `compare_many_seasons` over the same panel.
+3. Checks that both produce the same rows for every pair.
+
+Usage:
+- python benchmarks/benchmark_compare_seasons.py --seasons 25 --players 500
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+from compare_seasons import STATS, compare_many_seasons
+
+
+def synthetic_season(players, rng):
+    player_ids = rng.choice(np.arange(players * 2) + 1000, players, replace=False)
+    df = pd.DataFrame({
+        "PLAYER_ID": player_ids,
+        "PLAYER_NAME": [f"Player {player_id}" for player_id in player_ids],
+        "GP": rng.integers(1, 83, players),
+    })
+    for stat in STATS:
+        df[stat] = rng.integers(0, 2000, players).astype(float)
+    return df
+
+
+# The two-season comparison as it was written before the panel engine
+def legacy_compare(current, previous, season_current, season_previous, top_n=25):
+    for df in (current, previous):
+        for stat in STATS:
+            df[f"{stat}/G"] = df[stat] / df["GP"]
+    merged = pd.merge(current[["PLAYER_ID", "PLAYER_NAME"] + [f"{stat}/G" for stat in STATS]],
+                      previous[["PLAYER_ID"] + [f"{stat}/G" for stat in STATS]],
+                      on="PLAYER_ID", suffixes=("_current", "_previous"))
+    for stat in STATS:
+        merged[f"{stat}_Difference"] = merged[f"{stat}/G_current"] - merged[f"{stat}/G_previous"]
+    merged["Overall_Difference"] = sum(merged[f"{stat}_Difference"] for stat in STATS)
+
+    def combine(stats):
+        rows = []
+        for _, row in stats.iterrows():
+            rows.append({"Player": f"{row['PLAYER_NAME']} ({season_current})",
+                         **{stat: f"{row[f'{stat}/G_current']:.1f}" for stat in STATS}})
+            rows.append({"Player": f"{row['PLAYER_NAME']} (Difference)",
+                         **{stat: f"{row[f'{stat}_Difference']:.1f}" for stat in STATS}})
+            rows.append({"Player": f"{row['PLAYER_NAME']} ({season_previous})",
+                         **{stat: f"{row[f'{stat}/G_previous']:.1f}" for stat in STATS}})
+        return pd.DataFrame(rows)
+
+    return (combine(merged.nlargest(top_n, "Overall_Difference").round(1)),
+            combine(merged.nsmallest(top_n, "Overall_Difference").round(1)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the multi-season comparison engine.")
+    parser.add_argument("--seasons", type=int, default=25, help="Number of seasons")
+    parser.add_argument("--players", type=int, default=500, help="Players per season")
+    parser.add_argument("--top", type=int, default=25, help="Players per pair and direction")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    seasons = [f"{year}-{str(year + 1)[-2:]}" for year in range(2024 - args.seasons + 1, 2025)]
+    frames = {season: synthetic_season(args.players, rng) for season in seasons}
+    pairs = list(zip(seasons[1:], seasons[:-1]))
+
+    start = time.perf_counter()
+    legacy = [legacy_compare(frames[current].copy(), frames[previous].copy(), current, previous, args.top)
+              for current, previous in pairs]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    improvements, declines = compare_many_seasons(frames, top_n=args.top)
+    engine_time = time.perf_counter() - start
+
+    same = all(
+        legacy_improvements.equals(improvements[improvements["Pair"] == f"{current} vs {previous}"]
+                                   .drop(columns="Pair").reset_index(drop=True))
+        and legacy_declines.equals(declines[declines["Pair"] == f"{current} vs {previous}"]
+                                   .drop(columns="Pair").reset_index(drop=True))
+        for (current, previous), (legacy_improvements, legacy_declines) in zip(pairs, legacy)
+    )
+    print(f"Season pairs:      {len(pairs)} ({args.players} players per season)")
+    print(f"Pairwise iterrows: {legacy_time:.3f}s")
+    print(f"Panel engine:      {engine_time:.3f}s")
+    print(f"Speedup:           {legacy_time / engine_time:.1f}x")
+    print(f"Same output:       {same}")
+
+
+if __name__ == "__main__":
+    main()
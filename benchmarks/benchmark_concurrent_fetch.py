@@ -0,0 +1,83 @@
+"""
+This script benchmarks the concurrent per-game fetch engine against the old one-game-at-a-time loop
+using fake box score endpoints, so it runs offline without reaching stats.nba.com.
+
+Key Features:
+1. `FakeEndpoint` mimics an nba_api endpoint class: it takes a `game_id`, sleeps for a fixed latency
+   and returns a small player DataFrame from `get_data_frames()`.
+2. Times a serial loop and `fetch_concurrently` over the same slate of games and three endpoints.
+3. Checks that the concurrent results come back in the same game order as the serial ones.
+
+Usage:
+- python benchmarks/benchmark_concurrent_fetch.py --games 15 --latency 0.2 --max-in-flight 8
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+# Fake endpoints cannot be stored in the response cache
+os.environ["NBA_CACHE"] = "off"
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+from concurrent_fetch import fetch_concurrently, game_frame_call
+
+
+# Fake endpoint that answers after a fixed delay, like a round trip to stats.nba.com
+class FakeEndpoint:
+    latency = 0.2
+
+    def __init__(self, game_id):
+        time.sleep(self.latency)
+        self.frame = pd.DataFrame({
+            "GAME_ID": [game_id] * 3,
+            "PLAYER_NAME": [f"Player {game_id}-{i}" for i in range(3)],
+            "PTS": [10, 20, 30],
+        })
+
+    def get_data_frames(self):
+        return [self.frame]
+
+
+# Old behaviour: one blocking call per game per endpoint
+def fetch_serial(game_ids, endpoints):
+    return [endpoint(game_id=game_id).get_data_frames()[0] for endpoint in endpoints for game_id in game_ids]
+
+
+def fetch_parallel(game_ids, endpoints, max_in_flight):
+    calls = [game_frame_call(endpoint, game_id) for endpoint in endpoints for game_id in game_ids]
+    return fetch_concurrently(calls, max_in_flight=max_in_flight)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent per-game fetching with fake endpoints.")
+    parser.add_argument("--games", type=int, default=15, help="Number of games on the slate")
+    parser.add_argument("--latency", type=float, default=0.2, help="Fake round-trip latency in seconds")
+    parser.add_argument("--max-in-flight", type=int, default=8, help="Maximum concurrent requests")
+    args = parser.parse_args()
+
+    FakeEndpoint.latency = args.latency
+    game_ids = [f"00224{i:05d}" for i in range(args.games)]
+    # Three endpoints per game, like the daily report
+    endpoints = [type(f"FakeEndpoint{i}", (FakeEndpoint,), {}) for i in range(3)]
+
+    start = time.perf_counter()
+    serial = fetch_serial(game_ids, endpoints)
+    serial_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parallel = fetch_parallel(game_ids, endpoints, args.max_in_flight)
+    parallel_time = time.perf_counter() - start
+
+    same_order = all(a.equals(b) for a, b in zip(serial, parallel)) and len(serial) == len(parallel)
+    print(f"Requests:            {len(serial)}")
+    print(f"Serial:              {serial_time:.2f}s")
+    print(f"Concurrent:          {parallel_time:.2f}s")
+    print(f"Speedup:             {serial_time / parallel_time:.1f}x")
+    print(f"Deterministic order: {same_order}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+This script benchmarks the season job runner's throughput as the number of worker processes grows,
+using a synthetic warehouse so it runs offline.
+
+Key Features:
+1. Writes synthetic league-wide player game logs for several seasons into a temporary warehouse.
+2. Runs the same (analysis, season, split) matrix with 1, 2, 4, ... worker processes, reading every input
+   from the warehouse (`NBA_DATA_SOURCE=warehouse`).
+3. Reports wall time, tasks per second and speedup over one worker for each worker count.
+
+Usage:
+- python benchmarks/benchmark_job_runner.py --seasons 6 --players 450 --games 70 --max-workers 8
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+SPLITS = ["season", "home", "away", "month-11", "month-01", "last-10"]
+
+
+# One season of player game logs with LeagueGameLog columns
+def synthetic_game_log(season, players, games, rng):
+    start_year = int(season[:4])
+    dates = pd.date_range(f"{start_year}-10-22", periods=games, freq="2D").strftime("%Y-%m-%d")
+    player_ids = np.repeat(np.arange(players) + 1000, games)
+    game_numbers = np.tile(np.arange(games), players)
+    rows = len(player_ids)
+    stats = {
+        column: rng.integers(0, high, rows)
+        for column, high in [("PTS", 40), ("REB", 15), ("AST", 12), ("STL", 4), ("BLK", 4), ("TOV", 6), ("PF", 6),
+                             ("FGM", 15), ("FGA", 25), ("FG3M", 6), ("FG3A", 12), ("FTM", 10), ("FTA", 12),
+                             ("OREB", 5), ("DREB", 10), ("MIN", 40)]
+    }
+    return pd.DataFrame({
+        "SEASON": season,
+        "GAME_DATE": dates[game_numbers],
+        "GAME_ID": [f"00{start_year % 100:02d}{number:05d}" for number in game_numbers],
+        "PLAYER_ID": player_ids,
+        "PLAYER_NAME": [f"Player {player_id}" for player_id in player_ids],
+        "TEAM_ID": player_ids % 30,
+        "TEAM_ABBREVIATION": [f"T{team:02d}" for team in player_ids % 30],
+        "MATCHUP": np.where(game_numbers % 2 == 0, "AAA vs. BBB", "AAA @ BBB"),
+        "PLUS_MINUS": rng.integers(-20, 20, rows),
+        **stats,
+    })
+
+
+def build_warehouse(path, seasons, players, games):
+    from warehouse import Warehouse
+
+    rng = np.random.default_rng(0)
+    warehouse = Warehouse(path)
+    for season in seasons:
+        logs = synthetic_game_log(season, players, games, rng)
+        games_frame = logs.drop_duplicates("GAME_ID")[["GAME_ID", "SEASON", "GAME_DATE"]].assign(
+            HOME_TEAM_ID=1, VISITOR_TEAM_ID=2
+        )
+        empty = pd.DataFrame()
+        warehouse.store_games(games_frame, {"player_game_logs": logs, "team_game_logs": empty,
+                                            "box_scores": empty, "line_scores": empty})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark job runner throughput by worker count.")
+    parser.add_argument("--seasons", type=int, default=6, help="Synthetic seasons")
+    parser.add_argument("--players", type=int, default=450, help="Players per season")
+    parser.add_argument("--games", type=int, default=70, help="Games per player")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count(), help="Largest worker count to try")
+    args = parser.parse_args()
+
+    temp_dir = tempfile.mkdtemp(prefix="nba_jobs_")
+    # Worker processes read the same settings from the environment
+    os.environ["NBA_WAREHOUSE_PATH"] = os.path.join(temp_dir, "warehouse.sqlite")
+    os.environ["NBA_DATA_SOURCE"] = "warehouse"
+    os.environ["NBA_CACHE"] = "off"
+    from job_runner import build_tasks, run_jobs, season_name
+
+    seasons = [season_name(2024 - i) for i in range(args.seasons)][::-1]
+    build_warehouse(os.environ["NBA_WAREHOUSE_PATH"], seasons, args.players, args.games)
+    # compare_seasons needs the previous season, so it runs from the second season on
+    tasks = build_tasks(["rank_season_players"], seasons, SPLITS) + build_tasks(["compare_seasons"], seasons[1:], SPLITS)
+
+    worker_counts = []
+    workers = 1
+    while workers <= max(args.max_workers or 1, 1):
+        worker_counts.append(workers)
+        workers *= 2
+
+    print(f"{len(tasks)} tasks, {args.seasons} seasons x {args.players} players x {args.games} games, "
+          f"{os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'seconds':>9} {'tasks/s':>9} {'speedup':>8} {'failed':>7}")
+    baseline = None
+    for workers in worker_counts:
+        start = time.perf_counter()
+        results = run_jobs(tasks, workers, os.path.join(temp_dir, f"out_{workers}"), prefetch=False)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        failed = sum(result["status"] != "ok" for result in results)
+        print(f"{workers:>8} {elapsed:>9.2f} {len(tasks) / elapsed:>9.1f} {baseline / elapsed:>7.1f}x {failed:>7}")
+
+
+if __name__ == "__main__":
+    main()
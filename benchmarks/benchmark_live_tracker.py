@@ -0,0 +1,115 @@
+"""
+This script measures the live top-performances tracker against a replayed night of games, comparing it
+with re-running the full top-performances query on every poll.
+
+Key Features:
+1. Synthesizes a night of box score snapshots (or uses a recorded one) and serves it with
+   benchmarks/replay_server.py in-process; nba_api is pointed at it through `NBA_STATS_BASE_URL`.
+2. Live tracker: one scoreboard call per poll, box scores for in-progress games only, one last fetch per
+   final game and incremental leaderboard updates.
+3. Full refresh: every poll fetches the box score of every started game (final or not) and rescores
+   every player, like running `get_top_performances` in a loop.
+4. Reports requests and CPU time per poll over the night, and how often the leaderboard changed.
+
+Usage:
+- python benchmarks/benchmark_live_tracker.py --games 10 --steps 60
+- python benchmarks/benchmark_live_tracker.py --replay /path/to/recorded/night
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+from replay_server import ReplayServer, synthesize
+
+
+# Poll through the whole replay; returns (requests per poll, CPU seconds per poll, leaderboard changes)
+def run_live(game_date, limit):
+    from top_performances import LiveTracker
+
+    tracker = LiveTracker(game_date, limit=limit)
+    tracker.all_final = False
+    requests, cpu, changes = [], [], 0
+    while not tracker.all_final:
+        before_requests, before_cpu = tracker.requests, time.process_time()
+        changes += tracker.poll() is not None
+        cpu.append(time.process_time() - before_cpu)
+        requests.append(tracker.requests - before_requests)
+    return requests, cpu, changes
+
+
+def run_full_refresh(game_date, limit):
+    from nba_api.stats.endpoints import boxscoretraditionalv2, scoreboardv2
+    from response_cache import fetch_endpoint
+    from scoring import score_frame
+
+    requests, cpu, changes, previous = [], [], 0, None
+    all_final = False
+    while not all_final:
+        before_cpu = time.process_time()
+        scoreboard = fetch_endpoint(scoreboardv2.ScoreboardV2, refresh=True, game_date=game_date).get_data_frames()[0]
+        started = scoreboard[scoreboard['GAME_STATUS_ID'] >= 2]['GAME_ID'].tolist()
+        frames = [fetch_endpoint(boxscoretraditionalv2.BoxScoreTraditionalV2, refresh=True,
+                                 game_id=game_id).get_data_frames()[0] for game_id in started]
+        if frames:
+            box_scores = pd.concat(frames, ignore_index=True)
+            box_scores = box_scores[box_scores['MIN'].notna()].copy()
+            box_scores['Performance_Score'] = score_frame(box_scores, "game_score")
+            top = box_scores.nlargest(limit, 'Performance_Score')
+            signature = list(zip(top['PLAYER_ID'], top['Performance_Score'].round(1)))
+            changes += signature != previous
+            previous = signature
+        cpu.append(time.process_time() - before_cpu)
+        requests.append(1 + len(started))
+        all_final = bool(len(scoreboard)) and (scoreboard['GAME_STATUS_ID'] == 3).all()
+    return requests, cpu, changes
+
+
+def report(label, requests, cpu, changes):
+    thirds = [slice(i * len(cpu) // 3, (i + 1) * len(cpu) // 3) for i in range(3)]
+    cpu_ms = " ".join(f"{sum(cpu[part]) / max(len(cpu[part]), 1) * 1000:>7.1f}" for part in thirds)
+    print(f"{label:<14} {len(requests):>6} {sum(requests):>9} {sum(requests) / len(requests):>9.1f} "
+          f"{max(requests):>8} {cpu_ms} {changes:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the live top-performances tracker on a replayed night.")
+    parser.add_argument("--replay", help="Recorded step_* directory (default: synthesize one)")
+    parser.add_argument("--date", default="2025-01-15", help="Game date of the replay")
+    parser.add_argument("--games", type=int, default=10, help="Synthetic games")
+    parser.add_argument("--steps", type=int, default=60, help="Synthetic polls")
+    parser.add_argument("--limit", type=int, default=10, help="Leaderboard size")
+    args = parser.parse_args()
+
+    replay_dir = args.replay or tempfile.mkdtemp(prefix="nba_replay_")
+    if not args.replay:
+        synthesize(replay_dir, args.games, args.steps, game_date=args.date)
+
+    # Transport settings are read at import: no cache, no rate limiting against the local server
+    os.environ["NBA_CACHE"] = "off"
+    os.environ["NBA_REQUESTS_PER_SECOND"] = "1000"
+    os.environ["NBA_BURST"] = "1000"
+    import logging
+    logging.disable(logging.INFO)
+
+    print(f"Replay: {replay_dir}")
+    print(f"{'mode':<14} {'polls':>6} {'requests':>9} {'req/poll':>9} {'max req':>8} "
+          f"{'CPU ms/poll (early/mid/late)':>23} {'changes':>8}")
+    for label, run in [("live tracker", run_live), ("full refresh", run_full_refresh)]:
+        server = ReplayServer(replay_dir).start()
+        os.environ["NBA_STATS_BASE_URL"] = server.base_url
+        from nba_api.stats.library.http import NBAStatsHTTP
+        NBAStatsHTTP.base_url = server.base_url
+        try:
+            report(label, *run(args.date, args.limit))
+        finally:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+This script compares reading a large multi-season output back as CSV, Parquet and Arrow IPC.
+
+Key Features:
+1. Builds a synthetic per-season ranking table (player, season, per-game stats, score) and writes it
+   through scripts/output_writer.py in every format available here (Parquet and Arrow need pyarrow).
+2. Times a full read, and a read of two columns filtered on the score, for each format.
+3. For CSV, also times recovering the numbers from the `Formatted_Stats` strings, which is what
+   downstream jobs had to do before.
+
+Usage:
+- python benchmarks/benchmark_output_formats.py --rows 1000000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+from output_writer import read_output, write_output
+
+STATS = ["PTS/G", "OREB/G", "DREB/G", "REB/G", "AST/G", "STL/G", "BLK/G", "TOV/G", "PLUS_MINUS/G"]
+
+
+def synthetic_rankings(rows, rng):
+    df = pd.DataFrame({
+        "PLAYER_ID": rng.integers(1, 5000, rows),
+        "SEASON": rng.choice([f"{year}-{str(year + 1)[-2:]}" for year in range(1996, 2025)], rows),
+        "GP": rng.integers(1, 83, rows),
+    })
+    df["PLAYER_NAME"] = "Player " + df["PLAYER_ID"].astype(str)
+    for stat in STATS:
+        df[stat] = rng.gamma(2.0, 2.0, rows)
+    df["Performance_Score/G"] = df[STATS].sum(axis=1)
+    return df
+
+
+def format_rankings(df):
+    formatted = df[["PLAYER_NAME", "SEASON"]].copy()
+    formatted["Formatted_Stats"] = (
+        df["PTS/G"].map("{:.1f} ppg".format) + ", " + df["REB/G"].map("{:.1f} rpg".format) + ", "
+        + df["AST/G"].map("{:.1f} apg".format)
+    )
+    formatted["Performance_Score/G"] = df["Performance_Score/G"].round(1)
+    return formatted
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark reading outputs back in each format.")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows in the synthetic output")
+    args = parser.parse_args()
+
+    df = synthetic_rankings(args.rows, np.random.default_rng(0))
+    base = os.path.join(tempfile.mkdtemp(prefix="nba_outputs_"), "season_rankings.csv")
+    formats = ["csv"]
+    try:
+        import pyarrow  # noqa: F401
+        formats += ["parquet", "arrow"]
+    except ImportError:
+        print("pyarrow is not installed; only CSV is measured")
+
+    print(f"{args.rows:,} rows")
+    print(f"{'format':<9} {'write s':>8} {'MB':>8} {'read s':>8} {'filtered read s':>16}")
+    for fmt in formats:
+        (path,), write_seconds = timed(lambda: write_output(df, base, view=format_rankings, formats=[fmt]))
+        _, read_seconds = timed(lambda: read_output(path))
+        _, filtered_seconds = timed(lambda: read_output(
+            path, columns=["PLAYER_NAME", "Performance_Score/G"], filters=[("Performance_Score/G", ">=", 50)]
+        ))
+        size = os.path.getsize(path) / 1e6
+        print(f"{fmt:<9} {write_seconds:>8.2f} {size:>8.1f} {read_seconds:>8.2f} {filtered_seconds:>16.2f}")
+
+    # Getting points per game back out of the CSV presentation means parsing text
+    csv = read_output(os.path.splitext(base)[0] + ".csv")
+    _, parse_seconds = timed(lambda: csv["Formatted_Stats"].str.extract(r"^([\d.]+) ppg")[0].astype(float))
+    print(f"CSV: parsing PTS/G back out of Formatted_Stats took {parse_seconds:.2f}s more")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+This script benchmarks the play-by-play ingestion in scripts/play_by_play.py on a synthetic full season,
+under a memory budget and without one.
+
+Key Features:
+1. Generates PlayByPlayV2-shaped frames (every column, ~450 events per game) for a season of games.
+2. Runs each mode in its own child process, which reports its own peak RSS (VmHWM):
+   - `budget`: `load_events` with the memory budget, batching the games.
+   - `all`: every raw frame held at once before parsing, as a single unbounded batch.
+3. Prints events per second, the event table size against the raw frames, and checks the clutch totals
+   against a row-by-row pass over the raw frames.
+
+Usage:
+- python benchmarks/benchmark_play_by_play.py --games 1230 --memory-mb 256
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+from benchmark_rank_players_stream import peak_rss_mb
+
+EVENT_TYPES = np.array([1, 2, 3, 4, 5, 6, 8])
+EVENT_WEIGHTS = np.array([0.19, 0.22, 0.09, 0.25, 0.07, 0.10, 0.08])
+
+
+# One PlayByPlayV2 frame: 4 periods (sometimes overtime) of random events with a running score
+def synthetic_game(game_id, rng, events_per_period=110):
+    periods = 5 if rng.random() < 0.06 else 4
+    rows = events_per_period * periods
+    period = np.repeat(np.arange(1, periods + 1), events_per_period)
+    period_length = np.where(period > 4, 300, 720)
+    seconds = (period_length - np.sort(rng.integers(0, 720, (periods, events_per_period)), axis=1).ravel()
+               * period_length // 720)
+    event_type = rng.choice(EVENT_TYPES, rows, p=EVENT_WEIGHTS)
+    home_event = rng.random(rows) < 0.5
+    points = np.select([event_type == 1, event_type == 3], [rng.choice([2, 3], rows, p=[0.65, 0.35]),
+                       (rng.random(rows) < 0.77).astype(int)], 0)
+    home_score = np.cumsum(np.where(home_event, points, 0))
+    away_score = np.cumsum(np.where(home_event, 0, points))
+    team_base = np.where(home_event, 1000, 2000) + int(game_id[-3:]) % 30 * 10
+    player1 = team_base + rng.integers(0, 10, rows)
+    assisted = (event_type == 1) & (rng.random(rows) < 0.6)
+    player2 = np.where(assisted, team_base + rng.integers(0, 10, rows), 0)
+    person1 = np.where(event_type == 8, 0, np.where(home_event, 4, 5))
+    person2 = np.where(assisted, person1, 0)
+
+    df = pd.DataFrame({
+        "GAME_ID": game_id,
+        "EVENTNUM": np.arange(rows),
+        "EVENTMSGTYPE": event_type,
+        "EVENTMSGACTIONTYPE": rng.integers(0, 100, rows),
+        "PERIOD": period,
+        "WCTIMESTRING": "7:30 PM",
+        "PCTIMESTRING": [f"{s // 60}:{s % 60:02d}" for s in seconds.tolist()],
+        "HOMEDESCRIPTION": np.where(home_event, "Home play description", None),
+        "NEUTRALDESCRIPTION": None,
+        "VISITORDESCRIPTION": np.where(home_event, None, "Visitor play description"),
+        "SCORE": np.where(points > 0, pd.Series(away_score).astype(str) + " - " + pd.Series(home_score).astype(str), None),
+        "SCOREMARGIN": np.where(points > 0, (home_score - away_score).astype(str), None),
+    })
+    for slot, ids, person in ((1, player1, person1), (2, player2, person2), (3, np.zeros(rows, int), np.zeros(rows, int))):
+        df[f"PERSON{slot}TYPE"] = person
+        df[f"PLAYER{slot}_ID"] = np.where(person > 0, ids, 0)
+        df[f"PLAYER{slot}_NAME"] = np.where(person > 0, pd.Series(ids).map("Player {}".format), None)
+        df[f"PLAYER{slot}_TEAM_ID"] = np.where(person > 0, ids // 10 * 10, None)
+        df[f"PLAYER{slot}_TEAM_CITY"] = np.where(person > 0, "City", None)
+        df[f"PLAYER{slot}_TEAM_NICKNAME"] = np.where(person > 0, "Team", None)
+        df[f"PLAYER{slot}_TEAM_ABBREVIATION"] = np.where(person > 0, "TMA", None)
+    df["VIDEO_AVAILABLE_FLAG"] = 1
+    return df
+
+
+def synthetic_fetch(game_ids, context=None, max_in_flight=None, final=True):
+    return [synthetic_game(game_id, np.random.default_rng(int(game_id))) for game_id in game_ids]
+
+
+# Clutch points per player, one row at a time over the raw frames
+def reference_points(frames):
+    totals = {}
+    for frame in frames:
+        last_home = last_away = 0
+        for row in frame.itertuples(index=False):
+            minutes, secs = row.PCTIMESTRING.split(":")
+            clutch = row.PERIOD >= 4 and int(minutes) * 60 + int(secs) <= 300 and abs(last_home - last_away) <= 5
+            if row.SCORE is not None:
+                away, home = (int(value) for value in row.SCORE.split(" - "))
+                scored = home + away - last_home - last_away
+                if clutch and row.PERSON1TYPE in (4, 5):
+                    totals[row.PLAYER1_ID] = totals.get(row.PLAYER1_ID, 0) + scored
+                last_home, last_away = home, away
+    return totals
+
+
+# Child process: ingest the season in one mode and print its peak memory, timing and table size
+def run_child(mode, games, memory_mb):
+    import play_by_play
+    play_by_play.fetch_play_by_play = synthetic_fetch
+    game_ids = [f"0022400{index:03d}" for index in range(1, games + 1)]
+
+    start = time.perf_counter()
+    if mode == "budget":
+        events = play_by_play.load_events(game_ids, memory_mb=memory_mb)
+    else:
+        frames = synthetic_fetch(game_ids)
+        events = play_by_play.EventTable.from_frames(frames, game_ids)
+    stats = play_by_play.clutch_stats(events)
+    elapsed = time.perf_counter() - start
+    print(f"{peak_rss_mb():.1f} {elapsed:.3f} {len(events)} {events.nbytes} {stats['CLUTCH_PTS'].sum()}")
+
+    if mode == "all":
+        # Row-by-row check on a sample of games
+        sample = frames[:50]
+        expected = reference_points(sample)
+        got = play_by_play.clutch_stats(play_by_play.EventTable.from_frames(sample, game_ids[:50]))
+        got = dict(zip(got["PLAYER_ID"].tolist(), got["CLUTCH_PTS"].tolist()))
+        print({player: points for player, points in got.items() if points} == {p: v for p, v in expected.items() if v})
+        print(sum(frame.memory_usage(deep=True).sum() for frame in frames))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark play-by-play ingestion under a memory budget.")
+    parser.add_argument("--games", type=int, default=1230, help="Games in the synthetic season")
+    parser.add_argument("--memory-mb", type=float, default=256, help="Memory budget for the batched mode")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.games, args.memory_mb)
+        return
+
+    results = {}
+    for mode in ("budget", "all"):
+        process = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", mode, "--games", str(args.games),
+             "--memory-mb", str(args.memory_mb)],
+            capture_output=True, cwd=tempfile.gettempdir(), text=True,
+        )
+        if process.returncode != 0:
+            raise RuntimeError(f"{mode} run failed:\n{process.stderr}")
+        results[mode] = process.stdout.strip().split("\n")
+
+    print(f"{args.games} games, budget {args.memory_mb:.0f} MB")
+    print(f"{'mode':<8} {'seconds':>8} {'events/s':>10} {'peak RSS MB':>12} {'clutch PTS':>11}")
+    for mode, lines in results.items():
+        peak, seconds, events, table_bytes, points = lines[0].split()
+        print(f"{mode:<8} {float(seconds):>8.2f} {int(events) / float(seconds):>10,.0f} {float(peak):>12.0f} {points:>11}")
+    raw_bytes = int(results["all"][2])
+    print(f"Event table: {int(table_bytes) / 1e6:.1f} MB for {int(events):,} events; raw frames: {raw_bytes / 1e6:.1f} MB")
+    print(f"Clutch points match a row-by-row pass: {results['all'][1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+This script benchmarks player-name resolution through the player index against the old approach of
+filtering the league table for an exact match and running difflib over every name on a miss.
+
+Key Features:
+1. Builds the index from nba_api's bundled static player list only, so it runs offline.
+2. Times exact lookups (with mixed case and missing accents) and misspelled-name suggestions.
+3. Reports lookups per second and microseconds per lookup for both approaches.
+
+Usage:
+- python benchmarks/benchmark_player_index.py --lookups 20000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from difflib import get_close_matches
+
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+from player_index import build_player_index, normalize_name
+
+
+def timed(label, function, queries):
+    start = time.perf_counter()
+    for query in queries:
+        function(query)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {len(queries) / elapsed:>12,.0f}/s {elapsed / len(queries) * 1e6:>10.1f} us")
+
+
+# Drop one character, like a typo
+def misspell(name, rng):
+    position = rng.randrange(1, len(name))
+    return name[:position - 1] + name[position:]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark player-name resolution.")
+    parser.add_argument("--lookups", type=int, default=20000, help="Exact lookups to time")
+    parser.add_argument("--misses", type=int, default=50, help="Misspelled lookups to time")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    index = build_player_index()
+    table = pd.DataFrame({"PLAYER_ID": index.player_ids, "PLAYER_NAME": index.names})
+    exact_queries = [normalize_name(rng.choice(index.names)).upper() for _ in range(args.lookups)]
+    table_queries = [rng.choice(index.names) for _ in range(max(args.lookups // 100, 1))]
+    miss_queries = [misspell(rng.choice(index.names), rng) for _ in range(args.misses)]
+    all_names = table["PLAYER_NAME"].tolist()
+
+    print(f"{len(index)} players indexed")
+    timed("Table filter (exact only)", lambda name: table[table["PLAYER_NAME"] == name], table_queries)
+    timed("Index resolve (case/accents)", index.resolve, exact_queries)
+    timed("difflib suggestions", lambda name: get_close_matches(name, all_names, n=5, cutoff=0.6), miss_queries)
+    timed("Index trigram suggestions", index.suggest, miss_queries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+This script benchmarks rank_players.py's streaming mode on large per-game CSV exports against reading
+every file whole, reporting rows per second and peak memory.
+
+Key Features:
+1. Writes synthetic per-game exports (one row per player per game, several files) of growing size.
+2. Runs each mode in its own child process, which reports its own peak RSS (VmHWM), so the numbers are
+   not mixed up with the parent's memory.
+3. Checks that both modes rank the same players.
+
+Usage:
+- python benchmarks/benchmark_rank_players_stream.py --rows 1000000 4000000 --files 4 --players 600
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts")
+sys.path.append(SCRIPTS_DIR)
+
+COLUMNS = {"PTS": 40, "ORB": 5, "DRB": 10, "AST": 12, "STL": 4, "BLK": 4, "TOV": 6, "PF": 6}
+
+
+def write_exports(directory, rows, files, players, rng):
+    per_file = rows // files
+    for index in range(files):
+        df = pd.DataFrame({
+            "Player": rng.integers(0, players, per_file).astype(str),
+            "Date": "2025-01-01",
+            "Tm": "AAA",
+            **{column: rng.integers(0, high, per_file) for column, high in COLUMNS.items()},
+        })
+        df["Player"] = "Player " + df["Player"]
+        df["TRB"] = df["ORB"] + df["DRB"]
+        df["+/-"] = rng.integers(-20, 20, per_file)
+        df.to_csv(os.path.join(directory, f"export_{index:02d}.csv"), index=False)
+    return per_file * files
+
+
+# Peak resident memory of this process in MB. ru_maxrss would include the parent's memory at fork time.
+def peak_rss_mb():
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+# Child process: rank the directory in one mode and print its peak memory and the ranked players
+def run_child(mode, directory, chunksize):
+    from rank_players import TOTAL_COLUMNS, find_csv_files, rank_streaming, rank_table
+
+    if mode == "stream":
+        top = rank_streaming(find_csv_files(directory), chunksize=chunksize)
+    else:
+        df = pd.concat([pd.read_csv(path) for path in find_csv_files(directory)], ignore_index=True)
+        df["G"] = 1
+        top = rank_table(df.groupby("Player", sort=False)[TOTAL_COLUMNS + ["G"]].sum().reset_index())
+    print(f"{peak_rss_mb():.1f}")
+    print(",".join(top["Player"]))
+
+
+def measure(mode, directory, chunksize):
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--child", mode, directory, "--chunksize", str(chunksize)],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, cwd=tempfile.gettempdir(), text=True,
+    )
+    output, _ = process.communicate()
+    elapsed = time.perf_counter() - start
+    if process.returncode != 0:
+        raise RuntimeError(f"{mode} run failed with status {process.returncode}")
+    peak, top = output.strip().split("\n", 1)
+    return top, elapsed, float(peak)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark streaming ingestion in rank_players.py.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 4_000_000], help="Total rows per run")
+    parser.add_argument("--files", type=int, default=4, help="CSV files per run")
+    parser.add_argument("--players", type=int, default=600, help="Distinct players")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="Rows per chunk")
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "DIR"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child[0], args.child[1], args.chunksize)
+        return
+
+    rng = np.random.default_rng(0)
+    print(f"{'rows':>10} {'mode':<9} {'seconds':>8} {'rows/s':>11} {'peak RSS MB':>12} {'same top':>9}")
+    for rows in args.rows:
+        directory = tempfile.mkdtemp(prefix="nba_exports_")
+        rows = write_exports(directory, rows, args.files, args.players, rng)
+        results = {mode: measure(mode, directory, args.chunksize) for mode in ("whole", "stream")}
+        for mode, (top, seconds, peak) in results.items():
+            same = top == results["whole"][0]
+            print(f"{rows:>10,} {mode:<9} {seconds:>8.2f} {rows / seconds:>11,.0f} {peak:>12.0f} {str(same):>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+This script reports how much memory the compact column types in scripts/schemas.py save on a full
+multi-season league game log, as held by the warehouse-backed data context or the report service.
+
+Key Features:
+1. Writes synthetic league-wide player game logs for several seasons into a temporary warehouse.
+2. Reads every season back as stored (int64/float64 numbers, object strings) and through
+   `apply_schema(..., "LeagueGameLog")`, as `DataContext.league_player_game_log` now returns it.
+3. Prints the deep memory usage per column kind before and after, the conversion time, and checks that
+   the stat totals are unchanged.
+
+Usage:
+- python benchmarks/benchmark_schemas.py --seasons 5 --players 450 --games 70
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+from benchmark_job_runner import build_warehouse
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory report for typed game logs.")
+    parser.add_argument("--seasons", type=int, default=5, help="Synthetic seasons")
+    parser.add_argument("--players", type=int, default=450, help="Players per season")
+    parser.add_argument("--games", type=int, default=70, help="Games per player")
+    args = parser.parse_args()
+
+    from schemas import apply_schema, memory_report
+    from warehouse import Warehouse
+
+    path = os.path.join(tempfile.mkdtemp(prefix="nba_schemas_"), "warehouse.sqlite")
+    seasons = [f"{year}-{str(year + 1)[-2:]}" for year in range(2025 - args.seasons, 2025)]
+    build_warehouse(path, seasons, args.players, args.games)
+    warehouse = Warehouse(path)
+
+    raw = pd.concat([warehouse.read("player_game_logs", season=season) for season in seasons], ignore_index=True)
+    # Shooting percentages as LeagueGameLog returns them
+    for made, attempted in (("FGM", "FGA"), ("FG3M", "FG3A"), ("FTM", "FTA")):
+        raw[f"{made[:-1]}_PCT"] = np.where(raw[attempted] > 0, raw[made] / raw[attempted].where(raw[attempted] > 0), np.nan)
+
+    start = time.perf_counter()
+    typed = pd.concat(
+        [apply_schema(frame, "LeagueGameLog") for _, frame in raw.groupby("SEASON", sort=False)], ignore_index=True
+    )
+    elapsed = time.perf_counter() - start
+    # Categories differ between seasons; re-apply so the concatenated names are categorical again
+    typed = apply_schema(typed, "LeagueGameLog")
+
+    print(f"{len(raw):,} player-game rows over {args.seasons} seasons; schema applied in {elapsed:.2f}s")
+    print(memory_report(raw, typed, "LeagueGameLog").to_string())
+    stats = ["PTS", "REB", "AST", "STL", "BLK", "TOV"]
+    same = (raw[stats].sum() == typed[stats].astype(np.int64).sum()).all()
+    print(f"Stat totals unchanged: {same}")
+    print(typed.dtypes.astype(str).value_counts().to_string())
+
+
+if __name__ == "__main__":
+    main()
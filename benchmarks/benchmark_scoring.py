@@ -0,0 +1,82 @@
+"""
+This script benchmarks the vectorized scoring module against the old row-wise `DataFrame.apply` path
+on a synthetic game-log table (1M rows by default).
+
+Key Features:
+1. Builds a random game-log table with every stat column used by the weight profiles.
+2. Times `df.apply(calculate_performance_score, axis=1)` (the previous implementation) against
+   `score_frame`, and all three profiles at once with `score_profiles`.
+3. Checks that both paths produce the same scores and reports rows per second for each.
+
+Usage:
+- python benchmarks/benchmark_scoring.py --rows 1000000
+- Use --apply-rows to time the slow apply path on a subset and extrapolate.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+from scoring import WEIGHT_PROFILES, score_frame, score_profiles
+
+
+# The row-wise scoring previously used by top_performances.py
+def calculate_performance_score(row):
+    score = (
+        row['PTS'] * 1.0 +
+        row['REB'] * 1.2 +
+        row['AST'] * 1.5 +
+        row['STL'] * 3.0 +
+        row['BLK'] * 3.0
+    )
+    return score
+
+
+# Random game-log table with every column the profiles use
+def build_game_logs(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    columns = sorted({column for weights in WEIGHT_PROFILES.values() for column in weights})
+    df = pd.DataFrame(rng.poisson(5, size=(rows, len(columns))).astype(np.float64), columns=columns)
+    df['PTS'] = rng.poisson(12, size=rows).astype(np.float64)
+    return df
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vectorized vs apply-based performance scoring.")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows in the synthetic game log")
+    parser.add_argument("--apply-rows", type=int, default=None, help="Rows to time the apply path on (default: all)")
+    args = parser.parse_args()
+
+    df = build_game_logs(args.rows)
+    apply_rows = min(args.apply_rows or args.rows, args.rows)
+    subset = df.iloc[:apply_rows]
+
+    apply_scores, apply_time = timed(lambda: subset.apply(calculate_performance_score, axis=1))
+    vector_scores, vector_time = timed(lambda: score_frame(df, "game_score"))
+    multi_scores, multi_time = timed(lambda: score_profiles(df, list(WEIGHT_PROFILES)))
+
+    matches = np.allclose(apply_scores.to_numpy(), vector_scores.iloc[:apply_rows].to_numpy())
+    matches = matches and np.allclose(multi_scores["game_score"].to_numpy(), vector_scores.to_numpy())
+    apply_rate = apply_rows / apply_time
+
+    print(f"Rows:                          {args.rows:,}")
+    print(f"apply (axis=1), {apply_rows:,} rows: {apply_time:.3f}s  ({apply_rate:,.0f} rows/s)")
+    print(f"score_frame, 1 profile:        {vector_time:.3f}s  ({args.rows / vector_time:,.0f} rows/s)")
+    print(f"score_profiles, {len(WEIGHT_PROFILES)} profiles:    {multi_time:.3f}s  ({args.rows / multi_time:,.0f} rows/s)")
+    print(f"Speedup (1 profile):           {(args.rows / apply_rate) / vector_time:,.0f}x")
+    print(f"Scores match:                  {matches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+This script measures zone FG% queries on a season of shots with the precomputed zone index in
+scripts/shot_chart.py, against evaluating the zones on every query with pandas.
+
+Key Features:
+1. Builds a season of shots from the synthetic league (benchmarks/synthetic_server.py) through the same
+   parser as a real ShotChartDetail response, tiled `--scale` times for bigger seasons.
+2. Times the index build, the first query of each zone set (which computes its cell membership) and the
+   median of `--repeat` runs of typical queries: all shots, one team, a date range, one player, and per
+   player and per team tables.
+3. The baseline filters a DataFrame, evaluates the zone functions on the filtered coordinates and groups
+   with pandas. Both give the same counts, which the script checks.
+
+Usage:
+- python benchmarks/benchmark_shot_chart.py
+- python benchmarks/benchmark_shot_chart.py --scale 4 --repeat 20
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+from synthetic_server import SyntheticLeague, team_id
+
+
+def synthetic_shots(season, scale):
+    from shot_chart import ShotTable, SHOT_DTYPES, parse_shots
+
+    parts = []
+    for team in range(30):
+        rows = SyntheticLeague("shotchartdetail", {"TeamID": str(team_id(team)), "SeasonNullable": season}).shot_chart()
+        parts.append(parse_shots(pd.DataFrame(rows)))
+    shots = ShotTable.concat(parts)
+    if scale > 1:
+        columns = {name: np.tile(shots.columns[name], scale).astype(dtype) for name, dtype in SHOT_DTYPES.items()}
+        shots = ShotTable(columns, shots.game_ids, shots.names)
+    return shots
+
+
+def timed(function, repeat):
+    runs, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        runs.append(time.perf_counter() - start)
+    return statistics.median(runs) * 1000, result
+
+
+# Zone counts the straightforward way: filter the frame, evaluate every zone, group with pandas
+def pandas_zone_counts(frame, zones, filters, by=None):
+    selected = frame
+    for column, values in filters.items():
+        selected = selected[selected[column].isin(values)] if column != "date" else \
+            selected[(selected["date"] >= values[0]) & (selected["date"] <= values[1])]
+    counts = {}
+    for zone in zones:
+        in_zone = selected[zone.contains(selected["x"].to_numpy(np.float64), selected["y"].to_numpy(np.float64))]
+        if by is None:
+            counts[zone.name] = (len(in_zone), int(in_zone["made"].sum()))
+        else:
+            grouped = in_zone.groupby(by)["made"].agg(["size", "sum"])
+            counts[zone.name] = (int(grouped["size"].sum()), int(grouped["sum"].sum()))
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Zone FG% query benchmark for the shot chart index.")
+    parser.add_argument("--season", default="2024-25")
+    parser.add_argument("--scale", type=int, default=1, help="Tile the synthetic season this many times")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per query; the median is reported")
+    args = parser.parse_args()
+
+    from shot_chart import ShotIndex, ZONE_SETS
+
+    start = time.perf_counter()
+    shots = synthetic_shots(args.season, args.scale)
+    print(f"{len(shots):,} shots ({shots.nbytes / 1e6:.1f} MB) built in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    index = ShotIndex(shots)
+    print(f"Index of {len(index):,} cells built in {(time.perf_counter() - start) * 1000:.1f} ms")
+    for name, zones in ZONE_SETS.items():
+        start = time.perf_counter()
+        index.membership(zones)
+        print(f"Membership of the {name} zones computed in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    frame = shots.to_frame()
+    team = int(shots.columns["team"][0])
+    player = int(shots.columns["player"][0])
+    dates = np.sort(np.unique(shots.columns["date"]))
+    first, last = str(dates[len(dates) // 4]), str(dates[len(dates) // 2])
+    queries = [
+        ("all shots", {}, None),
+        ("one team", {"teams": [team]}, None),
+        ("date range", {"start": first, "end": last}, None),
+        ("one player", {"players": [player]}, None),
+        ("per player", {}, "player"),
+        ("per team", {}, "team"),
+    ]
+    zones = ZONE_SETS["standard"]
+    print(f"{'query':<12} {'shots':>9} {'index ms':>9} {'pandas ms':>10} {'speedup':>8}  same counts")
+    for label, filters, by in queries:
+        mask = shots.mask(**filters)
+        if by is None:
+            index_ms, result = timed(lambda: index.zone_totals(zones, shots.mask(**filters)), args.repeat)
+            counts = {row["Zone"]: (int(row["FGA"]), int(row["FGM"])) for _, row in result.iterrows()}
+        else:
+            index_ms, result = timed(lambda: index.zone_table(zones, by, shots.mask(**filters)), args.repeat)
+            counts = {zone.name: (int(result[f"{zone.name} FGA"].sum()), int(result[f"{zone.name} FGM"].sum()))
+                      for zone in zones}
+        frame_filters = {}
+        if "teams" in filters:
+            frame_filters["team"] = filters["teams"]
+        if "players" in filters:
+            frame_filters["player"] = filters["players"]
+        if "start" in filters:
+            frame_filters["date"] = (int(filters["start"]), int(filters["end"]))
+        pandas_ms, expected = timed(lambda: pandas_zone_counts(frame, zones, frame_filters, by), args.repeat)
+        print(f"{label:<12} {int(mask.sum()):>9,} {index_ms:>9.2f} {pandas_ms:>10.2f} {pandas_ms / index_ms:>7.1f}x  "
+              f"{counts == expected}")
+
+
+if __name__ == "__main__":
+    main()
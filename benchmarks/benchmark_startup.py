@@ -0,0 +1,96 @@
+"""
+This script measures how long the `nba-bot` command line takes to start, for the top-level help and for
+each subcommand's help, so a heavy import added at module level shows up right away.
+
+Key Features:
+1. Every command runs in a fresh child process (`nba-bot --help`, `nba-bot <command> --help`) in an empty
+   working directory; the median and fastest wall time of `--repeat` runs are reported next to a bare
+   interpreter start.
+2. One extra run per command with `python -X importtime` lists which heavy packages (pandas, numpy,
+   nba_api, requests) it imported, and the total import time.
+3. Files the command left in its working directory are reported as side effects; `--help` should
+   create none.
+
+Usage:
+- python benchmarks/benchmark_startup.py
+- python benchmarks/benchmark_startup.py --repeat 10 --commands top-performances daily-report
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+NBA_BOT = os.path.join(REPO_DIR, "nba-bot")
+
+sys.path.append(os.path.join(REPO_DIR, "scripts"))
+from cli import COMMANDS
+
+# Top-level packages worth knowing about when they are imported at startup
+HEAVY_PACKAGES = ("pandas", "numpy", "nba_api", "requests", "pyarrow")
+
+
+def run_child(argv, work_dir, extra_flags=()):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, *extra_flags] + argv, cwd=work_dir, capture_output=True, text=True)
+    return time.perf_counter() - start, result
+
+
+# Heavy packages imported by a command, and its total import time in ms, from -X importtime
+def import_profile(argv, work_dir):
+    _, result = run_child(argv, work_dir, ("-X", "importtime"))
+    packages, total_us = set(), 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, self_us, name = line.split("|")
+        if not self_us.strip().isdigit():
+            continue
+        total_us += int(self_us)
+        module = name.strip().split(".")[0]
+        if module in HEAVY_PACKAGES:
+            packages.add(module)
+    return sorted(packages), total_us / 1000
+
+
+def measure(label, argv, repeat):
+    with tempfile.TemporaryDirectory(prefix="nba_startup_") as work_dir:
+        runs = []
+        for _ in range(repeat):
+            seconds, result = run_child(argv, work_dir)
+            if result.returncode != 0:
+                return {"label": label, "error": f"exit {result.returncode}: {result.stderr.strip().splitlines()[-1:]}"}
+            runs.append(seconds)
+        packages, import_ms = import_profile(argv, work_dir)
+        side_effects = sorted(os.listdir(work_dir))
+    return {"label": label, "median": statistics.median(runs), "fastest": min(runs), "import_ms": import_ms,
+            "packages": packages, "side_effects": side_effects, "error": None}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup time of the nba-bot command line.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per command; the median is reported")
+    parser.add_argument("--commands", nargs="+", choices=list(COMMANDS), help="Subcommands to time (default: all)")
+    args = parser.parse_args()
+
+    targets = [("python -c pass", ["-c", "pass"]), ("nba-bot --help", [NBA_BOT, "--help"])]
+    targets += [(f"nba-bot {name} --help", [NBA_BOT, name, "--help"]) for name in args.commands or COMMANDS]
+
+    print(f"{'command':<40} {'median s':>9} {'fastest s':>10} {'imports ms':>11}  heavy imports / side effects")
+    for label, argv in targets:
+        result = measure(label, argv, args.repeat)
+        if result["error"]:
+            print(f"{label:<40} {result['error']}")
+            continue
+        notes = ", ".join(result["packages"]) or "-"
+        if result["side_effects"]:
+            notes += f"; created {', '.join(result['side_effects'])}"
+        print(f"{label:<40} {result['median']:>9.3f} {result['fastest']:>10.3f} {result['import_ms']:>11.1f}  {notes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+This script times every script end to end against recorded stats.nba.com fixtures and tracks the results
+over time, so regressions show up as soon as they land.
+
+Key Features:
+1. Each scenario runs a script as a user would (command line and prompts), in its own child process and a
+   fresh working directory, with the response cache off and no rate limit. Wall time, peak RSS and the
+   exit status are recorded, and the scenario fails if its outputs are missing.
+2. Replay (`--fixtures DIR`): requests are answered from the fixtures with `--latency-ms`/`--jitter-ms` of
+   simulated network time (see scripts/fixtures.py), so runs are repeatable and need no network.
+3. Recording: `--record DIR` runs the scenarios against the live API and saves every response;
+   `--synthesize DIR` records them from the synthetic server in benchmarks/synthetic_server.py instead.
+4. Every replay run is appended to a JSONL history (`--history`, default output/benchmark_history.jsonl)
+   with the git commit. Each scenario is compared with the median of its previous runs under the same
+   latency; slowdowns above `--threshold` (default 20%) are flagged, and `--fail-on-regression` makes
+   them fail the run.
+
+Usage:
+- python benchmarks/benchmark_suite.py --synthesize /tmp/fixtures
+- python benchmarks/benchmark_suite.py --fixtures /tmp/fixtures --latency-ms 50 --repeat 3
+- python benchmarks/benchmark_suite.py --fixtures /tmp/fixtures --scenarios daily_report compare_seasons --fail-on-regression
+"""
+
+from collections import namedtuple
+from datetime import datetime
+import argparse
+import glob
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# argv is relative to the repository; outputs are globs relative to the scenario's working directory
+Scenario = namedtuple("Scenario", ["name", "argv", "outputs", "stdin"], defaults=(None,))
+
+SCENARIOS = [
+    Scenario("daily_report", ["reports/daily/daily_reports.py", "--date", "2025-01-15"],
+             ["reports/daily/daily_report_2025-01-15.txt"]),
+    Scenario("top_performances", ["scripts/top_performances.py", "--live", "--date", "2025-01-15", "--interval", "0",
+                                  "--max-polls", "2"], ["output/top_10_performances_live_2025-01-15.csv"]),
+    Scenario("rank_season_players", ["scripts/rank_season_players.py"], ["output/top_100_season_performances.csv"]),
+    Scenario("compare_seasons", ["scripts/compare_seasons.py", "--seasons", "2022-23:2024-25"], ["output/*.csv"]),
+    Scenario("defensive_impact", ["scripts/defensive_impact_analysis.py"], ["output/defensive_impact_analysis.csv"]),
+    Scenario("team_shooting_locations", ["scripts/team_shooting_locations.py"],
+             ["output/team_shooting_locations_analysis.csv"]),
+    Scenario("last_x_games", ["scripts/last_x_games.py", "--team", "LAL", "--games", "5", "10"], ["output/*.csv"]),
+    Scenario("clutch_stats", ["scripts/play_by_play.py", "--games"] + [f"00224{number:05d}" for number in range(673, 689)],
+             ["output/*.csv"]),
+    Scenario("shot_chart", ["scripts/shot_chart.py", "--season", "2024-25", "--by", "team"],
+             ["output/shot_zones_2024-25_team.csv"]),
+]
+SCENARIOS_BY_NAME = {scenario.name: scenario for scenario in SCENARIOS}
+
+# The children never touch the response cache and are never throttled, so only the scripts are timed
+CHILD_ENVIRONMENT = {"NBA_CACHE": "off", "NBA_REQUESTS_PER_SECOND": "0", "NBA_MAX_RETRIES": "0"}
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# Run one scenario in a fresh directory; wall seconds, peak RSS (MB) of the child and any error
+def run_scenario(scenario, environment):
+    with tempfile.TemporaryDirectory(prefix=f"bench_{scenario.name}_") as work_dir:
+        with open(os.path.join(work_dir, "stderr.log"), "w+") as stderr:
+            start = time.perf_counter()
+            process = subprocess.Popen([sys.executable, os.path.join(REPO_DIR, scenario.argv[0])] + scenario.argv[1:],
+                                       cwd=work_dir, env=environment, stdin=subprocess.PIPE,
+                                       stdout=subprocess.DEVNULL, stderr=stderr, text=True)
+            if scenario.stdin:
+                process.stdin.write(scenario.stdin)
+            process.stdin.close()
+            # wait4 gives the child's own resource usage, including its peak RSS (ru_maxrss, in KB on Linux)
+            _, status, usage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+            seconds = time.perf_counter() - start
+            error = None
+            if process.returncode != 0:
+                stderr.seek(0)
+                error = f"exit {process.returncode}: {stderr.read().strip().splitlines()[-1:]}"
+            else:
+                missing = [pattern for pattern in scenario.outputs if not glob.glob(os.path.join(work_dir, pattern))]
+                if missing:
+                    stderr.seek(0)
+                    errors = [line for line in stderr.read().splitlines() if "ERROR" in line]
+                    error = f"missing {', '.join(missing)}{': ' + errors[-1] if errors else ''}"
+    return seconds, usage.ru_maxrss / 1024, error
+
+
+def child_environment(**settings):
+    environment = dict(os.environ, **CHILD_ENVIRONMENT, **settings)
+    for name in ("NBA_RECORD_DIR", "NBA_REPLAY_DIR", "NBA_STATS_BASE_URL", "NBA_TRACE", "NBA_PROFILE"):
+        if name not in settings:
+            environment.pop(name, None)
+    return environment
+
+
+def record(scenarios, fixtures_dir, base_url=None):
+    settings = {"NBA_RECORD_DIR": os.path.abspath(fixtures_dir)}
+    if base_url:
+        settings["NBA_STATS_BASE_URL"] = base_url
+    environment = child_environment(**settings)
+    for scenario in scenarios:
+        seconds, _, error = run_scenario(scenario, environment)
+        print(f"Recorded {scenario.name:<26} {seconds:>7.2f}s {error or 'ok'}")
+
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as history:
+        return [json.loads(line) for line in history if line.strip()]
+
+
+# Median seconds of the earlier successful runs of a scenario under the same replay settings
+def baseline(history, scenario, latency_ms, jitter_ms):
+    seconds = [run["seconds"] for run in history if run["scenario"] == scenario and run.get("error") is None
+               and run["latency_ms"] == latency_ms and run["jitter_ms"] == jitter_ms]
+    return statistics.median(seconds) if seconds else None
+
+
+def benchmark(scenarios, args):
+    environment = child_environment(NBA_REPLAY_DIR=os.path.abspath(args.fixtures),
+                                    NBA_REPLAY_LATENCY_MS=str(args.latency_ms),
+                                    NBA_REPLAY_JITTER_MS=str(args.jitter_ms))
+    history = load_history(args.history)
+    commit = git_commit()
+    started = datetime.now().isoformat(timespec="seconds")
+    results = []
+    print(f"{'scenario':<26} {'seconds':>8} {'peak MB':>8} {'baseline':>9} {'change':>8}  status")
+    for scenario in scenarios:
+        runs = [run_scenario(scenario, environment) for _ in range(args.repeat)]
+        errors = [error for _, _, error in runs if error]
+        seconds = min(run[0] for run in runs)
+        peak_mb = max(run[1] for run in runs)
+        previous = baseline(history, scenario.name, args.latency_ms, args.jitter_ms)
+        change = seconds / previous - 1 if previous else None
+        regressed = not errors and change is not None and change > args.threshold
+        status = errors[0] if errors else "REGRESSION" if regressed else "ok"
+        print(f"{scenario.name:<26} {seconds:>8.2f} {peak_mb:>8.1f} "
+              f"{previous if previous is not None else float('nan'):>9.2f} "
+              f"{'' if change is None else f'{change:+.0%}':>8}  {status}")
+        results.append({
+            "started": started, "commit": commit, "scenario": scenario.name, "seconds": round(seconds, 4),
+            "peak_rss_mb": round(peak_mb, 1), "repeat": args.repeat, "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms, "error": errors[0] if errors else None, "regressed": regressed,
+        })
+
+    os.makedirs(os.path.dirname(args.history) or ".", exist_ok=True)
+    with open(args.history, "a", encoding="utf-8") as history_file:
+        for result in results:
+            history_file.write(json.dumps(result) + "\n")
+    print(f"Appended {len(results)} results for commit {commit or 'unknown'} to {args.history}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end script benchmarks on recorded fixtures.")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--fixtures", help="Replay the scenarios from this fixture directory")
+    mode.add_argument("--record", help="Record the scenarios' live responses into this directory")
+    mode.add_argument("--synthesize", help="Record the scenarios from the synthetic server into this directory")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS_BY_NAME), help="Scenarios to run (default: all)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Simulated latency per replayed request")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Random extra latency per replayed request")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per scenario; the fastest one is kept")
+    parser.add_argument("--history", default=os.path.join("output", "benchmark_history.jsonl"))
+    parser.add_argument("--threshold", type=float, default=0.2, help="Slowdown over the baseline that counts as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 on regressions or failures")
+    args = parser.parse_args()
+
+    scenarios = [SCENARIOS_BY_NAME[name] for name in args.scenarios] if args.scenarios else SCENARIOS
+    if args.record:
+        record(scenarios, args.record)
+    elif args.synthesize:
+        from synthetic_server import SyntheticServer
+
+        server = SyntheticServer().start()
+        try:
+            record(scenarios, args.synthesize, server.base_url)
+        finally:
+            server.stop()
+        print(f"Synthetic server requests: {server.stats()}")
+    else:
+        results = benchmark(scenarios, args)
+        if args.fail_on_regression and any(result["regressed"] or result["error"] for result in results):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+This script checks the shared nba_api transport against a local stub of stats.nba.com that injects
+429/5xx failures, comparing it with a plain `requests.Session` that gives up on the first error.
+
+Key Features:
+1. Starts benchmarks/stub_server.py in-process and points nba_api's base URL at it.
+2. Runs the same concurrent slate of box score calls through a plain session and through the transport.
+3. Reports completed/failed calls, wall time, the stub's request counts and the transport's retry
+   counters and latency histogram.
+
+Usage:
+- python benchmarks/benchmark_transport.py --calls 60 --fail-rate 0.3 --latency 0.05
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+from stub_server import StubServer
+
+
+def run_slate(calls, max_in_flight):
+    from concurrent_fetch import fetch_concurrently
+
+    def guarded(call):
+        def run():
+            try:
+                return call()
+            except Exception:
+                return None
+        return run
+
+    start = time.perf_counter()
+    results = fetch_concurrently([guarded(call) for call in calls], max_in_flight=max_in_flight)
+    return sum(result is not None for result in results), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the retrying transport against a failing stub server.")
+    parser.add_argument("--calls", type=int, default=60, help="Box score calls per run")
+    parser.add_argument("--fail-rate", type=float, default=0.3, help="Share of stub responses that are errors")
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub latency per response in seconds")
+    parser.add_argument("--max-in-flight", type=int, default=8, help="Concurrent calls")
+    parser.add_argument("--requests-per-second", type=float, default=50, help="Transport rate limit")
+    args = parser.parse_args()
+
+    # The transport reads its settings at import; keep backoff short so the run stays quick
+    os.environ["NBA_CACHE"] = "off"
+    os.environ["NBA_REQUESTS_PER_SECOND"] = str(args.requests_per_second)
+    os.environ["NBA_BURST"] = str(args.max_in_flight)
+    os.environ.setdefault("NBA_BACKOFF_BASE", "0.05")
+    os.environ.setdefault("NBA_BACKOFF_CAP", "1")
+    os.environ.setdefault("NBA_CALL_TIMEOUT", "30")
+    import requests
+    from nba_api.stats.endpoints import boxscoretraditionalv2
+    from nba_api.stats.library.http import NBAStatsHTTP
+    from response_cache import fetch_endpoint
+    from transport import get_transport_metrics
+
+    game_ids = [f"00224{i:05d}" for i in range(args.calls)]
+
+    # Plain session: nba_api calls the endpoint directly, no retries
+    stub = StubServer(fail_rate=args.fail_rate, latency=args.latency).start()
+    NBAStatsHTTP.base_url = stub.base_url
+    NBAStatsHTTP.set_session(requests.Session())
+    plain_calls = [
+        (lambda game_id=game_id: boxscoretraditionalv2.BoxScoreTraditionalV2(game_id=game_id).get_data_frames()[0])
+        for game_id in game_ids
+    ]
+    plain_ok, plain_time = run_slate(plain_calls, args.max_in_flight)
+    plain_stats = stub.stats()
+    stub.stop()
+
+    # Shared transport, installed by fetch_endpoint
+    stub = StubServer(fail_rate=args.fail_rate, latency=args.latency).start()
+    NBAStatsHTTP.base_url = stub.base_url
+    transport_calls = [
+        (lambda game_id=game_id: fetch_endpoint(boxscoretraditionalv2.BoxScoreTraditionalV2, game_id=game_id).get_data_frames()[0])
+        for game_id in game_ids
+    ]
+    transport_ok, transport_time = run_slate(transport_calls, args.max_in_flight)
+    transport_stats = stub.stats()
+    stub.stop()
+
+    print(f"Calls per run:    {args.calls} (stub fail rate {args.fail_rate:.0%})")
+    print(f"Plain session:    {plain_ok}/{args.calls} ok in {plain_time:.2f}s, stub saw {plain_stats}")
+    print(f"Shared transport: {transport_ok}/{args.calls} ok in {transport_time:.2f}s, stub saw {transport_stats}")
+    print("Transport metrics:")
+    print(json.dumps(get_transport_metrics(), indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+This script load-tests a running report service (scripts/report_service.py) with concurrent clients
+and reports throughput and latency percentiles per endpoint.
+
+Key Features:
+1. Spreads requests across the given endpoint paths with a fixed number of client threads.
+2. Measures client-side latency per request and counts non-200 responses as errors.
+3. Prints the service's own /metrics snapshot after the run.
+
+Usage:
+- python scripts/report_service.py --port 8765      # In another terminal
+- python benchmarks/load_test_service.py --requests 500 --concurrency 16 \
+    --path "/season-comparison?player1=LeBron%20James&player2=Stephen%20Curry" --path /defensive-impact
+"""
+
+import argparse
+import json
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+DEFAULT_PATHS = ["/health", "/defensive-impact?limit=10", "/shooting-locations"]
+
+
+def timed_get(url):
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=120) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except urllib.error.URLError:
+        status = 0
+    return status, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the local report service.")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8765")
+    parser.add_argument("--path", action="append", help="Endpoint path with query string (repeatable)")
+    parser.add_argument("--requests", type=int, default=200, help="Total requests")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients")
+    args = parser.parse_args()
+
+    paths = args.path or DEFAULT_PATHS
+    urls = [args.base_url + paths[i % len(paths)] for i in range(args.requests)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        results = list(executor.map(timed_get, urls))
+    wall_time = time.perf_counter() - start
+
+    print(f"{args.requests} requests, {args.concurrency} clients, {wall_time:.2f}s "
+          f"({args.requests / wall_time:.1f} req/s)")
+    print(f"{'path':<60} {'count':>6} {'errors':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for path in paths:
+        samples = [result for url, result in zip(urls, results) if url.endswith(path)]
+        latencies = np.array([seconds for _, seconds in samples]) * 1000
+        errors = sum(status != 200 for status, _ in samples)
+        print(f"{path[:60]:<60} {len(samples):>6} {errors:>6} {np.percentile(latencies, 50):>9.1f} "
+              f"{np.percentile(latencies, 95):>9.1f} {np.percentile(latencies, 99):>9.1f}")
+
+    try:
+        with urllib.request.urlopen(args.base_url + "/metrics", timeout=30) as response:
+            print("\nService metrics:")
+            print(json.dumps(json.loads(response.read()), indent=2))
+    except urllib.error.URLError as e:
+        print(f"Could not read service metrics: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+This script runs a local stand-in for stats.nba.com that plays back recorded live-game snapshots, so the
+live top-performances tracker can be run and measured offline.
+
+Key Features:
+1. Plays back a directory of steps recorded with `top_performances.py --live --record DIR`: each step
+   directory holds `scoreboardv2.json` and one `boxscoretraditionalv2_<GAME_ID>.json` per polled game.
+2. Every scoreboard request moves playback to the next step (the last step repeats). Box score requests
+   are answered from the current step, or from the latest earlier step that has the game.
+3. `--synthesize DIR` writes a synthetic night instead: games tip off at staggered times, in-progress box
+   scores accumulate stats step by step and every game ends final.
+4. Counts requests per endpoint.
+
+Usage:
+- python benchmarks/replay_server.py --synthesize /tmp/replay --games 8 --steps 40
+- python benchmarks/replay_server.py --replay /tmp/replay --port 8767
+- NBA_STATS_BASE_URL="http://127.0.0.1:8767/stats/{endpoint}" python scripts/top_performances.py --live --interval 1
+- Or start it in-process: `server = ReplayServer("/tmp/replay").start()` ... `server.stop()`
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import argparse
+import json
+import os
+import threading
+
+import numpy as np
+
+# Data sets in the order stats.nba.com returns them; nba_api's load_response needs every name
+SCOREBOARD_DATA_SETS = [
+    "GameHeader", "LineScore", "SeriesStandings", "LastMeeting", "EastConfStandingsByDay",
+    "WestConfStandingsByDay", "Available", "TeamLeaders", "TicketLinks", "WinProbability",
+]
+BOX_SCORE_DATA_SETS = ["PlayerStats", "TeamStarterBenchStats", "TeamStats"]
+
+# Stats accumulated by synthetic box scores, with the mean per step for a player on the floor
+STEP_RATES = {"FGM": 0.35, "FGA": 0.75, "FG3M": 0.1, "FG3A": 0.3, "FTM": 0.15, "FTA": 0.2, "OREB": 0.08,
+              "DREB": 0.25, "AST": 0.22, "STL": 0.06, "BLK": 0.05, "TO": 0.1, "PF": 0.1}
+
+
+class ReplayRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        endpoint = url.path.rstrip("/").rsplit("/", 1)[-1].lower()
+        parameters = {key: values[-1] for key, values in parse_qs(url.query, keep_blank_values=True).items()}
+
+        with server.lock:
+            server.requests[endpoint] = server.requests.get(endpoint, 0) + 1
+            if endpoint == "scoreboardv2":
+                server.step = min(server.step + 1, len(server.steps) - 1)
+                body = server.read(server.step, "scoreboardv2.json")
+            else:
+                name = f"{endpoint}_{parameters.get('GameID', '')}.json"
+                body = next((recorded for step in range(server.step, -1, -1)
+                             for recorded in [server.read(step, name)] if recorded is not None), None)
+
+        if body is None:
+            body = json.dumps({"error": f"no recording for {endpoint} {parameters}"}).encode("utf-8")
+            self.send_response(404)
+        else:
+            self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# Replay server running on a background thread
+class ReplayServer:
+    def __init__(self, replay_dir, host="127.0.0.1", port=0):
+        self.httpd = ThreadingHTTPServer((host, port), ReplayRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.steps = sorted(
+            os.path.join(replay_dir, name) for name in os.listdir(replay_dir) if name.startswith("step_")
+        )
+        if not self.httpd.steps:
+            raise FileNotFoundError(f"No step_* directories in {replay_dir}")
+        self.httpd.step = -1
+        self.httpd.lock = threading.Lock()
+        self.httpd.requests = {}
+        self.httpd.read = self._read
+        self._files = {}
+        self._thread = None
+
+    # Recorded response bytes, read once per file
+    def _read(self, step, name):
+        path = os.path.join(self.httpd.steps[step], name)
+        if path not in self._files:
+            if os.path.exists(path):
+                with open(path, "rb") as response_file:
+                    self._files[path] = response_file.read()
+            else:
+                self._files[path] = None
+        return self._files[path]
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/stats/{{endpoint}}"
+
+    def stats(self):
+        with self.httpd.lock:
+            return {"step": self.httpd.step, "steps": len(self.httpd.steps), "requests": dict(self.httpd.requests)}
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def result_set(name, headers, rows):
+    return {"name": name, "headers": headers, "rowSet": rows}
+
+
+def scoreboard_response(game_date, games, statuses):
+    from nba_api.stats.endpoints import scoreboardv2
+
+    expected = scoreboardv2.ScoreboardV2.expected_data
+    header = expected["GameHeader"]
+    rows = []
+    for sequence, (game_id, (home, visitor)) in enumerate(games.items(), start=1):
+        row = dict.fromkeys(header)
+        row.update(GAME_DATE_EST=f"{game_date}T00:00:00", GAME_SEQUENCE=sequence, GAME_ID=game_id,
+                   GAME_STATUS_ID=statuses[game_id], GAME_STATUS_TEXT={1: "7:00 pm ET", 2: "Live", 3: "Final"}[statuses[game_id]],
+                   HOME_TEAM_ID=home, VISITOR_TEAM_ID=visitor)
+        rows.append([row[column] for column in header])
+    return {
+        "resource": "scoreboardV2",
+        "parameters": {"GameDate": game_date, "LeagueID": "00", "DayOffset": "0"},
+        "resultSets": [result_set(name, expected[name], rows if name == "GameHeader" else [])
+                       for name in SCOREBOARD_DATA_SETS],
+    }
+
+
+def box_score_response(game_id, players, totals, minutes):
+    from nba_api.stats.endpoints import boxscoretraditionalv2
+
+    expected = boxscoretraditionalv2.BoxScoreTraditionalV2.expected_data
+    header = expected["PlayerStats"]
+    rows = []
+    for index, (player_id, team_id) in enumerate(players):
+        row = dict.fromkeys(header)
+        stats = {column: int(totals[column][index]) for column in STEP_RATES}
+        stats["REB"] = stats["OREB"] + stats["DREB"]
+        stats["PTS"] = 2 * stats["FGM"] + stats["FG3M"] + stats["FTM"]
+        row.update(GAME_ID=game_id, TEAM_ID=team_id, TEAM_ABBREVIATION=f"T{team_id % 100:02d}", PLAYER_ID=player_id,
+                   PLAYER_NAME=f"Player {player_id}", MIN=f"{int(minutes[index])}:00" if minutes[index] else None,
+                   PLUS_MINUS=0, **stats)
+        rows.append([row[column] for column in header])
+    return {
+        "resource": "boxscore",
+        "parameters": {"GameID": game_id},
+        "resultSets": [result_set(name, expected[name], rows if name == "PlayerStats" else [])
+                       for name in BOX_SCORE_DATA_SETS],
+    }
+
+
+# Write a synthetic night of `games` games over `steps` polls into replay_dir
+def synthesize(replay_dir, games=8, steps=40, players_per_team=13, game_date="2025-01-15", seed=0):
+    rng = np.random.default_rng(seed)
+    length = max(steps // 2, 2)
+    tip_offs = np.linspace(1, max(steps - length - 1, 1), games).astype(int)
+    schedule = {f"00224{index:05d}": (1610612700 + 2 * index, 1610612701 + 2 * index) for index in range(games)}
+    rosters = {
+        game_id: [(team_id * 100 + slot, team_id) for team_id in teams for slot in range(players_per_team)]
+        for game_id, teams in schedule.items()
+    }
+    totals = {game_id: {column: np.zeros(len(roster), dtype=np.int64) for column in STEP_RATES}
+              for game_id, roster in rosters.items()}
+    minutes = {game_id: np.zeros(len(roster)) for game_id, roster in rosters.items()}
+    # Starters play most of every step, the bench only some of them
+    on_floor = {game_id: np.tile(np.r_[np.full(5, 0.85), np.full(players_per_team - 5, 0.25)], 2)
+                for game_id in rosters}
+
+    for step in range(steps):
+        step_dir = os.path.join(replay_dir, f"step_{step:04d}")
+        os.makedirs(step_dir, exist_ok=True)
+        statuses = {}
+        for (game_id, roster), tip_off in zip(rosters.items(), tip_offs):
+            if step < tip_off:
+                statuses[game_id] = 1
+                continue
+            statuses[game_id] = 3 if step >= tip_off + length else 2
+            if statuses[game_id] == 2:
+                playing = rng.random(len(roster)) < on_floor[game_id]
+                minutes[game_id] += playing * 48 / length / 2
+                for column, rate in STEP_RATES.items():
+                    totals[game_id][column] += rng.poisson(rate * playing)
+            with open(os.path.join(step_dir, f"boxscoretraditionalv2_{game_id}.json"), "w", encoding="utf-8") as box_file:
+                json.dump(box_score_response(game_id, roster, totals[game_id], minutes[game_id]), box_file)
+        with open(os.path.join(step_dir, "scoreboardv2.json"), "w", encoding="utf-8") as scoreboard_file:
+            json.dump(scoreboard_response(game_date, schedule, statuses), scoreboard_file)
+    return game_date
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play back recorded live box score snapshots.")
+    parser.add_argument("--replay", help="Directory of recorded step_* snapshots to serve")
+    parser.add_argument("--synthesize", help="Write a synthetic night of snapshots to this directory and exit")
+    parser.add_argument("--games", type=int, default=8, help="Synthetic games")
+    parser.add_argument("--steps", type=int, default=40, help="Synthetic polls")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8767)
+    args = parser.parse_args()
+
+    if args.synthesize:
+        game_date = synthesize(args.synthesize, args.games, args.steps)
+        print(f"Wrote {args.steps} steps of {args.games} games on {game_date} to {args.synthesize}")
+        return
+    if not args.replay:
+        parser.error("pass --replay DIR or --synthesize DIR")
+
+    server = ReplayServer(args.replay, args.host, args.port)
+    print(f"Replaying {args.replay} on {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print(server.stats())
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+This script runs a local stand-in for stats.nba.com that answers nba_api requests with small canned
+payloads and injects failures, so the shared transport's retries and limits can be exercised offline.
+
+Key Features:
+1. Serves `/stats/<endpoint>` in the stats.nba.com `resultSets` format. Box score and game log endpoints
+   get data sets with the names nba_api expects; any other endpoint gets one generic data set.
+2. Fails a configurable share of requests with 429/5xx responses (optionally with `Retry-After`) and
+   adds a fixed latency to every response.
+3. Counts requests and injected failures per status code.
+
+Usage:
+- python benchmarks/stub_server.py --port 8766 --fail-rate 0.3 --latency 0.05
+- Point nba_api at it: `NBAStatsHTTP.base_url = "http://127.0.0.1:8766/stats/{endpoint}"`
+- Or start it in-process: `server = StubServer(fail_rate=0.3).start()` ... `server.stop()`
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import argparse
+import json
+import random
+import threading
+import time
+
+# Data set names nba_api's load_response looks up, per endpoint
+RESULT_SET_NAMES = {
+    "boxscoretraditionalv2": ["PlayerStats", "TeamStarterBenchStats", "TeamStats"],
+    "boxscoreadvancedv2": ["PlayerStats", "TeamStats"],
+    "leaguegamelog": ["LeagueGameLog"],
+    "playergamelog": ["PlayerGameLog"],
+}
+
+HEADERS = ["GAME_ID", "PLAYER_ID", "PLAYER_NAME", "MIN", "PTS", "REB", "AST", "STL", "BLK", "TO"]
+
+
+def stub_payload(endpoint, parameters):
+    game_id = parameters.get("GameID", "0022400001")
+    rows = [[game_id, 1000 + i, f"Player {i}", "30:00", 10 + i, 5, 5, 1, 1, 2] for i in range(5)]
+    names = RESULT_SET_NAMES.get(endpoint.lower(), [endpoint])
+    return {
+        "resource": endpoint,
+        "parameters": parameters,
+        "resultSets": [{"name": name, "headers": HEADERS, "rowSet": rows} for name in names],
+    }
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        endpoint = url.path.rstrip("/").rsplit("/", 1)[-1]
+        parameters = {key: values[-1] for key, values in parse_qs(url.query, keep_blank_values=True).items()}
+        time.sleep(server.latency)
+
+        with server.lock:
+            server.requests += 1
+            status = server.random.choice(server.fail_statuses) if server.random.random() < server.fail_rate else 200
+            server.statuses[status] = server.statuses.get(status, 0) + 1
+
+        if status != 200:
+            body = json.dumps({"error": "injected failure"}).encode("utf-8")
+            self.send_response(status)
+            if status == 429 and server.retry_after is not None:
+                self.send_header("Retry-After", str(server.retry_after))
+        else:
+            body = json.dumps(stub_payload(endpoint, parameters)).encode("utf-8")
+            self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# Stub server running on a background thread
+class StubServer:
+    def __init__(self, host="127.0.0.1", port=0, fail_rate=0.0, fail_statuses=(429, 500, 503),
+                 latency=0.0, retry_after=None, seed=0):
+        self.httpd = ThreadingHTTPServer((host, port), StubRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.fail_rate = fail_rate
+        self.httpd.fail_statuses = list(fail_statuses)
+        self.httpd.latency = latency
+        self.httpd.retry_after = retry_after
+        self.httpd.random = random.Random(seed)
+        self.httpd.lock = threading.Lock()
+        self.httpd.requests = 0
+        self.httpd.statuses = {}
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/stats/{{endpoint}}"
+
+    def stats(self):
+        with self.httpd.lock:
+            return {"requests": self.httpd.requests, "statuses": dict(self.httpd.statuses)}
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stats.nba.com stub with failure injection.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--fail-rate", type=float, default=0.2, help="Share of requests answered with an error")
+    parser.add_argument("--fail-status", type=int, action="append", help="Injected status codes (repeatable)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Added latency per response in seconds")
+    parser.add_argument("--retry-after", type=int, help="Retry-After seconds sent with injected 429s")
+    args = parser.parse_args()
+
+    server = StubServer(args.host, args.port, args.fail_rate, args.fail_status or (429, 500, 503),
+                        args.latency, args.retry_after)
+    print(f"Stub stats.nba.com listening on {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print(server.stats())
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,428 @@
+"""
+This script runs a local stand-in for stats.nba.com that answers every endpoint the scripts use with
+synthetic but consistent data, so a full fixture set can be recorded without reaching the real API.
+
+Key Features:
+1. One synthetic league: 30 teams of 15 players, 8 games a night. Scoreboards, box scores, line scores,
+   play-by-play, shot charts, game logs and season tables all agree on the same game IDs, teams and players.
+2. Data sets use the names, column headers and order of the real responses (from nba_api's
+   `expected_data`), including the two-level headers of `LeagueDashTeamShotLocations`.
+3. Responses are deterministic: each one is generated from a seed derived from its endpoint and parameters.
+4. Record them as fixtures by running scripts against it with `NBA_RECORD_DIR` set (see
+   benchmarks/benchmark_suite.py --synthesize).
+
+Usage:
+- python benchmarks/synthetic_server.py --port 8768
+- NBA_STATS_BASE_URL="http://127.0.0.1:8768/stats/{endpoint}" NBA_CACHE=off NBA_RECORD_DIR=fixtures python scripts/rank_season_players.py
+- Or start it in-process: `server = SyntheticServer().start()` ... `server.stop()`
+"""
+
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import argparse
+import hashlib
+import importlib
+import json
+import threading
+
+import numpy as np
+
+TEAMS = ["ATL", "BOS", "BKN", "CHA", "CHI", "CLE", "DAL", "DEN", "DET", "GSW", "HOU", "IND", "LAC", "LAL", "MEM",
+         "MIA", "MIL", "MIN", "NOP", "NYK", "OKC", "ORL", "PHI", "PHX", "POR", "SAC", "SAS", "TOR", "UTA", "WAS"]
+FIRST_NAMES = ["Aaron", "Ben", "Caleb", "Dario", "Evan", "Felix", "Gabe", "Henry", "Isaac", "Jalen", "Kevin", "Luka",
+               "Marcus", "Nate", "Oscar", "Paul", "Quinn", "Ryan", "Scott", "Tyrese", "Victor", "Wes", "Xavier",
+               "Yuri", "Zach"]
+LAST_NAMES = ["Adams", "Brooks", "Carter", "Davis", "Ellis", "Fox", "Green", "Hill", "Irving", "Jones", "King",
+              "Lopez", "Miller", "Nash", "Owens", "Parker", "Reed", "Smith"]
+PLAYERS_PER_TEAM = 15
+GAMES_PER_NIGHT = 8
+GAMES_PER_SEASON_LOG = 60
+SHOTS_PER_GAME = 85
+SEASON_OPENER = (10, 22)
+
+# Data sets in the order stats.nba.com returns them, where scripts read them by position
+DATA_SET_ORDER = {
+    "boxscoresummaryv2": ["GameSummary", "OtherStats", "Officials", "InactivePlayers", "GameInfo", "LineScore",
+                          "LastMeeting", "SeasonSeries", "AvailableVideo"],
+    "boxscoretraditionalv2": ["PlayerStats", "TeamStats", "TeamStarterBenchStats"],
+    "playbyplayv2": ["PlayByPlay", "AvailableVideo"],
+    "shotchartdetail": ["Shot_Chart_Detail", "LeagueAverages"],
+    "scoreboardv2": ["GameHeader", "LineScore", "SeriesStandings", "LastMeeting", "EastConfStandingsByDay",
+                     "WestConfStandingsByDay", "Available", "TeamLeaders", "TicketLinks", "WinProbability"],
+}
+SHOT_ZONES = ["Restricted Area", "In The Paint (Non-RA)", "Mid-Range", "Left Corner 3", "Right Corner 3",
+              "Corner 3", "Above the Break 3", "Backcourt"]
+
+
+def team_id(team):
+    return 1610612737 + team
+
+
+def player_id(player):
+    return 1630000 + player
+
+
+def player_name(player):
+    return f"{FIRST_NAMES[player % len(FIRST_NAMES)]} {LAST_NAMES[player // len(FIRST_NAMES) % len(LAST_NAMES)]}"
+
+
+# Player indexes of a team's roster
+def roster(team):
+    return [team + 30 * slot for slot in range(PLAYERS_PER_TEAM)]
+
+
+# Game number n of a season -> (home team, visitor team). Nights are rounds of a round-robin schedule,
+# so no team plays twice on the same night.
+def game_teams(number):
+    night, slot = divmod(number - 1, GAMES_PER_NIGHT)
+    rotation, pair = night % 29, (slot + night * GAMES_PER_NIGHT) % 15
+    teams = (29, rotation) if pair == 0 else ((rotation + pair) % 29, (rotation - pair) % 29)
+    return teams if night % 2 else teams[::-1]
+
+
+def game_id(season, number):
+    return f"002{season[2:4]}{number:05d}"
+
+
+def season_of_date(date):
+    day = datetime.strptime(date[:10], "%Y-%m-%d")
+    start = day.year if (day.month, day.day) >= SEASON_OPENER else day.year - 1
+    return f"{start}-{str(start + 1)[-2:]}", (day - datetime(start, *SEASON_OPENER)).days
+
+
+def game_date(season, number):
+    return (datetime(int(season[:4]), *SEASON_OPENER) + timedelta(days=number // GAMES_PER_NIGHT)).strftime("%Y-%m-%d")
+
+
+# Player strength between 0.4 and 1.6, so rankings have a spread
+def strength(player):
+    return 0.4 + (player * 37 % 100) / 83
+
+
+def stat_line(rng, player, minutes):
+    scale = strength(player) * minutes / 32
+    fga = int(rng.poisson(14 * scale))
+    fgm = int(rng.binomial(fga, 0.47))
+    fg3a = int(rng.binomial(fga, 0.38))
+    fg3m = int(rng.binomial(min(fg3a, fgm), 0.4))
+    fta = int(rng.poisson(4 * scale))
+    ftm = int(rng.binomial(fta, 0.78))
+    oreb, dreb = int(rng.poisson(1.2 * scale)), int(rng.poisson(3.8 * scale))
+    line = {
+        "FGM": fgm, "FGA": fga, "FG_PCT": round(fgm / fga, 3) if fga else 0.0,
+        "FG3M": fg3m, "FG3A": fg3a, "FG3_PCT": round(fg3m / fg3a, 3) if fg3a else 0.0,
+        "FTM": ftm, "FTA": fta, "FT_PCT": round(ftm / fta, 3) if fta else 0.0,
+        "OREB": oreb, "DREB": dreb, "REB": oreb + dreb, "AST": int(rng.poisson(3.5 * scale)),
+        "STL": int(rng.poisson(0.9 * scale)), "BLK": int(rng.poisson(0.6 * scale)),
+        "PF": int(rng.poisson(2.2)), "PTS": 2 * fgm + fg3m + ftm, "PLUS_MINUS": int(rng.integers(-20, 21)),
+    }
+    line["TO"] = line["TOV"] = int(rng.poisson(1.8 * scale))
+    return line
+
+
+def team_fields(team):
+    abbreviation = TEAMS[team]
+    return {"TEAM_ID": team_id(team), "TEAM_ABBREVIATION": abbreviation, "TEAM_NAME": f"{abbreviation} Team",
+            "TEAM_CITY": f"{abbreviation} City", "TEAM_CITY_NAME": f"{abbreviation} City", "TEAM_NICKNAME": "Team"}
+
+
+def player_fields(player):
+    return {"PLAYER_ID": player_id(player), "Player_ID": player_id(player), "CLOSE_DEF_PERSON_ID": player_id(player),
+            "PLAYER_NAME": player_name(player), **team_fields(player % 30)}
+
+
+# Value for a column the generator does not set
+def default_value(column):
+    if "PCT" in column:
+        return 0.0
+    if column.endswith("_ID") or column.endswith("_RANK"):
+        return 0
+    return None
+
+
+def result_set(name, headers, rows):
+    return {"name": name, "headers": headers, "rowSet": [[row.get(column, default_value(column)) for column in headers]
+                                                         for row in rows]}
+
+
+class SyntheticLeague:
+    def __init__(self, endpoint, parameters):
+        self.endpoint = endpoint
+        self.parameters = parameters
+        seed = hashlib.sha1(json.dumps([endpoint, sorted(parameters.items())]).encode("utf-8")).hexdigest()
+        self.rng = np.random.default_rng(int(seed[:12], 16))
+
+    def param(self, name, default=None):
+        for key, value in self.parameters.items():
+            if key.lower() == name.lower() and value != "":
+                return value
+        return default
+
+    def season(self):
+        return self.param("Season") or self.param("SeasonYear") or self.param("SeasonNullable") or "2024-25"
+
+    # Season and game number of the GameID parameter
+    def game(self):
+        value = self.param("GameID", "0022400001")
+        return f"20{value[3:5]}-{int(value[3:5]) + 1:02d}", int(value[5:])
+
+    def box_score_rows(self):
+        season, number = self.game()
+        rows = []
+        for team in game_teams(number):
+            for slot, player in enumerate(roster(team)[:12]):
+                minutes = max(0.0, 36 - slot * 3 + self.rng.normal(0, 3))
+                line = stat_line(self.rng, player, minutes)
+                rows.append({"GAME_ID": game_id(season, number), **player_fields(player), **line,
+                             "MIN": f"{int(minutes)}:{int(minutes % 1 * 60):02d}",
+                             "START_POSITION": "F" if slot < 5 else ""})
+        return rows
+
+    def line_score_rows(self):
+        season, number = self.game()
+        rng = np.random.default_rng(number)
+        return [{"GAME_ID": game_id(season, number), "GAME_DATE_EST": game_date(season, number) + "T00:00:00",
+                 **team_fields(team), "PTS": int(rng.integers(90, 135))} for team in game_teams(number)]
+
+    def scoreboard(self):
+        season, day = season_of_date(self.param("GameDate", "2025-01-15"))
+        numbers = range(day * GAMES_PER_NIGHT + 1, (day + 1) * GAMES_PER_NIGHT + 1) if day >= 0 else []
+        header = [{"GAME_ID": game_id(season, number), "GAME_STATUS_ID": 3, "GAME_STATUS_TEXT": "Final",
+                   "HOME_TEAM_ID": team_id(game_teams(number)[0]), "VISITOR_TEAM_ID": team_id(game_teams(number)[1]),
+                   "SEASON": season[:4], "GAME_SEQUENCE": sequence + 1}
+                  for sequence, number in enumerate(numbers)]
+        return {"GameHeader": header}
+
+    def player_game_log(self, player, season):
+        rows = []
+        team = player % 30
+        numbers = [number for number in range(1, GAMES_PER_SEASON_LOG * 15 + 1) if team in game_teams(number)]
+        for number in numbers[:GAMES_PER_SEASON_LOG]:
+            home, visitor = game_teams(number)
+            opponent = visitor if team == home else home
+            minutes = max(4.0, 34 - player // 30 * 2 + self.rng.normal(0, 4))
+            rows.append({"SEASON_ID": f"2{season[:4]}", **player_fields(player), "Game_ID": game_id(season, number),
+                         "GAME_ID": game_id(season, number), "GAME_DATE": game_date(season, number),
+                         "MATCHUP": f"{TEAMS[team]} {'vs.' if team == home else '@'} {TEAMS[opponent]}",
+                         "WL": "W" if self.rng.random() < 0.5 else "L", "MIN": round(minutes, 1),
+                         **stat_line(self.rng, player, minutes)})
+        return rows[::-1]
+
+    def season_player_rows(self):
+        per_game = self.param("PerMode", "Totals") == "PerGame"
+        rows = []
+        for player in range(30 * PLAYERS_PER_TEAM):
+            games = int(self.rng.integers(20, 75))
+            minutes = max(6.0, 34 - player // 30 * 2 + self.rng.normal(0, 3))
+            line = stat_line(self.rng, player, minutes * games)
+            scale = 1 / games if per_game else 1
+            stats = {key: (value if "PCT" in key else round(value * scale, 1) if per_game else value)
+                     for key, value in line.items()}
+            rows.append({**player_fields(player), "AGE": 19 + player * 7 % 18, "GP": games, "W": games // 2,
+                         "L": games - games // 2, "MIN": round(minutes * (1 if per_game else games), 1), **stats})
+        return rows
+
+    def data_sets(self):
+        endpoint = self.endpoint
+        if endpoint == "scoreboardv2":
+            return self.scoreboard()
+        if endpoint in ("boxscoretraditionalv2", "boxscoreadvancedv2"):
+            return {"PlayerStats": self.box_score_rows()}
+        if endpoint == "boxscoresummaryv2":
+            return {"LineScore": self.line_score_rows()}
+        if endpoint == "leaguedashplayerstats":
+            return {"LeagueDashPlayerStats": self.season_player_rows()}
+        if endpoint == "leaguedashteamstats":
+            return {"LeagueDashTeamStats": [
+                {**team_fields(team), "GP": 60, "W": 60 - team * 2 % 50 - 5, "L": team * 2 % 50 + 5,
+                 "FG_PCT": round(0.44 + team % 7 / 100, 3), "REB": 44.0, "AST": 25.0 + team % 5, "TOV": 13.5}
+                for team in range(30)]}
+        if endpoint == "leaguedashptdefend":
+            rows = []
+            for player in range(30 * PLAYERS_PER_TEAM):
+                defended = float(self.rng.uniform(0.38, 0.52))
+                rows.append({**player_fields(player), "PLAYER_LAST_TEAM_ID": team_id(player % 30),
+                             "PLAYER_LAST_TEAM_ABBREVIATION": TEAMS[player % 30], "GP": int(self.rng.integers(10, 75)),
+                             "D_FGM": int(self.rng.integers(50, 300)), "D_FGA": int(self.rng.integers(300, 700)),
+                             "NORMAL_FG_PCT": 0.46, "D_FG_PCT": round(defended, 3),
+                             "PCT_PLUSMINUS": round(defended - 0.46, 3)})
+            return {"LeagueDashPTDefend": rows}
+        if endpoint == "leaguegamelog":
+            season = self.season()
+            if self.param("PlayerOrTeam", "T") == "P":
+                return {"LeagueGameLog": [row for player in range(30 * PLAYERS_PER_TEAM)
+                                          for row in self.player_game_log(player, season)]}
+            rows = []
+            for number in range(1, GAMES_PER_SEASON_LOG * 15 + 1):
+                for line in SyntheticLeague("boxscoresummaryv2", {"GameID": game_id(season, number)}).line_score_rows():
+                    rows.append({**line, "GAME_DATE": game_date(season, number), "SEASON_ID": f"2{season[:4]}"})
+            return {"LeagueGameLog": rows}
+        if endpoint == "playergamelog":
+            return {"PlayerGameLog": self.player_game_log(int(self.param("PlayerID", player_id(0))) - 1630000, self.season())}
+        if endpoint == "playbyplayv2":
+            return {"PlayByPlay": self.play_by_play()}
+        if endpoint == "shotchartdetail":
+            return {"Shot_Chart_Detail": self.shot_chart()}
+        return {}
+
+    # Every shot attempt of a team's season (TeamID), with court coordinates in tenths of a foot
+    def shot_chart(self):
+        season = self.season()
+        team = int(self.param("TeamID", team_id(0))) - team_id(0)
+        numbers = [number for number in range(1, GAMES_PER_SEASON_LOG * 15 + 1) if team in game_teams(number)]
+        rows = []
+        for number in numbers[:GAMES_PER_SEASON_LOG]:
+            home, visitor = game_teams(number)
+            shooters = np.asarray(roster(team))[self.rng.integers(0, 10, SHOTS_PER_GAME)]
+            # Rim, paint, mid-range and three-point attempts
+            kind = self.rng.choice(4, size=SHOTS_PER_GAME, p=[0.3, 0.14, 0.16, 0.4])
+            distance = np.select([kind == 0, kind == 1, kind == 2],
+                                 [self.rng.uniform(0, 40, SHOTS_PER_GAME), self.rng.uniform(40, 140, SHOTS_PER_GAME),
+                                  self.rng.uniform(100, 225, SHOTS_PER_GAME)], self.rng.uniform(225, 275, SHOTS_PER_GAME))
+            angle = self.rng.uniform(0, np.pi, SHOTS_PER_GAME)
+            x = np.clip(np.round(distance * np.cos(angle)), -250, 250).astype(int)
+            y = np.round(distance * np.sin(angle)).astype(int)
+            three = ((np.abs(x) >= 220) & (y <= 92.5)) | ((np.hypot(x, y) >= 237.5) & (y > 92.5))
+            chance = np.clip(0.68 - np.hypot(x, y) / 600, 0.3, 0.7) * np.array([0.85 + 0.15 * strength(p) for p in shooters])
+            made = self.rng.random(SHOTS_PER_GAME) < chance
+            period = self.rng.integers(1, 5, SHOTS_PER_GAME)
+            clock = np.sort(self.rng.integers(0, 720, SHOTS_PER_GAME))[::-1]
+            for event in range(SHOTS_PER_GAME):
+                shooter = int(shooters[event])
+                rows.append({"GRID_TYPE": "Shot Chart Detail", "GAME_ID": game_id(season, number),
+                             "GAME_EVENT_ID": event + 1, **player_fields(shooter), **team_fields(team),
+                             "PERIOD": int(period[event]), "MINUTES_REMAINING": int(clock[event]) // 60,
+                             "SECONDS_REMAINING": int(clock[event]) % 60,
+                             "EVENT_TYPE": "Made Shot" if made[event] else "Missed Shot", "ACTION_TYPE": "Jump Shot",
+                             "SHOT_TYPE": "3PT Field Goal" if three[event] else "2PT Field Goal",
+                             "SHOT_DISTANCE": int(np.hypot(x[event], y[event]) // 10), "LOC_X": int(x[event]),
+                             "LOC_Y": int(y[event]), "SHOT_ATTEMPTED_FLAG": 1, "SHOT_MADE_FLAG": int(made[event]),
+                             "GAME_DATE": game_date(season, number).replace("-", ""), "HTM": TEAMS[home],
+                             "VTM": TEAMS[visitor]})
+        return rows
+
+    def play_by_play(self):
+        season, number = self.game()
+        home, visitor = game_teams(number)
+        rows, scores = [], [0, 0]
+        for period in range(1, 5):
+            clock = 720
+            while clock > 0:
+                clock = max(0, clock - int(self.rng.integers(5, 25)))
+                side = int(self.rng.integers(0, 2))
+                team = (home, visitor)[side]
+                shooter = roster(team)[int(self.rng.integers(0, 10))]
+                event_type = int(self.rng.choice([1, 2, 3, 4, 5, 6], p=[0.2, 0.24, 0.08, 0.3, 0.08, 0.1]))
+                points = {1: int(self.rng.choice([2, 3], p=[0.65, 0.35])), 3: int(self.rng.random() < 0.77)}.get(event_type, 0)
+                scores[side] += points
+                assisted = event_type == 1 and self.rng.random() < 0.6
+                row = {"GAME_ID": game_id(season, number), "EVENTNUM": len(rows) + 1, "EVENTMSGTYPE": event_type,
+                       "PERIOD": period, "PCTIMESTRING": f"{clock // 60}:{clock % 60:02d}",
+                       "PERSON1TYPE": 4 if side == 0 else 5, "PLAYER1_ID": player_id(shooter),
+                       "PLAYER1_NAME": player_name(shooter), "PLAYER1_TEAM_ID": team_id(team)}
+                if points:
+                    row["SCORE"] = f"{scores[1]} - {scores[0]}"
+                    row["SCOREMARGIN"] = str(scores[0] - scores[1]) if scores[0] != scores[1] else "TIE"
+                if assisted:
+                    passer = roster(team)[int(self.rng.integers(0, 10))]
+                    row.update({"PERSON2TYPE": row["PERSON1TYPE"], "PLAYER2_ID": player_id(passer),
+                                "PLAYER2_NAME": player_name(passer)})
+                rows.append(row)
+        return rows
+
+    # The response body: every data set of the endpoint, in the real order
+    def response(self):
+        if self.endpoint == "leaguedashteamshotlocations":
+            headers = [
+                {"name": "SHOT_CATEGORY", "columnSpan": 3, "columnsToSkip": 2, "columnNames": SHOT_ZONES},
+                {"name": "columns", "columnSpan": 1, "columnNames": ["TEAM_ID", "TEAM_NAME"] + ["FGM", "FGA", "FG_PCT"] * len(SHOT_ZONES)},
+            ]
+            rows = []
+            for team in range(30):
+                row = [team_id(team), team_fields(team)["TEAM_NAME"]]
+                for _ in SHOT_ZONES:
+                    attempts = int(self.rng.integers(100, 1500))
+                    made = int(self.rng.binomial(attempts, 0.45))
+                    row += [made, attempts, round(made / attempts, 3)]
+                rows.append(row)
+            return {"resource": self.endpoint, "parameters": self.parameters,
+                    "resultSets": {"name": "ShotLocations", "headers": headers, "rowSet": rows}}
+
+        module = importlib.import_module(f"nba_api.stats.endpoints.{self.endpoint}")
+        endpoint_class = next(value for value in vars(module).values()
+                              if isinstance(value, type) and getattr(value, "endpoint", None) == self.endpoint)
+        expected = endpoint_class.expected_data
+        names = DATA_SET_ORDER.get(self.endpoint, list(expected))
+        rows = self.data_sets()
+        if self.endpoint == "leaguegamelog" and self.param("PlayerOrTeam", "T") == "P":
+            expected = {"LeagueGameLog": expected["LeagueGameLog"] + ["PLAYER_ID", "PLAYER_NAME"]}
+        return {"resource": self.endpoint, "parameters": self.parameters,
+                "resultSets": [result_set(name, expected[name], rows.get(name, [])) for name in names]}
+
+
+class SyntheticRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        endpoint = url.path.rstrip("/").rsplit("/", 1)[-1].lower()
+        parameters = {key: values[-1] for key, values in parse_qs(url.query, keep_blank_values=True).items()}
+        try:
+            body, status = json.dumps(SyntheticLeague(endpoint, parameters).response()).encode("utf-8"), 200
+        except (ImportError, StopIteration) as e:
+            body, status = json.dumps({"error": f"unknown endpoint {endpoint}: {e}"}).encode("utf-8"), 404
+        with self.server.lock:
+            self.server.requests[endpoint] = self.server.requests.get(endpoint, 0) + 1
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SyntheticServer:
+    def __init__(self, host="127.0.0.1", port=0):
+        self.httpd = ThreadingHTTPServer((host, port), SyntheticRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.lock = threading.Lock()
+        self.httpd.requests = {}
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/stats/{{endpoint}}"
+
+    def stats(self):
+        with self.httpd.lock:
+            return dict(self.httpd.requests)
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic stats.nba.com for recording fixtures offline.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8768)
+    args = parser.parse_args()
+    server = SyntheticServer(args.host, args.port)
+    print(f"Serving synthetic stats at {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"Requests: {server.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,57 +1,133 @@
 """
-This script generates an extensive daily NBA report with advanced metrics, standout performances, game trends, rookie watch, and more.
+This script generates an extensive daily NBA report with standout performances, game trends, clutch performances, rookie watch, and more.
 The report is saved as a text file in the `reports/daily` folder.
+
+Sections are declared as nodes of a dependency graph (scripts/report_pipeline.py):
+- Only the requested sections and the inputs they depend on are evaluated; `--sections` or
+  `NBA_REPORT_SECTIONS` picks them (e.g. `standout_performances,rookie_watch`).
+- Independent fetches (box scores, line scores, season tables, shot locations) run concurrently.
+- Shared inputs are computed once per report, and season-wide ones once per season in a backfill.
+- A per-node timing trace is printed after each run, and written as JSON with `--trace`.
+- Rendered sections are cached by a digest of the data they are computed from (cache/report_sections).
+  On a rerun (e.g. after a stat correction) the inputs are read again, through the response cache, and
+  hashed. Only sections whose inputs changed are recomputed and re-rendered, and the report file is
+  replaced atomically, only if it changed. `--rebuild` or `NBA_REPORT_SECTION_CACHE=off` recomputes everything.
+
+Backfill mode regenerates the reports for a date range in one run:
+- Every scoreboard in the range is fetched concurrently, and the game IDs are deduplicated.
+- All box scores for the range are fetched through one worker pool.
+- Season-wide tables are fetched once per season and shared by every report of that season.
+- Reports are written in parallel, and finished dates are recorded in a checkpoint file
+  (`reports/daily/backfill_checkpoint.json`), so an interrupted backfill resumes where it stopped.
+
+Usage:
+- python reports/daily/daily_reports.py                                         # Yesterday's report
+- python reports/daily/daily_reports.py --date 2025-01-15                       # One date
+- python reports/daily/daily_reports.py --start 2025-01-01 --end 2025-01-31     # Backfill a range
+- python reports/daily/daily_reports.py --sections standout_performances,team_stats --trace trace.json
+- python reports/daily/daily_reports.py --date 2025-01-15 --rebuild                # Recompute every section
 """
 
 from nba_api.stats.endpoints import (
-    scoreboardv2, boxscoretraditionalv2, boxscoresummaryv2,
-    leaguedashplayerstats, leaguedashteamstats, boxscoreadvancedv2,
-    leaguedashteamshotlocations
+    scoreboardv2, boxscoretraditionalv2, boxscoresummaryv2
 )
 import pandas as pd
+import argparse
+import hashlib
+import json
+import logging
 import os
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
+# Shared helpers live in the scripts directory
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "scripts"))
+from concurrent_fetch import fetch_concurrently
+from data_context import DataContext
+from instrumentation import traced
+from play_by_play import clutch_stats, load_events
+from report_pipeline import Node, Pipeline, format_trace, summarize_trace
+from response_cache import current_season, log_cache_stats
+from rolling_stats import load_book
+from transport import reserve_connections
+
 # Directory to save daily reports
 daily_reports_dir = "reports/daily"
-os.makedirs(daily_reports_dir, exist_ok=True)
+
+# Pool size for the concurrent per-game box score fetch (the request rate is set in transport.py)
+max_in_flight_requests = int(os.environ.get("NBA_MAX_IN_FLIGHT", 8))
+
+# Threads writing backfilled reports
+report_writer_threads = int(os.environ.get("NBA_REPORT_WRITERS", 4))
+
+# Finished dates of the current backfill
+checkpoint_path = os.path.join(daily_reports_dir, "backfill_checkpoint.json")
+
+# Rendered sections, keyed by a digest of their inputs
+section_cache_enabled = os.environ.get("NBA_REPORT_SECTION_CACHE", "on").lower() not in ("off", "0", "false")
+section_cache_dir = os.environ.get("NBA_REPORT_SECTION_CACHE_DIR", os.path.join("cache", "report_sections"))
+
+# Bump when a section's computation or rendering changes, so older cached sections are not reused
+SECTION_CACHE_VERSION = 1
+
+# Per-game endpoints: (endpoint class, data frame index)
+GAME_ENDPOINTS = {
+    "player_stats": (boxscoretraditionalv2.BoxScoreTraditionalV2, 0),
+    "game_scores": (boxscoresummaryv2.BoxScoreSummaryV2, 5),  # LineScore DataFrame
+}
 
 # Fetch game IDs for the previous day
-def fetch_game_ids(date):
-    scoreboard = scoreboardv2.ScoreboardV2(game_date=date).get_data_frames()[0]
+def fetch_game_ids(date, context):
+    scoreboard = context.get_frame(scoreboardv2.ScoreboardV2, game_date=date)
     return scoreboard[['GAME_ID', 'HOME_TEAM_ID', 'VISITOR_TEAM_ID']]
 
+# Fetch the scoreboards of many dates at once; returns {date: game IDs}
+def fetch_game_ids_by_date(dates, context):
+    calls = [context.frame_call(scoreboardv2.ScoreboardV2, 0, game_date=date) for date in dates]
+    scoreboards = fetch_concurrently(calls, max_in_flight=max_in_flight_requests)
+    # A scoreboard lists each game once, but keep only the first occurrence of an ID across the range
+    seen = set()
+    game_ids_by_date = {}
+    for date, scoreboard in zip(dates, scoreboards):
+        game_ids_by_date[date] = [game_id for game_id in dict.fromkeys(scoreboard['GAME_ID']) if game_id not in seen]
+        seen.update(game_ids_by_date[date])
+    return game_ids_by_date
+
+# Whether the games of a date are over: any date before today (--date and --end accept today)
+def games_final(report_date):
+    return report_date < datetime.now().strftime('%Y-%m-%d')
+
+# Fetch every requested per-game endpoint for all games at once, keeping results in game order.
+# Pass final=True only for games that are over, so in-progress box scores are not cached for good.
+def fetch_game_data(game_ids, context, datasets=tuple(GAME_ENDPOINTS), final=False):
+    calls = []
+    for name in datasets:
+        endpoint_class, frame_index = GAME_ENDPOINTS[name]
+        calls.extend(context.frame_call(endpoint_class, frame_index, final=final, game_id=game_id) for game_id in game_ids)
+    frames = fetch_concurrently(calls, max_in_flight=max_in_flight_requests)
+    results = {}
+    for i, name in enumerate(datasets):
+        results[name] = pd.concat(frames[i * len(game_ids):(i + 1) * len(game_ids)], ignore_index=True) if game_ids else pd.DataFrame()
+    return results
+
 # Fetch player stats for each game
-def fetch_player_stats(game_ids):
-    all_stats = []
-    for game_id in game_ids:
-        boxscore = boxscoretraditionalv2.BoxScoreTraditionalV2(game_id=game_id).get_data_frames()[0]
-        all_stats.append(boxscore)
-    return pd.concat(all_stats, ignore_index=True)
-
-# Fetch advanced player metrics
-def fetch_advanced_metrics(game_ids):
-    all_advanced_stats = []
-    for game_id in game_ids:
-        advanced_stats = boxscoreadvancedv2.BoxScoreAdvancedV2(game_id=game_id).get_data_frames()[0]
-        all_advanced_stats.append(advanced_stats)
-    return pd.concat(all_advanced_stats, ignore_index=True)
+def fetch_player_stats(game_ids, context, final=False):
+    return fetch_game_data(game_ids, context, ["player_stats"], final)["player_stats"]
 
 # Fetch game scores for each game
-def fetch_game_scores(game_ids):
-    game_scores = []
-    for game_id in game_ids:
-        boxscore_summary = boxscoresummaryv2.BoxScoreSummaryV2(game_id=game_id).get_data_frames()[5]  # LineScore DataFrame
-        game_scores.append(boxscore_summary)
-    return pd.concat(game_scores, ignore_index=True)
+def fetch_game_scores(game_ids, context, final=False):
+    return fetch_game_data(game_ids, context, ["game_scores"], final)["game_scores"]
 
 # Fetch team stats for the season
-def fetch_team_stats():
-    team_stats = leaguedashteamstats.LeagueDashTeamStats(season="2024-25").get_data_frames()[0]
+def fetch_team_stats(context, season="2024-25"):
+    team_stats = context.team_season_stats(season)
     
-    # Debug: Print available columns
-    print("Available columns in team_stats:")
-    print(team_stats.columns)
+    # Debug: Log available columns
+    logging.debug("Available columns in team_stats: %s", team_stats.columns)
     
     # Adjust column selection based on available data
     columns_to_select = ['TEAM_NAME', 'W', 'L', 'FG_PCT', 'REB', 'AST', 'TOV']
@@ -71,19 +147,17 @@ def fetch_team_stats():
     return team_stats
 
 # Fetch team shooting efficiency by zone
-def fetch_team_shooting_locations():
-    shooting_data = leaguedashteamshotlocations.LeagueDashTeamShotLocations(season="2024-25").get_data_frames()[0]
+def fetch_team_shooting_locations(context, season="2024-25"):
+    shooting_data = context.team_shot_locations(season)
     
-    # Debug: Print available columns
-    print("Available columns in shooting_data:")
-    print(shooting_data.columns)
+    # Debug: Log available columns
+    logging.debug("Available columns in shooting_data: %s", shooting_data.columns)
     
     # Flatten the MultiIndex columns
     shooting_data.columns = ['_'.join(col).strip() if isinstance(col, tuple) else col for col in shooting_data.columns]
     
-    # Debug: Print flattened columns
-    print("Flattened columns in shooting_data:")
-    print(shooting_data.columns)
+    # Debug: Log flattened columns
+    logging.debug("Flattened columns in shooting_data: %s", shooting_data.columns)
     
     # Select relevant columns (only FG_PCT columns)
     columns_to_select = [
@@ -143,14 +217,10 @@ def identify_game_trends(game_scores):
     close_games = merged_scores.nsmallest(3, 'Point Differential')
     return blowouts, close_games
 
-# Identify rookie performances
-def identify_rookie_watch(player_stats):
-    # Fetch season stats to get the ROOKIE_FLAG
-    season_stats = leaguedashplayerstats.LeagueDashPlayerStats(season="2024-25").get_data_frames()[0]
-    
-    # Debug: Print available columns in season_stats
-    print("Available columns in season_stats:")
-    print(season_stats.columns)
+# Identify rookie performances; season_stats carries the ROOKIE_FLAG
+def identify_rookie_watch(player_stats, season_stats):
+    # Debug: Log available columns in season_stats
+    logging.debug("Available columns in season_stats: %s", season_stats.columns)
     
     # Check if ROOKIE_FLAG exists
     if 'ROOKIE_FLAG' not in season_stats.columns:
@@ -170,21 +240,16 @@ def identify_rookie_watch(player_stats):
     # Return top-performing rookies
     return rookies_in_games.nlargest(5, 'PTS')[['PLAYER_NAME', 'PTS', 'REB', 'AST']]
 
-# Identify young players (21 years old or younger) performances
-def identify_young_players_watch(player_stats):
-    # Fetch season stats to get the AGE column
-    season_stats = leaguedashplayerstats.LeagueDashPlayerStats(season="2024-25").get_data_frames()[0]
-    
-    # Debug: Print available columns in season_stats
-    print("Available columns in season_stats:")
-    print(season_stats.columns)
+# Identify young players (21 years old or younger) performances; season_stats carries the AGE column
+def identify_young_players_watch(player_stats, season_stats):
+    # Debug: Log available columns in season_stats
+    logging.debug("Available columns in season_stats: %s", season_stats.columns)
     
     # Filter players aged 21 or younger
     young_players = season_stats[season_stats['AGE'] <= 21]
     
-    # Debug: Print available columns in young_players
-    print("Available columns in young_players:")
-    print(young_players.columns)
+    # Debug: Log available columns in young_players
+    logging.debug("Available columns in young_players: %s", young_players.columns)
     
     # Merge with player_stats to get young players who played in the games
     young_players_in_games = pd.merge(
@@ -194,9 +259,8 @@ def identify_young_players_watch(player_stats):
         how='inner'
     )
     
-    # Debug: Print available columns in young_players_in_games
-    print("Available columns in young_players_in_games:")
-    print(young_players_in_games.columns)
+    # Debug: Log available columns in young_players_in_games
+    logging.debug("Available columns in young_players_in_games: %s", young_players_in_games.columns)
     
     # Rename PLAYER_NAME_y to PLAYER_NAME for clarity
     young_players_in_games = young_players_in_games.rename(columns={'PLAYER_NAME_y': 'PLAYER_NAME'})
@@ -204,60 +268,309 @@ def identify_young_players_watch(player_stats):
     # Return top-performing young players
     return young_players_in_games.nlargest(5, 'PTS')[['PLAYER_NAME', 'PTS', 'REB', 'AST']]
 
-# Placeholder for clutch performance logic
-def identify_clutch_performances(player_stats):
-    # Filter for clutch moments (e.g., last 5 minutes of close games)
-    # This will require additional logic to filter based on game context
-    return pd.DataFrame()  # Placeholder for now
+# Refresh every player's running sums from tonight's box scores and return form lines for the given players,
+# as of tonight. Pass a loaded book to apply several nights before saving it once. Nights missing between the
+# book's newest game and tonight (all of them for a new book) are filled from the season's league game log.
+def refresh_form_lines(player_stats, game_date, player_ids, context, book=None):
+    save = book is None
+    book = book or load_book(current_season(datetime.strptime(game_date, '%Y-%m-%d')))
+    last_date = book.last_game_date()
+    previous_day = (datetime.strptime(game_date, '%Y-%m-%d') - timedelta(days=1)).strftime('%Y-%m-%d')
+    if last_date is None or last_date < previous_day:
+        book.seed(context.league_player_game_log(book.season), before=game_date, after=last_date)
+    book.update_from_box_scores(player_stats, game_date)
+    if save:
+        book.save()
+    return book.form_lines(player_ids, as_of=game_date)
+
+# Identify clutch performances (last 5 minutes of the fourth quarter or overtime, margin of 5 or less)
+def identify_clutch_performances(play_by_play):
+    clutch = clutch_stats(play_by_play)
+    clutch = clutch[(clutch['CLUTCH_PTS'] > 0) | (clutch['CLUTCH_AST'] > 0)]
+    return clutch.head(5)[['PLAYER_NAME', 'CLUTCH_PTS', 'CLUTCH_AST', 'CLUTCH_TOV']]
+
+# Season of a report date, e.g. "2024-25"
+def season_of(report_date):
+    return current_season(datetime.strptime(report_date, '%Y-%m-%d'))
+
+# Report graph: every input and section is a node naming the values it needs. Season-wide nodes are scoped to
+# the season, so a backfill computes them once per season. Fetches are source nodes: the section cache hashes
+# their data.
+REPORT_NODES = [
+    Node("game_ids", lambda context, report_date: fetch_game_ids(report_date, context)['GAME_ID'].tolist(),
+         ("context", "report_date"), source=True),
+    Node("player_stats", lambda game_ids, context, report_date: fetch_player_stats(
+        game_ids, context, games_final(report_date)), ("game_ids", "context", "report_date"), source=True),
+    Node("game_scores", lambda game_ids, context, report_date: fetch_game_scores(
+        game_ids, context, games_final(report_date)), ("game_ids", "context", "report_date"), source=True),
+    Node("play_by_play", lambda game_ids, context, report_date: load_events(
+        game_ids, context, max_in_flight=max_in_flight_requests, final=games_final(report_date)
+    ), ("game_ids", "context", "report_date"), source=True),
+    Node("season_stats", lambda context, season: context.player_season_stats(season), ("context", "season"), ("season",),
+         source=True),
+    Node("team_stats", fetch_team_stats, ("context", "season"), ("season",), source=True),
+    Node("shooting_stats", fetch_team_shooting_locations, ("context", "season"), ("season",), source=True),
+    Node("standout_performances", identify_standout_performances, ("player_stats",)),
+    Node("game_trends", identify_game_trends, ("game_scores",)),
+    Node("blowouts", lambda game_trends: game_trends[0], ("game_trends",)),
+    Node("close_games", lambda game_trends: game_trends[1], ("game_trends",)),
+    Node("young_players", identify_young_players_watch, ("player_stats", "season_stats")),
+    Node("rookie_watch", identify_rookie_watch, ("player_stats", "season_stats")),
+    Node("clutch_performances", identify_clutch_performances, ("play_by_play",)),
+    Node("form_lines", lambda player_stats, standout_performances, report_date, context, book: refresh_form_lines(
+        player_stats, report_date, player_stats.loc[standout_performances.index, 'PLAYER_ID'].unique(), context, book
+    ), ("player_stats", "standout_performances", "report_date", "context", "book")),
+]
+report_pipeline = Pipeline(REPORT_NODES)
+
+# Section titles in report order
+SECTION_TITLES = {
+    "standout_performances": "Standout Performances",
+    "form_lines": "Form Lines (Standout Players)",
+    "blowouts": "Game Trends:\nLargest Blowouts",
+    "close_games": "Closest Games",
+    "young_players": "Young Players Watch",
+    "rookie_watch": "Rookie Watch",
+    "clutch_performances": "Clutch Performances",
+    "team_stats": "Team Stats",
+    "shooting_stats": "Shooting Efficiency by Zone",
+}
+
+# Sections written by default; NBA_REPORT_SECTIONS or --sections picks others (comma-separated)
+DEFAULT_SECTIONS = ["standout_performances", "form_lines", "blowouts", "close_games", "young_players",
+                    "clutch_performances", "team_stats", "shooting_stats"]
+# Section names from a comma-separated list, ignoring spaces and empty entries
+def parse_sections(text):
+    return [name.strip() for name in text.split(",") if name.strip()]
+
+report_sections = parse_sections(os.environ.get("NBA_REPORT_SECTIONS", ",".join(DEFAULT_SECTIONS)))
+
+# Threads evaluating independent report nodes
+report_node_threads = int(os.environ.get("NBA_REPORT_NODE_THREADS", 4))
+
+# Render one section as it appears in the report
+def render_section(name, frame):
+    return f"{SECTION_TITLES[name]}:\n{frame.to_string(index=False)}\n\n"
+
+def section_cache_path(name, key):
+    return os.path.join(section_cache_dir, name, f"{key}.txt")
+
+# Cached rendering of a section, or None
+def load_cached_section(name, key):
+    path = section_cache_path(name, key)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as section_file:
+        return section_file.read()
+
+def save_cached_section(name, key, text):
+    path = section_cache_path(name, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as section_file:
+        section_file.write(text)
+    os.replace(temp_path, path)
+
+# Evaluate and render the requested sections of one date's report; game_ids and game_data may be prefetched
+# (backfill). memo shares season-wide nodes across dates; the node timings are appended to trace and the
+# unchanged/recomputed section counts added to counts.
+def build_report_sections(report_date, context, game_ids=None, game_data=None, book=None, sections=None,
+                          memo=None, trace=None, rebuild=False, counts=None):
+    sections = sections or report_sections
+    unknown = [name for name in sections if name not in SECTION_TITLES]
+    if unknown:
+        raise ValueError(f"Unknown report sections: {', '.join(unknown)} (available: {', '.join(SECTION_TITLES)})")
+    inputs = {"report_date": report_date, "context": context, "season": season_of(report_date), "book": book}
+    # Every node thread may run a fetch pool of its own
+    reserve_connections(report_node_threads * max_in_flight_requests)
+    if game_ids is not None:
+        inputs["game_ids"] = game_ids
+    inputs.update(game_data or {})
+
+    # The fetches and the stale sections are two pipeline runs; offset the second run's start times so one
+    # trace covers both
+    build_start = time.perf_counter()
+
+    def run(targets):
+        offset = time.perf_counter() - build_start
+        results, node_trace = report_pipeline.run(targets, inputs, memo=memo, max_workers=report_node_threads)
+        if trace is not None:
+            trace.extend(dict(entry, date=report_date, start=round(entry["start"] + offset, 6)) for entry in node_trace)
+        return results
+
+    texts, keys = {}, {}
+    if section_cache_enabled:
+        # Fetch (and hash) only the data the sections are computed from. The rolling-stats book is state rather
+        # than data, so form lines have no key and are always recomputed.
+        inputs.update(run(report_pipeline.sources(sections, inputs)))
+        digests = report_pipeline.digests(sections, {name: value for name, value in inputs.items() if name != "book"})
+        for name, digest in digests.items():
+            if digest is not None:
+                keys[name] = hashlib.sha1(f"{SECTION_CACHE_VERSION}:{digest}".encode("utf-8")).hexdigest()
+                text = None if rebuild else load_cached_section(name, keys[name])
+                if text is not None:
+                    texts[name] = text
+
+    stale = [name for name in sections if name not in texts]
+    if stale:
+        results = run(stale)
+        for name in stale:
+            texts[name] = render_section(name, results[name])
+            if name in keys:
+                save_cached_section(name, keys[name], texts[name])
+    print(f"{report_date}: {len(sections) - len(stale)} sections unchanged, {len(stale)} recomputed"
+          f"{' (' + ', '.join(stale) + ')' if stale else ''}")
+    if counts is not None:
+        counts["unchanged"] += len(sections) - len(stale)
+        counts["recomputed"] += len(stale)
+    return {name: texts[name] for name in sections}
+
+# Assemble the rendered sections in report order and replace the report file atomically (if it changed)
+@traced("write")
+def write_report(report_date, sections):
+    report_path = os.path.join(daily_reports_dir, f"daily_report_{report_date}.txt")
+    report = f"Daily NBA Report for {report_date}\n" + "=" * 30 + "\n\n"
+    report += "".join(sections[name] for name in SECTION_TITLES if name in sections)
+    if os.path.exists(report_path):
+        with open(report_path, encoding="utf-8") as report_file:
+            if report_file.read() == report:
+                return report_path
+    temp_path = f"{report_path}.{threading.get_ident()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as report_file:
+        report_file.write(report)
+    os.replace(temp_path, report_path)
+    return report_path
+
+# Write the node timings as JSON
+def save_trace(trace, trace_path):
+    with open(trace_path, "w", encoding="utf-8") as trace_file:
+        json.dump(trace, trace_file, indent=2)
+    print(f"Report trace saved to {trace_path}")
 
 # Main execution
-def generate_daily_report():
-    previous_day = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
-    games = fetch_game_ids(previous_day)
-    game_ids = games['GAME_ID'].tolist()
-
-    player_stats = fetch_player_stats(game_ids)
-    game_scores = fetch_game_scores(game_ids)
-    team_stats = fetch_team_stats()
-    shooting_stats = fetch_team_shooting_locations()
-
-    print("Available columns in team_stats:")
-    print(team_stats.columns)
-
-    standout_performances = identify_standout_performances(player_stats)
-    blowouts, close_games = identify_game_trends(game_scores)
-    young_players = identify_young_players_watch(player_stats)
-
-    report_path = os.path.join(daily_reports_dir, f"daily_report_{previous_day}.txt")
-    with open(report_path, "w", encoding="utf-8") as report_file:
-        report_file.write(f"Daily NBA Report for {previous_day}\n")
-        report_file.write("=" * 30 + "\n\n")
-
-        report_file.write("Standout Performances:\n")
-        report_file.write(standout_performances.to_string(index=False))
-        report_file.write("\n\n")
-
-        report_file.write("Game Trends:\n")
-        report_file.write("Largest Blowouts:\n")
-        report_file.write(blowouts.to_string(index=False))
-        report_file.write("\n\nClosest Games:\n")
-        report_file.write(close_games.to_string(index=False))
-        report_file.write("\n\n")
-
-        report_file.write("Young Players Watch:\n")
-        report_file.write(young_players.to_string(index=False))
-        report_file.write("\n\n")
-
-        report_file.write("Team Stats:\n")
-        report_file.write(team_stats.to_string(index=False))
-        report_file.write("\n\n")
-
-        report_file.write("Shooting Efficiency by Zone:\n")
-        report_file.write(shooting_stats.to_string(index=False))
-        report_file.write("\n\n")
+def generate_daily_report(report_date=None, context=None, sections=None, trace_path=None, rebuild=False):
+    report_date = report_date or (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+    context = context or DataContext()
+    game_ids = fetch_game_ids(report_date, context)['GAME_ID'].tolist()
+    if not game_ids:
+        print(f"No games on {report_date}; no report written")
+        return
+    trace = []
+    report_path = write_report(report_date, build_report_sections(report_date, context, game_ids, sections=sections,
+                                                                  trace=trace, rebuild=rebuild))
 
     print(f"Daily report saved to {report_path}")
+    print(format_trace(trace))
+    if trace_path:
+        save_trace(trace, trace_path)
+    print(f"Data context: {context.summary()}")
+    log_cache_stats()
+
+# Dates of a backfill already written, if the checkpoint belongs to the same range
+def load_checkpoint(start, end):
+    if not os.path.exists(checkpoint_path):
+        return set()
+    with open(checkpoint_path, encoding="utf-8") as checkpoint_file:
+        checkpoint = json.load(checkpoint_file)
+    if (checkpoint.get("start"), checkpoint.get("end")) != (start, end):
+        return set()
+    return set(checkpoint.get("completed", []))
+
+def save_checkpoint(start, end, completed):
+    temp_path = f"{checkpoint_path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as checkpoint_file:
+        json.dump({"start": start, "end": end, "completed": sorted(completed)}, checkpoint_file, indent=2)
+    os.replace(temp_path, checkpoint_path)
+
+# Regenerate the reports of every date from start to end (inclusive)
+def backfill_daily_reports(start, end, resume=True, sections=None, trace_path=None, rebuild=False):
+    day, last = datetime.strptime(start, '%Y-%m-%d'), datetime.strptime(end, '%Y-%m-%d')
+    dates = []
+    while day <= last:
+        dates.append(day.strftime('%Y-%m-%d'))
+        day += timedelta(days=1)
+
+    completed = load_checkpoint(start, end) if resume else set()
+    pending = [date for date in dates if date not in completed]
+    print(f"Backfilling {len(pending)} of {len(dates)} dates ({len(completed)} already done)")
+    if not pending:
+        return
+
+    context = DataContext()
+    game_ids_by_date = fetch_game_ids_by_date(pending, context)
+    all_game_ids = [game_id for date in pending for game_id in game_ids_by_date[date]]
+    print(f"Fetching box scores for {len(all_game_ids)} games")
+    # One pool for the whole range; the per-date lookups below are then served from the context
+    for final in (True, False):
+        game_ids = [game_id for date in pending if games_final(date) == final for game_id in game_ids_by_date[date]]
+        if game_ids:
+            fetch_game_data(game_ids, context, ["player_stats", "game_scores"], final)
+
+    checkpoint_lock = threading.Lock()
+
+    def write_and_record(report_date, sections):
+        report_path = write_report(report_date, sections)
+        with checkpoint_lock:
+            completed.add(report_date)
+            save_checkpoint(start, end, completed)
+        return report_path
+
+    # Sections are built in date order so each night's box scores reach the rolling-stats book in order;
+    # rendering and writing the files runs in parallel
+    books = {}
+    memo = {}
+    trace = []
+    counts = Counter()
+    with ThreadPoolExecutor(max_workers=report_writer_threads) as writers:
+        futures = []
+        for report_date in pending:
+            game_ids = game_ids_by_date[report_date]
+            if not game_ids:
+                print(f"No games on {report_date}; skipping")
+                with checkpoint_lock:
+                    completed.add(report_date)
+                    save_checkpoint(start, end, completed)
+                continue
+            season = season_of(report_date)
+            if season not in books:
+                books[season] = load_book(season)
+            report = build_report_sections(report_date, context, game_ids, book=books[season], sections=sections,
+                                           memo=memo, trace=trace, rebuild=rebuild, counts=counts)
+            futures.append(writers.submit(write_and_record, report_date, report))
+        for book in books.values():
+            book.save()
+        for future in futures:
+            print(f"Daily report saved to {future.result()}")
+
+    print(summarize_trace(trace))
+    print(f"Sections: {counts['unchanged']} unchanged, {counts['recomputed']} recomputed")
+    if trace_path:
+        save_trace(trace, trace_path)
+    print(f"Data context: {context.summary()}")
+    log_cache_stats()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate the daily NBA report, or backfill a date range.")
+    parser.add_argument("--date", help="Report date (YYYY-MM-DD); defaults to yesterday")
+    parser.add_argument("--start", help="First date of a backfill (YYYY-MM-DD)")
+    parser.add_argument("--end", help="Last date of a backfill (YYYY-MM-DD); defaults to yesterday")
+    parser.add_argument("--restart", action="store_true", help="Ignore the backfill checkpoint")
+    parser.add_argument("--sections", help=f"Comma-separated sections to write (available: {', '.join(SECTION_TITLES)})")
+    parser.add_argument("--trace", help="Write the per-node timing trace to this JSON file")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute every section instead of reusing unchanged ones")
+    return parser.parse_args()
 
 # Run the script
+def main():
+    args = parse_args()
+    os.makedirs(daily_reports_dir, exist_ok=True)
+    sections = parse_sections(args.sections) if args.sections else None
+    if args.start:
+        end = args.end or (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+        backfill_daily_reports(args.start, end, resume=not args.restart, sections=sections, trace_path=args.trace,
+                               rebuild=args.rebuild)
+    else:
+        generate_daily_report(args.date, sections=sections, trace_path=args.trace, rebuild=args.rebuild)
+
 if __name__ == "__main__":
-    generate_daily_report()
\ No newline at end of file
+    main()
@@ -1,9 +1,7 @@
+import argparse
 import os
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-
 # Directory to clear
 output_dir = "output"
 
@@ -24,4 +22,14 @@ def clear_output_folder(directory):
         logging.warning(f"Directory {directory} does not exist.")
 
 # Main execution
-clear_output_folder(output_dir)
\ No newline at end of file
+def main():
+    parser = argparse.ArgumentParser(description="Delete the files in the output directory.")
+    parser.add_argument("--dir", default=output_dir, help="Directory to clear")
+    args = parser.parse_args()
+
+    # Configure logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    clear_output_folder(args.dir)
+
+if __name__ == "__main__":
+    main()
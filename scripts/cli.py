@@ -0,0 +1,94 @@
+"""
+This module is the `nba-bot` command line: one entry point with a subcommand per script.
+
+Key Features:
+1. The subcommand table is static, so `nba-bot --help` and argument errors import nothing beyond the
+   standard library.
+2. A subcommand imports only its own script (and through it pandas, numpy and nba_api) and then calls the
+   script's `main()`, with the remaining arguments as its command line. Every script's options work
+   unchanged: `nba-bot top-performances --day today` runs `python scripts/top_performances.py --day today`.
+3. Scripts do nothing when they are imported (no logging setup, directories or prompts), so the analysis
+   functions can be imported from other code without side effects.
+
+Usage:
+- ./nba-bot --help
+- ./nba-bot daily-report --date 2025-01-15
+- ./nba-bot compare-players "LeBron James" "Stephen Curry"
+- python benchmarks/benchmark_startup.py measures the startup time of every subcommand
+"""
+
+import argparse
+import importlib
+import importlib.util
+import os
+import sys
+
+REPO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Subcommand -> (module in scripts/, or a path relative to the repository, and a one-line description)
+COMMANDS = {
+    "daily-report": ("reports/daily/daily_reports.py", "Generate the daily report, or backfill a date range"),
+    "top-performances": ("top_performances", "Top performances of today's or yesterday's games, or follow them live"),
+    "rank-season-players": ("rank_season_players", "Rank players by per-game performance score over a season"),
+    "rank-players": ("rank_players", "Rank players from the CSV exports in storage/"),
+    "compare-seasons": ("compare_seasons", "Compare player performances across seasons"),
+    "compare-players": ("season_comparison", "Compare the season averages of two players"),
+    "last-games": ("last_x_games", "Last-N games and season averages for one player or many"),
+    "defensive-impact": ("defensive_impact_analysis", "Rank defenders by how much they lower opponents' FG%"),
+    "shooting-locations": ("team_shooting_locations", "Rank teams by shooting efficiency in each court zone"),
+    "clutch": ("play_by_play", "Clutch stats from play-by-play"),
+    "shot-chart": ("shot_chart", "Shot-level FG% by court zone, player, team or date range"),
+    "league-context": ("league_context", "Build league distributions or look up percentiles"),
+    "warehouse": ("warehouse", "Ingest games into the local warehouse"),
+    "jobs": ("job_runner", "Run season analyses for many seasons and splits in parallel"),
+    "serve": ("report_service", "Serve the analyses as JSON over HTTP"),
+    "player-index": ("player_index", "Build the player name index or resolve names"),
+    "rolling-stats": ("rolling_stats", "Incremental rolling-window player stats"),
+    "cache": ("response_cache", "Inspect or clear the response cache"),
+    "fixtures": ("fixtures", "List recorded endpoint fixtures"),
+    "clear-output": ("clear_output", "Delete the files in the output directory"),
+}
+
+
+# Import a subcommand's script; scripts outside scripts/ are loaded from their path
+def load_command(name):
+    target = COMMANDS[name][0]
+    if not target.endswith(".py"):
+        return importlib.import_module(target)
+    path = os.path.join(REPO_DIR, target)
+    spec = importlib.util.spec_from_file_location(os.path.splitext(os.path.basename(path))[0], path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_parser():
+    width = max(len(name) for name in COMMANDS)
+    commands = "\n".join(f"  {name:<{width}}  {description}" for name, (_, description) in COMMANDS.items())
+    parser = argparse.ArgumentParser(
+        prog="nba-bot", description="NBA analytics reports and tools.",
+        epilog=f"commands:\n{commands}\n\nRun 'nba-bot COMMAND --help' for the options of a command.",
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=list(COMMANDS), metavar="COMMAND", help="Command to run (see below)")
+    parser.add_argument("arguments", nargs=argparse.REMAINDER, help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    parser = build_parser()
+    if not argv:
+        parser.print_help()
+        sys.exit(2)
+    args = parser.parse_args(argv)
+    scripts_dir = os.path.dirname(os.path.abspath(__file__))
+    if scripts_dir not in sys.path:
+        sys.path.insert(0, scripts_dir)
+    # The script parses its own options, and its usage line reads "nba-bot <command>"
+    sys.argv = [f"nba-bot {args.command}"] + args.arguments
+    load_command(args.command).main()
+
+
+if __name__ == "__main__":
+    main()
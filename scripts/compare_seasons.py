@@ -1,6 +1,6 @@
 """
-This script compares player performance between two NBA seasons and identifies the top 25 improvements 
-and declines in overall performance. The comparison is based on per-game averages for points (PTS), 
+This script compares player performance between two NBA seasons and identifies the top 25 improvements
+and declines in overall performance. The comparison is based on per-game averages for points (PTS),
 rebounds (REB), assists (AST), steals (STL), and blocks (BLK).
 
 Key Features:
@@ -15,124 +15,193 @@ Key Features:
    - Current season stats.
    - Difference in stats between the two seasons.
    - Previous season stats.
+7. Multi-season mode loads N seasons into one panel indexed by (PLAYER_ID, SEASON) and computes the
+   deltas for every consecutive season pair (or any listed pairs) in one vectorized pass, returning the
+   top improvers and decliners of every pair at once.
 
 Usage:
 - Update the `season_current` and `season_previous` variables to specify the seasons to compare.
 - Run the script, and the results will be saved in the `output` directory.
+- `compare_seasons(...)` can also be imported, e.g. by scripts/job_runner.py.
+- python scripts/compare_seasons.py --seasons 2000-01:2024-25            # Every consecutive pair
+- python scripts/compare_seasons.py --pairs 2024-25/2019-20 2024-25/2014-15
 """
 
-from nba_api.stats.endpoints import leaguedashplayerstats
 import pandas as pd
+import numpy as np
+import argparse
 import logging
 import os
-
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+from data_context import DataContext
+from instrumentation import traced
+from output_writer import write_output
+from response_cache import log_cache_stats
 
 # Directory to save CSV files
 output_dir = "output"
-os.makedirs(output_dir, exist_ok=True)
+
+# Stats compared per game
+STATS = ['PTS', 'REB', 'AST', 'STL', 'BLK']
 
 # Fetch season averages for a given season
-def fetch_season_averages(season):
+def fetch_season_averages(season, context):
     logging.info(f"Fetching season averages for {season}")
-    player_stats = leaguedashplayerstats.LeagueDashPlayerStats(season=season).get_data_frames()[0]
+    player_stats = context.player_season_totals(season)
     return player_stats
 
-# Calculate per-game stats
-def calculate_per_game_stats(df):
-    df['PTS/G'] = df['PTS'] / df['GP']
-    df['REB/G'] = df['REB'] / df['GP']
-    df['AST/G'] = df['AST'] / df['GP']
-    df['STL/G'] = df['STL'] / df['GP']
-    df['BLK/G'] = df['BLK'] / df['GP']
-    return df
+# Fetch the season totals of many seasons concurrently; returns {season: frame}
+def fetch_many_season_averages(seasons, context):
+    from concurrent_fetch import fetch_concurrently
+
+    frames = fetch_concurrently([lambda season=season: fetch_season_averages(season, context) for season in seasons])
+    return dict(zip(seasons, frames))
+
+# Long panel of per-game stats indexed by (PLAYER_ID, SEASON) from {season: season totals}
+@traced("transform")
+def build_season_panel(season_frames):
+    parts = []
+    for season, df in season_frames.items():
+        part = df[['PLAYER_ID', 'PLAYER_NAME', 'GP'] + STATS].copy()
+        part['SEASON'] = season
+        # Row position within the season's table breaks ties the way the two-season merge did
+        part['ROW'] = np.arange(len(part))
+        parts.append(part)
+    panel = pd.concat(parts, ignore_index=True)
+    per_game = panel[STATS].to_numpy(dtype=np.float64) / panel[['GP']].to_numpy(dtype=np.float64)
+    panel[[f'{stat}/G' for stat in STATS]] = per_game
+    return panel.drop(columns=STATS + ['GP']).set_index(['PLAYER_ID', 'SEASON']).sort_index()
+
+# Per-game deltas for season pairs: every consecutive pair by default, or the listed (current, previous) pairs
+@traced("transform")
+def season_deltas(panel, pairs=None):
+    per_game = [f'{stat}/G' for stat in STATS]
+    if pairs is None:
+        # One groupby/shift pass lines every player-season up with the same player's prior row
+        current = panel.reset_index()
+        previous = current.groupby('PLAYER_ID', sort=False)[['SEASON'] + per_game].shift(1)
+        start_year = current['SEASON'].str[:4].astype(int)
+        expected = (start_year - 1).astype(str) + '-' + start_year.astype(str).str[-2:]
+        keep = (previous['SEASON'] == expected).to_numpy()
+        current, previous = current[keep].reset_index(drop=True), previous[keep].reset_index(drop=True)
+        deltas = current[['PLAYER_ID', 'PLAYER_NAME', 'ROW', 'SEASON'] + per_game].rename(
+            columns={'SEASON': 'SEASON_CURRENT', **{column: f'{column}_current' for column in per_game}}
+        )
+        deltas['SEASON_PREVIOUS'] = previous['SEASON']
+        deltas[[f'{column}_previous' for column in per_game]] = previous[per_game].to_numpy()
+    else:
+        pairs = pd.DataFrame(pairs, columns=['SEASON_CURRENT', 'SEASON_PREVIOUS'])
+        flat = panel.reset_index()
+        current = flat.rename(columns={'SEASON': 'SEASON_CURRENT'}).merge(pairs, on='SEASON_CURRENT')
+        previous = flat.drop(columns=['PLAYER_NAME', 'ROW']).rename(columns={'SEASON': 'SEASON_PREVIOUS'})
+        deltas = current.merge(previous, on=['PLAYER_ID', 'SEASON_PREVIOUS'], suffixes=('_current', '_previous'))
+
+    for stat in STATS:
+        deltas[f'{stat}_Difference'] = deltas[f'{stat}/G_current'] - deltas[f'{stat}/G_previous']
+    deltas['Overall_Difference'] = deltas[[f'{stat}_Difference' for stat in STATS]].sum(axis=1, min_count=len(STATS))
+    return deltas.dropna(subset=['Overall_Difference'])
+
+# Top improvers and decliners of every season pair at once
+@traced("transform")
+def top_changes(deltas, top_n=25):
+    keys = ['SEASON_CURRENT', 'SEASON_PREVIOUS']
+    ordered = deltas.sort_values(keys + ['Overall_Difference', 'ROW'], ascending=[True, True, False, True], kind='stable')
+    improvements = ordered.groupby(keys, sort=False).head(top_n)
+    ordered = deltas.sort_values(keys + ['Overall_Difference', 'ROW'], ascending=[True, True, True, True], kind='stable')
+    declines = ordered.groupby(keys, sort=False).head(top_n)
+    return improvements.reset_index(drop=True), declines.reset_index(drop=True)
+
+# Three output rows per player (current season, difference, previous season), built column-wise
+@traced("transform")
+def format_changes(top, include_pair=False):
+    top = top.round(1)
+    blocks = []
+    for position, (label, suffix) in enumerate([
+        (top['SEASON_CURRENT'], '/G_current'),
+        (pd.Series('Difference', index=top.index), '_Difference'),
+        (top['SEASON_PREVIOUS'], '/G_previous'),
+    ]):
+        block = pd.DataFrame({'Player': top['PLAYER_NAME'].astype(str) + ' (' + label + ')'}, index=top.index)
+        for stat in STATS:
+            block[stat] = np.char.mod('%.1f', top[f'{stat}{suffix}'].to_numpy(dtype=np.float64))
+        if include_pair:
+            block.insert(0, 'Pair', top['SEASON_CURRENT'] + ' vs ' + top['SEASON_PREVIOUS'])
+        block['_order'] = np.arange(len(top)) * 3 + position
+        blocks.append(block)
+    combined = pd.concat(blocks).sort_values('_order', kind='stable')
+    return combined.drop(columns='_order').reset_index(drop=True)
+
+# Top improvements and declines between two seasons' totals, as numbers (one row per player)
+def season_pair_changes(player_stats_current, player_stats_previous, season_current, season_previous, top_n=25):
+    panel = build_season_panel({season_current: player_stats_current, season_previous: player_stats_previous})
+    deltas = season_deltas(panel, pairs=[(season_current, season_previous)])
+    return top_changes(deltas, top_n)
+
+# Top improvements and declines between two seasons' totals, formatted for output
+def compare_seasons(player_stats_current, player_stats_previous, season_current, season_previous, top_n=25):
+    top_improvements, top_declines = season_pair_changes(
+        player_stats_current, player_stats_previous, season_current, season_previous, top_n
+    )
+    return format_changes(top_improvements), format_changes(top_declines)
+
+# Top improvements and declines for every pair of a multi-season panel, formatted with a Pair column
+def compare_many_seasons(season_frames, pairs=None, top_n=25):
+    deltas = season_deltas(build_season_panel(season_frames), pairs)
+    top_improvements, top_declines = top_changes(deltas, top_n)
+    return format_changes(top_improvements, include_pair=True), format_changes(top_declines, include_pair=True)
+
+# Presentation view with a Pair column, for multi-season outputs
+def format_pair_changes(top):
+    return format_changes(top, include_pair=True)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Season-over-season player improvements and declines.")
+    parser.add_argument("--seasons", nargs="+", help="Seasons or FIRST:LAST ranges; compares every consecutive pair")
+    parser.add_argument("--pairs", nargs="+", help="CURRENT/PREVIOUS season pairs to compare")
+    parser.add_argument("--top", type=int, default=25, help="Players per pair and direction")
+    return parser.parse_args()
 
 # Main execution
-season_current = "2024-25"
-season_previous = "2023-24"
-
-# Fetch season averages for both seasons
-player_stats_current = fetch_season_averages(season_current)
-player_stats_previous = fetch_season_averages(season_previous)
-
-# Calculate per-game stats for both seasons
-player_stats_current = calculate_per_game_stats(player_stats_current)
-player_stats_previous = calculate_per_game_stats(player_stats_previous)
-
-# Merge the dataframes on PLAYER_ID
-merged_stats = pd.merge(player_stats_current[['PLAYER_ID', 'PLAYER_NAME', 'PTS/G', 'REB/G', 'AST/G', 'STL/G', 'BLK/G']], 
-                        player_stats_previous[['PLAYER_ID', 'PTS/G', 'REB/G', 'AST/G', 'STL/G', 'BLK/G']], 
-                        on='PLAYER_ID', 
-                        suffixes=('_current', '_previous'))
-
-# Calculate the differences in stats
-merged_stats['PTS_Difference'] = merged_stats['PTS/G_current'] - merged_stats['PTS/G_previous']
-merged_stats['REB_Difference'] = merged_stats['REB/G_current'] - merged_stats['REB/G_previous']
-merged_stats['AST_Difference'] = merged_stats['AST/G_current'] - merged_stats['AST/G_previous']
-merged_stats['STL_Difference'] = merged_stats['STL/G_current'] - merged_stats['STL/G_previous']
-merged_stats['BLK_Difference'] = merged_stats['BLK/G_current'] - merged_stats['BLK/G_previous']
-
-# Calculate the overall performance difference
-merged_stats['Overall_Difference'] = (
-    merged_stats['PTS_Difference'] +
-    merged_stats['REB_Difference'] +
-    merged_stats['AST_Difference'] +
-    merged_stats['STL_Difference'] +
-    merged_stats['BLK_Difference']
-)
-
-# Identify the top 25 improvements and declines
-top_improvements = merged_stats.nlargest(25, 'Overall_Difference')
-top_declines = merged_stats.nsmallest(25, 'Overall_Difference')
-
-# Format the stats to one decimal place
-top_improvements = top_improvements.round(1)
-top_declines = top_declines.round(1)
-
-# Prepare the data for output
-def format_player_stats(row, season, suffix):
-    return {
-        "Player": f"{row['PLAYER_NAME']} ({season})",
-        "PTS": f"{row[f'PTS/G{suffix}']:.1f}",
-        "REB": f"{row[f'REB/G{suffix}']:.1f}",
-        "AST": f"{row[f'AST/G{suffix}']:.1f}",
-        "STL": f"{row[f'STL/G{suffix}']:.1f}",
-        "BLK": f"{row[f'BLK/G{suffix}']:.1f}"
-    }
-
-def format_difference_stats(row):
-    return {
-        "Player": f"{row['PLAYER_NAME']} (Difference)",
-        "PTS": f"{row['PTS_Difference']:.1f}",
-        "REB": f"{row['REB_Difference']:.1f}",
-        "AST": f"{row['AST_Difference']:.1f}",
-        "STL": f"{row['STL_Difference']:.1f}",
-        "BLK": f"{row['BLK_Difference']:.1f}"
-    }
-
-# Combine the data for improvements and declines
-def combine_stats(stats):
-    combined_stats = []
-    for _, row in stats.iterrows():
-        combined_stats.append(format_player_stats(row, season_current, '_current'))
-        combined_stats.append(format_difference_stats(row))
-        combined_stats.append(format_player_stats(row, season_previous, '_previous'))
-    return combined_stats
-
-combined_improvements = combine_stats(top_improvements)
-combined_declines = combine_stats(top_declines)
-
-# Convert to DataFrame
-improvements_df = pd.DataFrame(combined_improvements)
-declines_df = pd.DataFrame(combined_declines)
-
-# Save the results to CSV files
-improvements_file = os.path.join(output_dir, 'top_25_improvements.csv')
-declines_file = os.path.join(output_dir, 'top_25_declines.csv')
-
-improvements_df.to_csv(improvements_file, index=False)
-declines_df.to_csv(declines_file, index=False)
-
-logging.info(f"Top 25 improvements saved to {improvements_file}")
-logging.info(f"Top 25 declines saved to {declines_file}")
+def main():
+    args = parse_args()
+
+    # Configure logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    os.makedirs(output_dir, exist_ok=True)
+
+    context = DataContext()
+
+    if args.seasons or args.pairs:
+        from job_runner import parse_seasons
+
+        pairs = [tuple(pair.split("/", 1)) for pair in args.pairs] if args.pairs else None
+        seasons = parse_seasons(args.seasons) if args.seasons else sorted({season for pair in pairs for season in pair})
+        deltas = season_deltas(build_season_panel(fetch_many_season_averages(seasons, context)), pairs)
+        improvements_df, declines_df = top_changes(deltas, args.top)
+        view = format_pair_changes
+        improvements_file = os.path.join(output_dir, 'season_pairs_improvements.csv')
+        declines_file = os.path.join(output_dir, 'season_pairs_declines.csv')
+    else:
+        season_current = "2024-25"
+        season_previous = "2023-24"
+
+        # Fetch season averages for both seasons
+        player_stats_current = fetch_season_averages(season_current, context)
+        player_stats_previous = fetch_season_averages(season_previous, context)
+
+        improvements_df, declines_df = season_pair_changes(
+            player_stats_current, player_stats_previous, season_current, season_previous, args.top
+        )
+        view = format_changes
+        improvements_file = os.path.join(output_dir, f'top_{args.top}_improvements.csv')
+        declines_file = os.path.join(output_dir, f'top_{args.top}_declines.csv')
+
+    # Save the results (CSV shows three formatted rows per player; Parquet/Arrow keep one numeric row)
+    improvements_paths = write_output(improvements_df.drop(columns='ROW'), improvements_file, view=view)
+    declines_paths = write_output(declines_df.drop(columns='ROW'), declines_file, view=view)
+
+    logging.info(f"Top improvements saved to {', '.join(improvements_paths)}")
+    logging.info(f"Top declines saved to {', '.join(declines_paths)}")
+    log_cache_stats()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+This module fans out nba_api endpoint calls across a bounded thread pool so that every per-game request
+for a date is in flight at once instead of running back to back.
+
+Key Features:
+1. Caps the number of in-flight requests with a fixed-size worker pool.
+2. Leaves rate limiting and retries to the shared transport (transport.py), so only requests that
+   actually reach stats.nba.com are throttled; response-cache hits return immediately.
+3. Returns results in the same order as the input calls, regardless of completion order.
+
+Usage:
+- Build a list of zero-argument callables (one per endpoint call) and pass it to `fetch_concurrently`.
+- Use `fetch_game_frames` to fetch one data frame per game ID from a box score endpoint.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from instrumentation import span
+from response_cache import fetch_endpoint
+
+# Default pool size for stats.nba.com
+MAX_IN_FLIGHT_REQUESTS = 8
+
+
+# Run every call concurrently and return the results in input order
+def fetch_concurrently(calls, max_in_flight=MAX_IN_FLIGHT_REQUESTS):
+    calls = list(calls)
+    if not calls:
+        return []
+
+    logging.info(f"Fetching {len(calls)} requests with up to {max_in_flight} in flight")
+    with ThreadPoolExecutor(max_workers=min(max_in_flight, len(calls))) as executor:
+        # executor.map yields results in submission order
+        return list(executor.map(lambda call: call(), calls))
+
+
+# Build a call that fetches one data frame of a per-game endpoint (through the response cache)
+def game_frame_call(endpoint_class, game_id, frame_index=0, final=False):
+    def call():
+        endpoint = fetch_endpoint(endpoint_class, final=final, game_id=game_id)
+        with span(endpoint_class.__name__, "decode"):
+            return endpoint.get_data_frames()[frame_index]
+    return call
+
+
+# Fetch one data frame per game ID from a per-game endpoint, in game order
+def fetch_game_frames(endpoint_class, game_ids, frame_index=0, final=False, **limits):
+    calls = [game_frame_call(endpoint_class, game_id, frame_index, final) for game_id in game_ids]
+    return fetch_concurrently(calls, **limits)
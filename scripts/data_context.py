@@ -0,0 +1,146 @@
+"""
+This module provides a request-scoped data context that fetches each dataset at most once per run
+and shares it between every consumer in that run.
+
+Key Features:
+1. Memoizes endpoint data frames by endpoint class and request parameters, so two analyses that need
+   the same league-wide table (e.g. `LeagueDashPlayerStats` for 2024-25) trigger a single fetch.
+2. Safe to use from the concurrent fetch pool: concurrent requests for the same dataset wait for the
+   first one instead of fetching it again.
+3. Counts the upstream calls the run made (in total and per endpoint), so a run can report and assert them.
+4. Hands out copies of the cached frames, so one consumer's edits never leak into another's.
+5. With `NBA_DATA_SOURCE=warehouse`, serves scoreboards, box scores, line scores, player game logs and
+   season totals from the local warehouse (see warehouse.py) and only falls back to the live
+   endpoints for data the warehouse does not hold.
+6. Frames come with compact column types (small integers, float32, categorical names; see schemas.py),
+   converted once when the dataset is loaded.
+
+Usage:
+- Create one `DataContext()` per run and pass it to every function that needs league data.
+- Call `context.player_season_stats("2024-25")` for the league player table, or
+  `context.get_frame(endpoint_class, frame_index, **params)` for any other endpoint.
+- Log `context.summary()` at the end of the run.
+"""
+
+from nba_api.stats.endpoints import (
+    leaguedashplayerstats, leaguedashteamstats, leaguedashteamshotlocations, leaguegamelog, playergamelog
+)
+from collections import Counter
+import os
+import threading
+from instrumentation import span
+from response_cache import fetch_endpoint
+from schemas import apply_schema
+
+# "live" (stats.nba.com through the response cache) or "warehouse"
+data_source = os.environ.get("NBA_DATA_SOURCE", "live").lower()
+
+
+class DataContext:
+    def __init__(self, source=None):
+        self.source = source or data_source
+        self.upstream_calls = 0
+        self.warehouse_reads = 0
+        self.calls_by_endpoint = Counter()
+        self._frames = {}
+        self._key_locks = {}
+        self._lock = threading.Lock()
+
+    # All data frames of an endpoint call, fetched at most once per context
+    def get_frames(self, endpoint_class, final=False, **params):
+        key = (endpoint_class.__name__, tuple(sorted((name, str(value)) for name, value in params.items())))
+        with self._lock:
+            if key in self._frames:
+                return self._frames[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Another thread may have fetched it while we waited
+            with self._lock:
+                if key in self._frames:
+                    return self._frames[key]
+            frames = self._read_warehouse(endpoint_class.__name__, params)
+            if frames is None:
+                endpoint = fetch_endpoint(endpoint_class, final=final, **params)
+                with span(endpoint_class.__name__, "decode"):
+                    frames = endpoint.get_data_frames()
+                with self._lock:
+                    self.upstream_calls += 1
+                    self.calls_by_endpoint[endpoint_class.__name__] += 1
+            # Compact column types, once per dataset (see schemas.py). Warehouse reads are keyed by frame index.
+            if isinstance(frames, dict):
+                frames = {index: apply_schema(frame, endpoint_class.__name__) for index, frame in frames.items()}
+            else:
+                frames = [apply_schema(frame, endpoint_class.__name__) for frame in frames]
+            with self._lock:
+                self._frames[key] = frames
+        return frames
+
+    def _warehouse(self):
+        if self.source != "warehouse":
+            return None
+        from warehouse import get_warehouse
+        return get_warehouse()
+
+    def _read_warehouse(self, endpoint_name, params):
+        warehouse = self._warehouse()
+        frames = warehouse.read_endpoint(endpoint_name, params) if warehouse else None
+        if frames is not None:
+            with self._lock:
+                self.warehouse_reads += 1
+        return frames
+
+    # A copy of one data frame of an endpoint call
+    def get_frame(self, endpoint_class, frame_index=0, final=False, **params):
+        return self.get_frames(endpoint_class, final=final, **params)[frame_index].copy()
+
+    # Zero-argument call for the concurrent fetch pool
+    def frame_call(self, endpoint_class, frame_index=0, final=False, **params):
+        return lambda: self.get_frame(endpoint_class, frame_index, final=final, **params)
+
+    # League-wide player season totals
+    def player_season_stats(self, season):
+        return self.get_frame(leaguedashplayerstats.LeagueDashPlayerStats, season=season)
+
+    # Season totals only (no AGE or ROOKIE_FLAG), from the warehouse when it holds the whole season so far
+    def player_season_totals(self, season):
+        warehouse = self._warehouse()
+        if warehouse and warehouse.can_read_season(season):
+            key = ("player_season_totals", season)
+            with self._lock:
+                totals = self._frames.get(key)
+            if totals is None:
+                totals = apply_schema(warehouse.player_season_totals(season), "LeagueDashPlayerStats")
+                with self._lock:
+                    self.warehouse_reads += 1
+                    self._frames[key] = totals
+            return totals.copy()
+        return self.player_season_stats(season)
+
+    # One player's game log for a season, newest game first
+    def player_game_log(self, player_id, season, **params):
+        return self.get_frame(playergamelog.PlayerGameLog, player_id=player_id, season=season, **params)
+
+    # Every player's game log for a season in one request (LeagueGameLog), or from the warehouse
+    def league_player_game_log(self, season):
+        warehouse = self._warehouse()
+        if warehouse and warehouse.can_read_season(season):
+            with self._lock:
+                self.warehouse_reads += 1
+            return apply_schema(warehouse.read("player_game_logs", season=season), "LeagueGameLog")
+        return self.get_frame(leaguegamelog.LeagueGameLog, season=season, player_or_team_abbreviation="P")
+
+    # League-wide team season totals
+    def team_season_stats(self, season):
+        return self.get_frame(leaguedashteamstats.LeagueDashTeamStats, season=season)
+
+    # League-wide team shooting by court zone
+    def team_shot_locations(self, season):
+        return self.get_frame(leaguedashteamshotlocations.LeagueDashTeamShotLocations, season=season)
+
+    def summary(self):
+        per_endpoint = ", ".join(f"{name}={count}" for name, count in sorted(self.calls_by_endpoint.items()))
+        summary = f"{self.upstream_calls} upstream calls ({per_endpoint or 'none'})"
+        if self.source == "warehouse":
+            summary += f", {self.warehouse_reads} warehouse reads"
+        return summary
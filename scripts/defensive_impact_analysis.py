@@ -1,46 +1,58 @@
 """
 This script analyzes defensive impact metrics for NBA players using the LeagueDashPtDefend endpoint.
 It ranks players based on defensive stats such as opponent field goal percentage (D_FG_PCT) and compares it to the league average.
-Only players who have played a minimum of 25 games are included in the analysis.
+Only players who have played a minimum of 25 games are included in the analysis. Percentile and z-score columns place each
+player among every defender in the league table (higher is better).
 
 Usage:
 - Run the script, and the results will be saved in the `output` directory.
 """
 
 from nba_api.stats.endpoints import leaguedashptdefend
+import argparse
 import pandas as pd
 import logging
 import os
-
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+from data_context import DataContext
+from instrumentation import traced
+from league_context import build_league_context
+from output_writer import write_output
+from response_cache import log_cache_stats
 
 # Directory to save CSV files
 output_dir = "output"
-os.makedirs(output_dir, exist_ok=True)
 
-# Fetch defensive stats
-def fetch_defensive_stats():
+# Fetch defensive stats; filters are LeagueDashPtDefend parameters (e.g. location_nullable="Home")
+def fetch_defensive_stats(context, season=None, **filters):
     logging.info("Fetching defensive stats for players...")
-    defensive_data = leaguedashptdefend.LeagueDashPtDefend().get_data_frames()[0]
+    if season is not None:
+        filters["season"] = season
+    defensive_data = context.get_frame(leaguedashptdefend.LeagueDashPtDefend, **filters)
     return defensive_data
 
-# Main execution
-try:
+# Rank players with at least 25 games by how much they lower opponents' FG%
+@traced("transform")
+def analyze_defensive_impact(context, season=None, min_games=25, **filters):
     # Fetch defensive stats
-    defensive_stats = fetch_defensive_stats()
+    defensive_stats = fetch_defensive_stats(context, season, **filters)
+
+    # Debug: Log available columns
+    logging.debug("Available columns in defensive stats: %s", defensive_stats.columns)
 
-    # Debug: Print available columns
-    print("Available columns in defensive stats:")
-    print(defensive_stats.columns)
+    # Percentiles and z-scores against every defender in the table, before the games filter
+    league = build_league_context(season, "defense", defensive_stats)
+    defensive_stats = league.add_context(defensive_stats, z_scores=True, names={
+        "D_FG_PCT": "Defended FG%", "PCT_PLUSMINUS": "FG% Difference"
+    })
 
     # Select relevant columns
     defensive_stats = defensive_stats[[
-        "PLAYER_NAME", "GP", "D_FGM", "D_FGA", "D_FG_PCT", "NORMAL_FG_PCT", "PCT_PLUSMINUS"
+        "PLAYER_NAME", "GP", "D_FGM", "D_FGA", "D_FG_PCT", "NORMAL_FG_PCT", "PCT_PLUSMINUS",
+        "Defended FG% Pctl", "FG% Difference Pctl", "FG% Difference Z"
     ]]
 
     # Rename columns for clarity
-    defensive_stats.rename(columns={
+    defensive_stats = defensive_stats.rename(columns={
         "PLAYER_NAME": "Player Name",
         "GP": "Games Played",
         "D_FGM": "Defended FGM",
@@ -48,18 +60,39 @@ try:
         "D_FG_PCT": "Defended FG%",
         "NORMAL_FG_PCT": "League Average FG%",
         "PCT_PLUSMINUS": "FG% Difference"
-    }, inplace=True)
+    })
 
     # Filter players with a minimum of 25 games played
-    defensive_stats = defensive_stats[defensive_stats["Games Played"] >= 25]
+    defensive_stats = defensive_stats[defensive_stats["Games Played"] >= min_games]
 
     # Sort players by FG% Difference (ascending, lower is better)
-    defensive_stats = defensive_stats.sort_values(by="FG% Difference", ascending=True)
+    return defensive_stats.sort_values(by="FG% Difference", ascending=True)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Rank defenders by how much they lower opponents' FG%.")
+    parser.add_argument("--season", help="Season to analyze, e.g. 2024-25 (default: the current season)")
+    parser.add_argument("--min-games", type=int, default=25, help="Minimum games played")
+    return parser.parse_args()
+
+# Main execution
+def main():
+    args = parse_args()
+
+    # Configure logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    os.makedirs(output_dir, exist_ok=True)
+
+    try:
+        defensive_stats = analyze_defensive_impact(DataContext(), args.season, args.min_games)
+
+        # Save the results (CSV, plus Parquet/Arrow if NBA_OUTPUT_FORMATS asks for them)
+        output_file = os.path.join(output_dir, "defensive_impact_analysis.csv")
+        paths = write_output(defensive_stats, output_file)
+        logging.info(f"Defensive impact analysis saved to {', '.join(paths)}")
+        log_cache_stats()
 
-    # Save the results to a CSV file
-    output_file = os.path.join(output_dir, "defensive_impact_analysis.csv")
-    defensive_stats.to_csv(output_file, index=False)
-    logging.info(f"Defensive impact analysis saved to {output_file}")
+    except Exception as e:
+        logging.error(f"An error occurred: {e}")
 
-except Exception as e:
-    logging.error(f"An error occurred: {e}")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
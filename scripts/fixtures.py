@@ -0,0 +1,148 @@
+"""
+This module records raw stats.nba.com responses into fixture files and replays them inside the shared
+transport, so every script can run offline (CI, isolated boxes, benchmarks).
+
+Key Features:
+1. `NBA_RECORD_DIR=DIR`: every successful HTTP response the transport receives is also saved as a
+   fixture, `DIR/<endpoint>/<key>.json.gz`, keyed by the endpoint and the exact query parameters sent.
+   Set `NBA_CACHE=off` while recording, or responses served from the response cache are not captured.
+2. `NBA_REPLAY_DIR=DIR`: requests are answered from the fixtures instead of the network. Replay sits below
+   the rate limiter, retries, metrics and spans (it replaces the HTTP adapter), so the rest of the
+   transport behaves as it does live. A request without a fixture fails with `FixtureNotFound`.
+3. `NBA_REPLAY_LATENCY_MS` (default 0) and `NBA_REPLAY_JITTER_MS` (default 0) delay every replayed
+   response, to model the network.
+4. Any endpoint can be recorded; the scripts use ScoreboardV2, BoxScoreTraditionalV2, BoxScoreSummaryV2,
+   LeagueDashPlayerStats, LeagueDashTeamStats, LeagueDashTeamShotLocations, LeagueDashPtDefend,
+   LeagueGameLog, PlayerGameLog, PlayByPlayV2 and ShotChartDetail.
+
+Usage:
+- NBA_CACHE=off NBA_RECORD_DIR=fixtures python reports/daily/daily_reports.py --date 2025-01-15
+- NBA_CACHE=off NBA_REPLAY_DIR=fixtures NBA_REPLAY_LATENCY_MS=80 python reports/daily/daily_reports.py --date 2025-01-15
+- python scripts/fixtures.py list fixtures   # Fixture count and size per endpoint
+"""
+
+from urllib.parse import parse_qsl, urlparse
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+
+record_dir = os.environ.get("NBA_RECORD_DIR")
+replay_dir = os.environ.get("NBA_REPLAY_DIR")
+replay_latency = float(os.environ.get("NBA_REPLAY_LATENCY_MS", 0)) / 1000
+replay_jitter = float(os.environ.get("NBA_REPLAY_JITTER_MS", 0)) / 1000
+
+
+class FixtureNotFound(LookupError):
+    pass
+
+
+# Endpoint name and query parameters of a request URL, as nba_api sent them (None values are dropped)
+def request_parameters(url):
+    parsed = urlparse(url)
+    return parsed.path.rstrip("/").rsplit("/", 1)[-1].lower(), dict(parse_qsl(parsed.query, keep_blank_values=True))
+
+
+def fixture_path(directory, endpoint, parameters):
+    normalized = json.dumps({key: str(value) for key, value in parameters.items() if value is not None}, sort_keys=True)
+    key = hashlib.sha1(f"{endpoint.lower()}?{normalized}".encode("utf-8")).hexdigest()[:20]
+    return os.path.join(directory, endpoint.lower(), f"{key}.json.gz")
+
+
+def save_fixture(directory, endpoint, parameters, text):
+    path = fixture_path(directory, endpoint, parameters)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{threading.get_ident()}.tmp"
+    with gzip.open(temp_path, "wt", encoding="utf-8") as fixture_file:
+        json.dump({"endpoint": endpoint.lower(), "parameters": parameters, "response": text}, fixture_file)
+    os.replace(temp_path, path)
+    return path
+
+
+# The recorded response text, or None
+def load_fixture(directory, endpoint, parameters):
+    path = fixture_path(directory, endpoint, parameters)
+    if not os.path.exists(path):
+        return None
+    with gzip.open(path, "rt", encoding="utf-8") as fixture_file:
+        return json.load(fixture_file)["response"]
+
+
+# HTTP adapter that also saves every 200 response as a fixture
+class RecordingAdapter(HTTPAdapter):
+    def __init__(self, directory, **kwargs):
+        super().__init__(**kwargs)
+        self.directory = directory
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        if response.status_code == 200:
+            endpoint, parameters = request_parameters(request.url)
+            save_fixture(self.directory, endpoint, parameters, response.text)
+        return response
+
+
+# Adapter that answers every request from the fixtures, after the configured latency
+class ReplayAdapter(BaseAdapter):
+    def __init__(self, directory, latency=replay_latency, jitter=replay_jitter):
+        super().__init__()
+        self.directory = directory
+        self.latency = latency
+        self.jitter = jitter
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        endpoint, parameters = request_parameters(request.url)
+        text = load_fixture(self.directory, endpoint, parameters)
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            time.sleep(delay)
+        if text is None:
+            raise FixtureNotFound(f"No fixture for {endpoint} {parameters} in {self.directory}")
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.url = request.url
+        response.request = request
+        response.headers["Content-Type"] = "application/json; charset=utf-8"
+        response.encoding = "utf-8"
+        response._content = text.encode("utf-8")
+        return response
+
+    def close(self):
+        pass
+
+
+# The HTTP adapter the transport mounts: replay, recording or the network
+def transport_adapter(pool):
+    if replay_dir:
+        return ReplayAdapter(replay_dir)
+    if record_dir:
+        return RecordingAdapter(record_dir, pool_connections=pool, pool_maxsize=pool, max_retries=0)
+    return HTTPAdapter(pool_connections=pool, pool_maxsize=pool, max_retries=0)
+
+
+def list_fixtures(directory):
+    for endpoint in sorted(os.listdir(directory)):
+        endpoint_dir = os.path.join(directory, endpoint)
+        if os.path.isdir(endpoint_dir):
+            files = [os.path.join(endpoint_dir, name) for name in os.listdir(endpoint_dir) if name.endswith(".json.gz")]
+            size = sum(os.path.getsize(path) for path in files)
+            print(f"{endpoint:<32} {len(files):>6} fixtures {size / 1e6:>8.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recorded stats.nba.com fixtures.")
+    parser.add_argument("command", choices=["list"])
+    parser.add_argument("directory", nargs="?", default=replay_dir or record_dir or "fixtures")
+    args = parser.parse_args()
+    list_fixtures(args.directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""
+This module records timing spans around the hot paths of every script (endpoint calls, network requests,
+response decoding, transforms and writers) and can profile a whole run.
+
+Key Features:
+1. `span(name, category)` times a block; `@traced(category)` times a function. Spans nest per thread, and
+   the trace keeps each span's parent so time can be split into self time per category.
+2. Tracing is off unless `NBA_TRACE` is set. When it is off, `span` returns a shared no-op object and
+   `traced` returns the function unchanged, so instrumented code pays nothing.
+3. `NBA_TRACE=1` (or a file path) writes a per-run trace when the process exits, in the Chrome trace event
+   format (open it in chrome://tracing or https://ui.perfetto.dev), with a summary table per span name and
+   per category on stderr.
+4. `NBA_LOG_LEVEL=DEBUG` turns on the debug logs (e.g. the column dumps of the analyses), which are
+   otherwise skipped before their message is built.
+5. `NBA_PROFILE=cprofile` profiles the main thread with cProfile and saves the `.prof` stats;
+   `NBA_PROFILE=sample` samples the stacks of every thread (fetch pools included) every
+   `NBA_PROFILE_INTERVAL_MS` (default 5) and saves them as folded stacks for flame graph tools.
+   The top functions are printed when the process exits.
+
+Categories: `endpoint` (fetch_endpoint), `cache` (response cache reads and writes), `network` (HTTP
+requests), `decode` (JSON to data frames), `read` (warehouse reads), `transform` (pandas work), `section`
+(report nodes), `write` (outputs).
+
+Usage:
+- NBA_TRACE=1 python scripts/compare_seasons.py --seasons 2015-16:2024-25
+- NBA_TRACE=output/traces/daily.json NBA_PROFILE=sample python reports/daily/daily_reports.py
+- with span("merge panels", "transform", rows=len(df)): ...
+"""
+
+from collections import Counter, defaultdict
+from datetime import datetime
+import atexit
+import functools
+import itertools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+trace_setting = os.environ.get("NBA_TRACE", "")
+tracing_enabled = trace_setting.lower() not in ("", "0", "off", "false")
+profile_mode = os.environ.get("NBA_PROFILE", "").lower()
+profile_interval = float(os.environ.get("NBA_PROFILE_INTERVAL_MS", 5)) / 1000
+log_level = os.environ.get("NBA_LOG_LEVEL", "").upper()
+
+# Traces and profiles go here unless NBA_TRACE names a file
+trace_dir = os.path.join("output", "traces")
+
+run_name = os.path.splitext(os.path.basename(sys.argv[0] or "python"))[0].replace(" ", "_") or "python"
+run_started = datetime.now()
+_run_start = time.perf_counter()
+
+_spans = []
+_spans_lock = threading.Lock()
+_span_ids = itertools.count(1)
+_local = threading.local()
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attributes):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+    __slots__ = ("name", "category", "attributes", "id", "parent", "start")
+
+    def __init__(self, name, category, attributes):
+        self.name = name
+        self.category = category
+        self.attributes = attributes
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        self.id = next(_span_ids)
+        self.parent = stack[-1] if stack else None
+        stack.append(self.id)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        _local.stack.pop()
+        if exc_type is not None:
+            self.attributes["error"] = exc_type.__name__
+        record = {
+            "id": self.id,
+            "parent": self.parent,
+            "name": self.name,
+            "category": self.category,
+            "start": self.start - _run_start,
+            "seconds": end - self.start,
+            "thread": threading.current_thread().name,
+            "attributes": self.attributes,
+        }
+        with _spans_lock:
+            _spans.append(record)
+        return False
+
+    # Attach attributes known only inside the block (e.g. cache hit or miss)
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+
+# Time a block; a no-op unless tracing is enabled
+def span(name, category, **attributes):
+    if not tracing_enabled:
+        return NULL_SPAN
+    return Span(name, category, attributes)
+
+
+# Time every call of a function (named after it unless name is given)
+def traced(category, name=None):
+    def decorate(func):
+        if not tracing_enabled:
+            return func
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with Span(span_name, category, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def recorded_spans():
+    with _spans_lock:
+        return list(_spans)
+
+
+# Per (category, name): calls, total and self seconds (total minus nested spans), mean and max
+def summarize_spans(spans):
+    child_seconds = Counter()
+    for record in spans:
+        if record["parent"] is not None:
+            child_seconds[record["parent"]] += record["seconds"]
+    rows = defaultdict(lambda: {"calls": 0, "total": 0.0, "self": 0.0, "max": 0.0})
+    for record in spans:
+        row = rows[(record["category"], record["name"])]
+        row["calls"] += 1
+        row["total"] += record["seconds"]
+        row["self"] += max(record["seconds"] - child_seconds[record["id"]], 0.0)
+        row["max"] = max(row["max"], record["seconds"])
+    return [
+        {"category": category, "name": name, **row, "mean": row["total"] / row["calls"]}
+        for (category, name), row in sorted(rows.items(), key=lambda item: -item[1]["self"])
+    ]
+
+
+def format_summary(summary, limit=25):
+    by_category = defaultdict(float)
+    for row in summary:
+        by_category[row["category"]] += row["self"]
+    lines = [f"{'category':<10} {'self s':>9}"]
+    lines += [f"{category:<10} {seconds:>9.3f}" for category, seconds in sorted(by_category.items(), key=lambda item: -item[1])]
+    lines.append("")
+    lines.append(f"{'category':<10} {'name':<40} {'calls':>6} {'total s':>9} {'self s':>9} {'mean ms':>9} {'max ms':>9}")
+    for row in summary[:limit]:
+        lines.append(f"{row['category']:<10} {row['name'][:40]:<40} {row['calls']:>6} {row['total']:>9.3f} "
+                     f"{row['self']:>9.3f} {row['mean'] * 1000:>9.1f} {row['max'] * 1000:>9.1f}")
+    return "\n".join(lines)
+
+
+# Path for a run artifact: NBA_TRACE's file name with the given extension, or one under trace_dir
+def artifact_path(extension):
+    if tracing_enabled and trace_setting.lower() not in ("1", "on", "true"):
+        return os.path.splitext(trace_setting)[0] + extension
+    return os.path.join(trace_dir, f"{run_name}_{run_started:%Y%m%d_%H%M%S}{extension}")
+
+
+# Write the spans in the Chrome trace event format, with the summary alongside
+def export_trace(path, spans=None):
+    spans = recorded_spans() if spans is None else spans
+    threads = {}
+    events = []
+    for record in spans:
+        tid = threads.setdefault(record["thread"], len(threads) + 1)
+        events.append({
+            "name": record["name"], "cat": record["category"], "ph": "X", "pid": 1, "tid": tid,
+            "ts": round(record["start"] * 1e6, 1), "dur": round(record["seconds"] * 1e6, 1),
+            "args": {key: str(value) for key, value in record["attributes"].items()},
+        })
+    events += [{"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": name}} for name, tid in threads.items()]
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as trace_file:
+        json.dump({
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"run": run_name, "started": run_started.isoformat(timespec="seconds"),
+                          "summary": summarize_spans(spans)},
+        }, trace_file)
+    return path
+
+
+class StackSampler:
+    def __init__(self, interval=profile_interval):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    # Folded stacks ("a;b;c count"), as flamegraph.pl and speedscope read them
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as folded:
+            for stack, count in self.stacks.most_common():
+                folded.write(f"{stack} {count}\n")
+        return path
+
+    def top(self, limit=20):
+        own, total = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")
+            own[frames[-1]] += count
+            for frame in set(frames):
+                total[frame] += count
+        samples = sum(self.stacks.values()) or 1
+        lines = [f"{'self %':>7} {'total %':>8}  function"]
+        for frame, count in own.most_common(limit):
+            lines.append(f"{100 * count / samples:>7.1f} {100 * total[frame] / samples:>8.1f}  {frame}")
+        return "\n".join(lines)
+
+
+_profiler = None
+
+
+def start_profiler(mode=profile_mode):
+    global _profiler
+    if mode == "cprofile":
+        import cProfile
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+    elif mode == "sample":
+        _profiler = StackSampler()
+        _profiler.start()
+    elif mode:
+        print(f"Unknown NBA_PROFILE={mode!r}; use cprofile or sample", file=sys.stderr)
+
+
+def finish_profiler():
+    if _profiler is None:
+        return
+    if isinstance(_profiler, StackSampler):
+        _profiler.stop()
+        path = _profiler.save(artifact_path(".folded"))
+        print(f"Sampled {_profiler.samples} times; folded stacks saved to {path}\n{_profiler.top()}", file=sys.stderr)
+    else:
+        import io
+        import pstats
+        _profiler.disable()
+        path = artifact_path(".prof")
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        _profiler.dump_stats(path)
+        report = io.StringIO()
+        pstats.Stats(_profiler, stream=report).sort_stats("cumulative").print_stats(20)
+        print(f"cProfile stats saved to {path}\n{report.getvalue()}", file=sys.stderr)
+
+
+# At exit: stop the profiler and write the trace and its summary
+def finish_run():
+    finish_profiler()
+    spans = recorded_spans()
+    if tracing_enabled and spans:
+        path = export_trace(artifact_path(".json"), spans)
+        print(f"Trace of {len(spans)} spans saved to {path}\n{format_summary(summarize_spans(spans))}", file=sys.stderr)
+
+
+# Configured before the scripts' own basicConfig calls, which then leave it in place
+if log_level:
+    logging.basicConfig(level=log_level, format='%(asctime)s - %(levelname)s - %(message)s')
+
+if tracing_enabled or profile_mode:
+    start_profiler()
+    atexit.register(finish_run)
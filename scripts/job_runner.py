@@ -0,0 +1,294 @@
+"""
+This script runs the season analyses for a matrix of (analysis, season, split) tasks across a process pool,
+writing one output per task.
+
+Key Features:
+1. Analyses: `compare_seasons` (season vs. the previous season), `rank_season_players` and
+   `defensive_impact`. Each reuses the function of the script with the same name.
+2. Splits: `season`, `home`, `away`, `month-MM` (calendar month, e.g. `month-01`) and `last-N`
+   (each player's last N games). Player splits are aggregated from the league-wide player game log.
+   Defensive splits are passed to LeagueDashPtDefend as its location/month/last-N filters.
+3. Inputs come from local data: the parent process first pulls every input once (concurrently, through
+   the response cache or the warehouse). Workers then read them from the cache and keep each season's
+   game log in memory for the tasks that follow.
+4. Tasks run in a `ProcessPoolExecutor`. A failing task is recorded and does not stop the others.
+   Progress (done/total, rate, ETA) is logged as tasks finish.
+5. Outputs go to `output/jobs/<analysis>/<season>/<split>.csv` (plus `.parquet`/`.arrow` files with the
+   numeric columns when `NBA_OUTPUT_FORMATS` asks for them), with a `manifest.json` recording the
+   status, outputs, error and duration of every task.
+
+Usage:
+- python scripts/job_runner.py --analyses rank_season_players compare_seasons --seasons 1996-97:2024-25 \
+    --splits season home away last-10 --workers 8
+- python scripts/job_runner.py --analyses defensive_impact --seasons 2023-24 2024-25 --splits season month-01
+- python benchmarks/benchmark_job_runner.py to measure throughput as the worker count grows.
+"""
+
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+import argparse
+import json
+import logging
+import os
+import time
+import pandas as pd
+from data_context import DataContext
+from output_writer import write_output
+from response_cache import current_season, log_cache_stats
+from warehouse import aggregate_season_totals
+
+# Directory for job outputs
+jobs_output_dir = os.path.join("output", "jobs")
+
+ANALYSES = ("compare_seasons", "rank_season_players", "defensive_impact")
+
+# First season with player tracking and full game logs
+FIRST_SEASON = "1996-97"
+
+Task = namedtuple("Task", ["analysis", "season", "split"])
+
+
+def season_start_year(season):
+    return int(season[:4])
+
+
+def season_name(start_year):
+    return f"{start_year}-{str(start_year + 1)[-2:]}"
+
+
+def previous_season(season):
+    return season_name(season_start_year(season) - 1)
+
+
+# Seasons from first to last, inclusive
+def season_range(first, last):
+    return [season_name(year) for year in range(season_start_year(first), season_start_year(last) + 1)]
+
+
+# "1996-97:2024-25" ranges and single seasons
+def parse_seasons(values):
+    seasons = []
+    for value in values:
+        if ":" in value:
+            first, last = value.split(":", 1)
+            seasons.extend(season_range(first or FIRST_SEASON, last or current_season()))
+        else:
+            seasons.append(value)
+    return list(dict.fromkeys(seasons))
+
+
+# ("season", None), ("home", None), ("month", 1), ("last", 10) ...
+def parse_split(split):
+    if split in ("season", "home", "away"):
+        return split, None
+    kind, _, value = split.partition("-")
+    if kind == "month" and value.isdigit() and 1 <= int(value) <= 12:
+        return kind, int(value)
+    if kind == "last" and value.isdigit() and int(value) > 0:
+        return kind, int(value)
+    raise ValueError(f"Unknown split {split}; use season, home, away, month-MM or last-N")
+
+
+# Game log rows belonging to a split
+def split_game_log(gamelog, split):
+    kind, value = parse_split(split)
+    if kind == "season":
+        return gamelog
+    if kind == "home":
+        return gamelog[gamelog["MATCHUP"].str.contains(" vs. ", regex=False)]
+    if kind == "away":
+        return gamelog[gamelog["MATCHUP"].str.contains(" @ ", regex=False)]
+    if kind == "month":
+        return gamelog[pd.to_datetime(gamelog["GAME_DATE"]).dt.month == value]
+    return gamelog.sort_values("GAME_DATE", kind="stable").groupby("PLAYER_ID").tail(value)
+
+
+# LeagueDashPtDefend filters for a split
+def defensive_filters(split):
+    kind, value = parse_split(split)
+    if kind == "home":
+        return {"location_nullable": "Home"}
+    if kind == "away":
+        return {"location_nullable": "Road"}
+    if kind == "month":
+        # The endpoint numbers months from the start of the season (October = 1)
+        return {"month_nullable": (value - 10) % 12 + 1}
+    if kind == "last":
+        return {"last_n_games_nullable": value}
+    return {}
+
+
+# One context per worker process, reused by every task it runs
+_context = None
+
+
+def worker_context():
+    global _context
+    if _context is None:
+        _context = DataContext()
+    return _context
+
+
+@lru_cache(maxsize=4)
+def season_game_log(season):
+    return worker_context().league_player_game_log(season)
+
+
+# Player totals (LeagueDashPlayerStats shape) for a season and split
+def split_totals(season, split):
+    if split == "season":
+        return worker_context().player_season_totals(season)
+    return aggregate_season_totals(split_game_log(season_game_log(season), split))
+
+
+def task_output_path(output_dir, task, suffix=""):
+    return os.path.join(output_dir, task.analysis, task.season, f"{task.split}{suffix}.csv")
+
+
+# Run one task and write its outputs; returns the output paths
+def run_task(task, output_dir):
+    from compare_seasons import format_changes, season_pair_changes
+    from defensive_impact_analysis import analyze_defensive_impact
+    from rank_season_players import format_season_rankings, season_rankings
+
+    os.makedirs(os.path.dirname(task_output_path(output_dir, task)), exist_ok=True)
+    # suffix -> (numeric frame, CSV presentation view)
+    if task.analysis == "rank_season_players":
+        outputs = {"": (season_rankings(split_totals(task.season, task.split)), format_season_rankings)}
+    elif task.analysis == "compare_seasons":
+        improvements, declines = season_pair_changes(
+            split_totals(task.season, task.split), split_totals(previous_season(task.season), task.split),
+            task.season, previous_season(task.season)
+        )
+        outputs = {"_improvements": (improvements.drop(columns="ROW"), format_changes),
+                   "_declines": (declines.drop(columns="ROW"), format_changes)}
+    elif task.analysis == "defensive_impact":
+        outputs = {"": (analyze_defensive_impact(worker_context(), season=task.season, **defensive_filters(task.split)), None)}
+    else:
+        raise ValueError(f"Unknown analysis {task.analysis}")
+
+    paths = []
+    for suffix, (df, view) in outputs.items():
+        paths.extend(write_output(df, task_output_path(output_dir, task, suffix), view=view))
+    return paths
+
+
+# Worker entry point: never raises, so one failing task cannot take down the pool
+def execute_task(task, output_dir):
+    start = time.perf_counter()
+    try:
+        outputs = run_task(task, output_dir)
+        return {"task": task._asdict(), "status": "ok", "outputs": outputs, "seconds": time.perf_counter() - start}
+    except Exception as e:
+        return {"task": task._asdict(), "status": "failed", "error": f"{type(e).__name__}: {e}",
+                "seconds": time.perf_counter() - start}
+
+
+def init_worker():
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+# Pull every input once in the parent so workers only read local data
+def prefetch_inputs(tasks):
+    from concurrent_fetch import fetch_concurrently
+    from nba_api.stats.endpoints import leaguedashptdefend
+
+    context = DataContext()
+    calls = {}
+    for task in tasks:
+        seasons = [task.season, previous_season(task.season)] if task.analysis == "compare_seasons" else [task.season]
+        for season in seasons:
+            if task.analysis == "defensive_impact":
+                filters = defensive_filters(task.split)
+                key = ("defend", season, tuple(sorted(filters.items())))
+                calls[key] = context.frame_call(leaguedashptdefend.LeagueDashPtDefend, season=season, **filters)
+            elif task.split == "season":
+                calls[("totals", season)] = lambda season=season: context.player_season_totals(season)
+            else:
+                calls[("gamelog", season)] = lambda season=season: context.league_player_game_log(season)
+
+    def guarded(key, call):
+        def run():
+            try:
+                call()
+            except Exception as e:
+                logging.warning(f"Could not prefetch {key}: {e}")
+        return run
+
+    logging.info(f"Prefetching {len(calls)} inputs")
+    fetch_concurrently([guarded(key, call) for key, call in calls.items()])
+    logging.info(f"Prefetch: {context.summary()}")
+
+
+# Run every task across `workers` processes; returns one result dict per task
+def run_jobs(tasks, workers=None, output_dir=jobs_output_dir, prefetch=True):
+    workers = workers or os.cpu_count() or 1
+    # Tasks of the same season next to each other, so a worker's game log cache is reused
+    tasks = sorted(tasks, key=lambda task: (task.season, task.split, task.analysis))
+    if prefetch:
+        prefetch_inputs(tasks)
+
+    os.makedirs(output_dir, exist_ok=True)
+    results = []
+    start = time.perf_counter()
+    logging.info(f"Running {len(tasks)} tasks on {workers} worker processes")
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as executor:
+        futures = {executor.submit(execute_task, task, output_dir): task for task in tasks}
+        for future in as_completed(futures):
+            task = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # The worker process itself died (e.g. out of memory)
+                result = {"task": task._asdict(), "status": "failed", "error": f"{type(e).__name__}: {e}", "seconds": 0.0}
+            results.append(result)
+
+            elapsed = time.perf_counter() - start
+            rate = len(results) / elapsed
+            eta = (len(tasks) - len(results)) / rate if rate else 0
+            message = f"[{len(results)}/{len(tasks)}] {task.analysis} {task.season} {task.split}: {result['status']} " \
+                      f"in {result['seconds']:.2f}s ({rate:.1f} tasks/s, ETA {eta:.0f}s)"
+            if result["status"] == "ok":
+                logging.info(message)
+            else:
+                logging.error(f"{message} - {result['error']}")
+
+    failed = sum(result["status"] != "ok" for result in results)
+    manifest_path = os.path.join(output_dir, "manifest.json")
+    with open(manifest_path, "w", encoding="utf-8") as manifest_file:
+        json.dump({"workers": workers, "seconds": time.perf_counter() - start, "tasks": results}, manifest_file, indent=2)
+    logging.info(f"{len(results) - failed} tasks succeeded, {failed} failed in {time.perf_counter() - start:.1f}s; "
+                 f"manifest saved to {manifest_path}")
+    return results
+
+
+def build_tasks(analyses, seasons, splits):
+    for split in splits:
+        parse_split(split)
+    return [Task(analysis, season, split) for analysis in analyses for season in seasons for split in splits]
+
+
+def main():
+    # Configure logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Run season analyses for many seasons and splits in parallel.")
+    parser.add_argument("--analyses", nargs="+", choices=ANALYSES, default=["rank_season_players"])
+    parser.add_argument("--seasons", nargs="+", default=[f"{FIRST_SEASON}:"],
+                        help="Seasons or FIRST:LAST ranges (default: 1996-97 through the current season)")
+    parser.add_argument("--splits", nargs="+", default=["season"], help="season, home, away, month-MM, last-N")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--output-dir", default=jobs_output_dir)
+    parser.add_argument("--no-prefetch", action="store_true", help="Let workers fetch their own inputs")
+    args = parser.parse_args()
+
+    tasks = build_tasks(args.analyses, parse_seasons(args.seasons), args.splits)
+    results = run_jobs(tasks, args.workers, args.output_dir, prefetch=not args.no_prefetch)
+    log_cache_stats()
+    if any(result["status"] != "ok" for result in results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
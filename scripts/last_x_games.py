@@ -1,155 +1,182 @@
 # This script fetches and analyzes the last X games stats for a specific NBA player.
-# The user is prompted to enter the player's name and the number of games to analyze (1-30) or "season" for season totals.
+# Pass the player's name and the number of games to analyze (1-30) or "season" for season totals:
+#   python scripts/last_x_games.py --player "LeBron James" --last 10
 # The script then fetches the player's game logs, calculates various statistics, and saves the results to a CSV file.
+#
+# Batch mode computes last-N and season averages for many players at once from a single
+# league-wide game log pull, and writes them to one CSV or Parquet file:
+#   python scripts/last_x_games.py --all --games 5 10 15
+#   python scripts/last_x_games.py --team LAL --output output/lakers_form.parquet
+#   python scripts/last_x_games.py --players "LeBron James" "Stephen Curry"
 
-from nba_api.stats.endpoints import leaguedashplayerstats, playergamelog
 import pandas as pd
+import argparse
 import logging
 import os
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-from difflib import get_close_matches
-
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-
-# Configure retry strategy
-retry_strategy = Retry(
-    total=5,  # Increase the total number of retries
-    backoff_factor=2,  # Increase the backoff factor for exponential backoff
-    status_forcelist=[429, 500, 502, 503, 504],
-    allowed_methods=["HEAD", "GET", "OPTIONS"]
-)
-adapter = HTTPAdapter(max_retries=retry_strategy)
-http = requests.Session()
-http.mount("https://", adapter)
-
-# Prompt for player selection
-player_name = input("Enter the name of the player for detailed analysis: ")
-
-# Prompt for the number of games to analyze or "season" for season totals
-while True:
-    num_games_input = input("Enter the number of games to analyze (1-30) or 'season' for season totals: ")
-    if num_games_input.lower() == "season":
-        num_games = "season"
-        break
-    try:
-        num_games = int(num_games_input)
-        if 1 <= num_games <= 30:
-            break
-        else:
-            print("Please enter a number between 1 and 30.")
-    except ValueError:
-        print("Invalid input. Please enter a number between 1 and 30 or 'season'.")
+from data_context import DataContext
+from instrumentation import traced
+from output_writer import EXTENSIONS, write_output
+from player_index import resolve_player
+from response_cache import log_cache_stats
+from rolling_stats import player_rolling_stats
 
 # Directory to save CSV files
 output_dir = "output"
-os.makedirs(output_dir, exist_ok=True)
-
-# Fetch player ID for the selected player
-def get_player_id(player_name):
-    player_stats = leaguedashplayerstats.LeagueDashPlayerStats(season="2024-25").get_data_frames()[0]
-    player = player_stats[player_stats['PLAYER_NAME'] == player_name]
-    if not player.empty:
-        return player.iloc[0]['PLAYER_ID']
-    else:
-        # Provide suggestions for similar player names
-        all_player_names = player_stats['PLAYER_NAME'].tolist()
-        suggestions = get_close_matches(player_name, all_player_names, n=5, cutoff=0.6)
-        if suggestions:
-            logging.error(f"Player {player_name} not found. Did you mean: {', '.join(suggestions)}?")
-        else:
-            logging.error(f"Player {player_name} not found and no similar names were found.")
-        return None
+
+# Game log stat column -> label suffix used in the output
+STAT_LABELS = {
+    "PTS": "PPG", "REB": "RPG", "AST": "APG", "STL": "SPG", "BLK": "BPG", "MIN": "MPG",
+    "FGM": "FGM", "FGA": "FGA", "FG3M": "FG3M", "FG3A": "FG3A", "FTM": "FTM", "FTA": "FTA",
+    "TOV": "TO", "PF": "PF", "PLUS_MINUS": "+/-"
+}
+
+# Parse the player selection: one player (--player) or batch mode (--players, --team or --all)
+def parse_args():
+    parser = argparse.ArgumentParser(description="Last X games stats for one player or many (batch).")
+    selection = parser.add_mutually_exclusive_group(required=True)
+    selection.add_argument("--player", help="One player's detailed stats over --last games")
+    selection.add_argument("--players", nargs="+", help="Player names to include")
+    selection.add_argument("--team", help="Team abbreviation (e.g. LAL) whose players to include")
+    selection.add_argument("--all", action="store_true", help="Include every player in the league")
+    parser.add_argument("--last", default="10", help="Games to analyze for --player (1-30), or 'season' for season totals")
+    parser.add_argument("--games", nargs="+", type=int, default=[5, 10, 15], help="Last-N windows to compute (1-30)")
+    parser.add_argument("--season", default="2024-25", help="Season to analyze")
+    parser.add_argument("--output", help="Output file (.csv, .parquet or .arrow); defaults to output/last_x_games_batch.csv")
+    return parser.parse_args()
+
+# Number of games from --last: 1-30, or "season" for season totals
+def parse_num_games(value):
+    if value.lower() == "season":
+        return "season"
+    if value.isdigit() and 1 <= int(value) <= 30:
+        return int(value)
+    raise SystemExit("--last must be a number between 1 and 30 or 'season'.")
 
 # Fetch last x games or season totals and calculate various statistics for the player
-def get_last_x_games_stats(player_id, player_name, num_games):
+def get_last_x_games_stats(player_id, player_name, num_games, context, season="2024-25"):
     try:
-        logging.info(f"Fetching last {num_games} games stats for {player_name} (ID: {player_id})")
-        gamelog = playergamelog.PlayerGameLog(player_id=player_id, season="2024-25", timeout=120).get_data_frames()[0]  # Increase timeout
-        gamelog['PTS'] = pd.to_numeric(gamelog['PTS'])
-        gamelog['REB'] = pd.to_numeric(gamelog['REB'])
-        gamelog['AST'] = pd.to_numeric(gamelog['AST'])
-        gamelog['STL'] = pd.to_numeric(gamelog['STL'])
-        gamelog['BLK'] = pd.to_numeric(gamelog['BLK'])
-        gamelog['MIN'] = pd.to_numeric(gamelog['MIN'])
-        gamelog['FGM'] = pd.to_numeric(gamelog['FGM'])
-        gamelog['FGA'] = pd.to_numeric(gamelog['FGA'])
-        gamelog['FG3M'] = pd.to_numeric(gamelog['FG3M'])
-        gamelog['FG3A'] = pd.to_numeric(gamelog['FG3A'])
-        gamelog['FTM'] = pd.to_numeric(gamelog['FTM'])
-        gamelog['FTA'] = pd.to_numeric(gamelog['FTA'])
-        gamelog['TO'] = pd.to_numeric(gamelog['TOV'])
-        gamelog['PF'] = pd.to_numeric(gamelog['PF'])
-        gamelog['PLUS_MINUS'] = pd.to_numeric(gamelog['PLUS_MINUS'])
+        logging.info(f"Fetching last {num_games} games stats for {player_name} (ID: {player_id}) in {season}")
+        gamelog = context.player_game_log(player_id, season, timeout=120)  # Increase timeout
+        # Build running sums once; any window is then a difference of two prefix rows
+        rolling = player_rolling_stats(player_id, player_name, gamelog)
 
         if num_games == "season":
-            avg_points = gamelog['PTS'].mean()
-            avg_rebounds = gamelog['REB'].mean()
-            avg_assists = gamelog['AST'].mean()
-            avg_steals = gamelog['STL'].mean()
-            avg_blocks = gamelog['BLK'].mean()
-            avg_minutes = gamelog['MIN'].mean()
-            avg_fgm = gamelog['FGM'].mean()
-            avg_fga = gamelog['FGA'].mean()
-            avg_fg3m = gamelog['FG3M'].mean()
-            avg_fg3a = gamelog['FG3A'].mean()
-            avg_ftm = gamelog['FTM'].mean()
-            avg_fta = gamelog['FTA'].mean()
-            avg_turnovers = gamelog['TO'].mean()
-            avg_fouls = gamelog['PF'].mean()
-            avg_plus_minus = gamelog['PLUS_MINUS'].mean()
+            averages = rolling.window_means()
             num_games_text = "Season"
         else:
-            avg_points = gamelog['PTS'].head(num_games).mean()
-            avg_rebounds = gamelog['REB'].head(num_games).mean()
-            avg_assists = gamelog['AST'].head(num_games).mean()
-            avg_steals = gamelog['STL'].head(num_games).mean()
-            avg_blocks = gamelog['BLK'].head(num_games).mean()
-            avg_minutes = gamelog['MIN'].head(num_games).mean()
-            avg_fgm = gamelog['FGM'].head(num_games).mean()
-            avg_fga = gamelog['FGA'].head(num_games).mean()
-            avg_fg3m = gamelog['FG3M'].head(num_games).mean()
-            avg_fg3a = gamelog['FG3A'].head(num_games).mean()
-            avg_ftm = gamelog['FTM'].head(num_games).mean()
-            avg_fta = gamelog['FTA'].head(num_games).mean()
-            avg_turnovers = gamelog['TO'].head(num_games).mean()
-            avg_fouls = gamelog['PF'].head(num_games).mean()
-            avg_plus_minus = gamelog['PLUS_MINUS'].head(num_games).mean()
+            averages = rolling.window_means(num_games)
             num_games_text = f"Last {num_games} Games"
 
-        return {
-            "Player": player_name,
-            f"{num_games_text} PPG": round(avg_points, 1),
-            f"{num_games_text} RPG": round(avg_rebounds, 1),
-            f"{num_games_text} APG": round(avg_assists, 1),
-            f"{num_games_text} SPG": round(avg_steals, 1),
-            f"{num_games_text} BPG": round(avg_blocks, 1),
-            f"{num_games_text} MPG": round(avg_minutes, 1),
-            f"{num_games_text} FGM": round(avg_fgm, 1),
-            f"{num_games_text} FGA": round(avg_fga, 1),
-            f"{num_games_text} FG3M": round(avg_fg3m, 1),
-            f"{num_games_text} FG3A": round(avg_fg3a, 1),
-            f"{num_games_text} FTM": round(avg_ftm, 1),
-            f"{num_games_text} FTA": round(avg_fta, 1),
-            f"{num_games_text} TO": round(avg_turnovers, 1),
-            f"{num_games_text} PF": round(avg_fouls, 1),
-            f"{num_games_text} +/-": round(avg_plus_minus, 1)
-        }
+        stats = {"Player": player_name}
+        for stat, label in STAT_LABELS.items():
+            stats[f"{num_games_text} {label}"] = round(averages[stat], 1)
+        return stats
     except Exception as e:
         logging.error(f"Error fetching {player_name}: {e}")
         return None
 
+# Fetch the league-wide player game log for the season in one request (or from the warehouse)
+def fetch_league_game_log(season, context):
+    logging.info(f"Fetching league-wide player game log for {season}")
+    # Stat columns arrive typed from the data context (see schemas.py)
+    return context.league_player_game_log(season)
+
+# Keep only the requested players, team or the whole league
+@traced("transform")
+def select_players(gamelog, players=None, team=None, context=None):
+    if players:
+        player_ids = {}
+        for name in players:
+            player_id, player_name = resolve_player(name, context)
+            if player_id:
+                player_ids[player_id] = player_name
+        selected = gamelog[gamelog['PLAYER_ID'].isin(player_ids)]
+        played = set(selected['PLAYER_ID'])
+        missing = sorted(name for player_id, name in player_ids.items() if player_id not in played)
+        if missing:
+            logging.error(f"Players without games in the {len(gamelog)}-row game log: {', '.join(missing)}")
+        return selected
+    if team:
+        # A traded player's games for every team count; select by the team of their latest game
+        latest_team = gamelog.sort_values('GAME_DATE').groupby('PLAYER_ID')['TEAM_ABBREVIATION'].last()
+        return gamelog[gamelog['PLAYER_ID'].isin(latest_team[latest_team == team.upper()].index)]
+    return gamelog
+
+# Compute last-N and season averages for every player at once with groupby and rolling windows
+@traced("transform")
+def compute_batch_averages(gamelog, windows):
+    stats = list(STAT_LABELS)
+    # Oldest game first, so the last row of each player's rolling window covers their latest N games
+    gamelog = gamelog.sort_values(['PLAYER_ID', 'GAME_DATE'], kind='stable')
+    by_player = gamelog.groupby('PLAYER_ID', sort=True)
+
+    result = by_player.agg(
+        Player=('PLAYER_NAME', 'last'),
+        Team=('TEAM_ABBREVIATION', 'last'),
+        GP=('GAME_ID', 'count'),
+    )
+    for window in windows:
+        rolling = by_player[stats].rolling(window, min_periods=1).mean()
+        latest = rolling.groupby(level='PLAYER_ID').last()
+        result = result.join(latest.round(1).rename(
+            columns={stat: f"Last {window} Games {label}" for stat, label in STAT_LABELS.items()}
+        ))
+    season = by_player[stats].mean().round(1)
+    result = result.join(season.rename(columns={stat: f"Season {label}" for stat, label in STAT_LABELS.items()}))
+    return result.reset_index()
+
+# Write the batch results; a .parquet/.arrow extension picks that format, otherwise NBA_OUTPUT_FORMATS applies
+def save_batch_results(results, output_file):
+    extension = os.path.splitext(output_file)[1].lower()
+    formats = [fmt for fmt, fmt_extension in EXTENSIONS.items() if fmt_extension == extension and fmt != "csv"]
+    paths = write_output(results, output_file, formats=formats or None)
+    logging.info(f"Batch stats for {len(results)} players saved to {', '.join(paths)}")
+
+# Batch mode: many players from one league-wide game log
+def run_batch(args):
+    windows = sorted(set(args.games))
+    if not all(1 <= window <= 30 for window in windows):
+        raise SystemExit("--games windows must be between 1 and 30.")
+    context = DataContext()
+    gamelog = fetch_league_game_log(args.season, context)
+    gamelog = select_players(gamelog, players=args.players, team=args.team, context=context)
+    if gamelog.empty:
+        logging.error("No games found for the selected players.")
+        return
+    results = compute_batch_averages(gamelog, windows)
+    save_batch_results(results, args.output or os.path.join(output_dir, 'last_x_games_batch.csv'))
+    logging.info(f"Data context: {context.summary()}")
+    log_cache_stats()
+
+# Single-player mode
+def run_single(args):
+    player_name, num_games = args.player, parse_num_games(args.last)
+    context = DataContext()
+    player_id, player_name = resolve_player(player_name, context)
+    if player_id:
+        detailed_stats = get_last_x_games_stats(player_id, player_name, num_games, context, args.season)
+        if detailed_stats:
+            logging.info(f"Detailed stats for {player_name}: {detailed_stats}")
+            # Save detailed stats to CSV
+            output_file = os.path.join(output_dir, f'{player_name}_last_{num_games}_games_stats.csv')
+            # Create a DataFrame with two columns: Title and Stat
+            stats_df = pd.DataFrame(list(detailed_stats.items()), columns=['Title', 'Stat'])
+            paths = write_output(stats_df, output_file)
+            logging.info(f"Last {num_games} games stats saved to {', '.join(paths)}")
+            log_cache_stats()
+
 # Main execution
-player_id = get_player_id(player_name)
-if player_id:
-    detailed_stats = get_last_x_games_stats(player_id, player_name, num_games)
-    if detailed_stats:
-        logging.info(f"Detailed stats for {player_name}: {detailed_stats}")
-        # Save detailed stats to CSV
-        output_file = os.path.join(output_dir, f'{player_name}_last_{num_games}_games_stats.csv')
-        # Create a DataFrame with two columns: Title and Stat
-        stats_df = pd.DataFrame(list(detailed_stats.items()), columns=['Title', 'Stat'])
-        stats_df.to_csv(output_file, index=False)
-        logging.info(f"Last {num_games} games stats saved to {output_file}")
\ No newline at end of file
+def main():
+    args = parse_args()
+
+    # Configure logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    os.makedirs(output_dir, exist_ok=True)
+
+    if args.player:
+        run_single(args)
+    else:
+        run_batch(args)
+
+if __name__ == "__main__":
+    main()
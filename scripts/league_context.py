@@ -0,0 +1,280 @@
+"""
+This module puts values in league context: for each season and stat it keeps the league-wide distribution
+(sorted values, mean and standard deviation), so percentile ranks, z-scores and "top X%" checks are binary
+searches instead of a re-sort of the league table for every query.
+
+Key Features:
+1. `LeagueContext.from_frame` sorts each stat column once. Lookups are vectorized over whole columns:
+   `percentiles` (one `np.searchsorted` per column), `z_scores` and `in_top`.
+2. Each stat knows whether lower is better (e.g. opponents' FG% for defenders), so a 90th percentile always
+   means better than 90% of the league.
+3. `add_context` appends ` Pctl` (and optionally ` Z`) columns to any frame of the same season, such as a
+   top-100 ranking, without fetching anything again.
+4. League tables: `players` (per-game stats and performance score from the season totals), `defense`
+   (LeagueDashPtDefend) and `team_shooting` (zone FG% from LeagueDashTeamShotLocations).
+5. Built contexts are saved to `cache/league_context_<table>_<season>.pkl` and reused for
+   `NBA_LEAGUE_CONTEXT_MAX_AGE_HOURS` (default 24). `warehouse.py ingest` rebuilds the `players` context
+   of every season it adds games to.
+
+Usage:
+- league = LeagueContext.from_frame(player_stats, ["PTS/G", "AST/G"]); league.percentiles("PTS/G", [25.0, 30.0])
+- rankings = league.add_context(rankings, ["Performance_Score/G"], z_scores=True)
+- get_league_context("2024-25", "defense", DataContext()).in_top("D_FG_PCT", values, 10)
+- python scripts/league_context.py build --season 2024-25 | lookup --season 2024-25 --table players --stat PTS/G 25 30
+"""
+
+from collections import namedtuple
+import argparse
+import logging
+import os
+import pickle
+import threading
+import time
+import numpy as np
+from instrumentation import traced
+from scoring import score_frame
+
+# Where built contexts are saved, and how long they are reused
+league_context_dir = os.environ.get("NBA_LEAGUE_CONTEXT_DIR", "cache")
+league_context_max_age_hours = float(os.environ.get("NBA_LEAGUE_CONTEXT_MAX_AGE_HOURS", 24))
+
+# Bump when the saved format changes
+CONTEXT_VERSION = 1
+
+# Season totals turned into per-game stats for the players table
+PLAYER_TOTALS = ("PTS", "OREB", "DREB", "REB", "AST", "STL", "BLK", "TOV", "PLUS_MINUS")
+
+# Shot zones of LeagueDashTeamShotLocations ranked by team_shooting_locations.py
+SHOT_ZONES = ("Restricted Area", "In The Paint (Non-RA)", "Mid-Range", "Corner 3", "Above the Break 3")
+
+
+class StatDistribution:
+    def __init__(self, values, lower_is_better=False):
+        values = np.asarray(values, dtype=np.float64)
+        self.sorted = np.sort(values[~np.isnan(values)])
+        self.lower_is_better = lower_is_better
+        self.mean = float(self.sorted.mean()) if len(self.sorted) else np.nan
+        self.std = float(self.sorted.std()) if len(self.sorted) else np.nan
+
+    def __len__(self):
+        return len(self.sorted)
+
+    # Share of the league (0-100) a value is at least as good as; ties count half
+    def percentiles(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        below = np.searchsorted(self.sorted, values, side="left")
+        at_or_below = np.searchsorted(self.sorted, values, side="right")
+        share = (below + at_or_below) / 2 / max(len(self.sorted), 1) * 100
+        if self.lower_is_better:
+            share = 100 - share
+        return np.where(np.isnan(values), np.nan, share)
+
+    def z_scores(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        z = (values - self.mean) / self.std if self.std else np.zeros_like(values)
+        return -z if self.lower_is_better else z
+
+    # The value a player must reach to be in the league's best `share` percent
+    def threshold(self, share):
+        if not len(self.sorted):
+            return np.nan
+        quantile = share / 100 if self.lower_is_better else 1 - share / 100
+        return float(np.quantile(self.sorted, quantile))
+
+    def in_top(self, values, share):
+        values = np.asarray(values, dtype=np.float64)
+        cutoff = self.threshold(share)
+        return values <= cutoff if self.lower_is_better else values >= cutoff
+
+
+class LeagueContext:
+    def __init__(self, season=None, table=None, distributions=None, built_at=None):
+        self.season = season
+        self.table = table
+        self.distributions = distributions or {}
+        self.built_at = built_at or time.time()
+
+    @classmethod
+    def from_frame(cls, frame, stats, lower_is_better=(), season=None, table=None):
+        return cls(season, table, {
+            stat: StatDistribution(frame[stat].to_numpy(dtype=np.float64, na_value=np.nan), stat in lower_is_better)
+            for stat in stats
+        })
+
+    def __contains__(self, stat):
+        return stat in self.distributions
+
+    def __getitem__(self, stat):
+        return self.distributions[stat]
+
+    def percentiles(self, stat, values):
+        return self.distributions[stat].percentiles(values)
+
+    def z_scores(self, stat, values):
+        return self.distributions[stat].z_scores(values)
+
+    def in_top(self, stat, values, share):
+        return self.distributions[stat].in_top(values, share)
+
+    # Copy of frame with a "<stat> Pctl" column (and "<stat> Z" if z_scores) per stat
+    @traced("transform", "LeagueContext.add_context")
+    def add_context(self, frame, stats=None, z_scores=False, names=None):
+        frame = frame.copy()
+        names = names or {}
+        for stat in stats or self.distributions:
+            label = names.get(stat, stat)
+            frame[f"{label} Pctl"] = self.percentiles(stat, frame[stat].to_numpy(dtype=np.float64, na_value=np.nan)).round(1)
+            if z_scores:
+                frame[f"{label} Z"] = self.z_scores(stat, frame[stat].to_numpy(dtype=np.float64, na_value=np.nan)).round(2)
+        return frame
+
+    def save(self, path=None):
+        path = path or league_context_path(self.season, self.table)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        state = {
+            "version": CONTEXT_VERSION,
+            "season": self.season,
+            "table": self.table,
+            "built_at": self.built_at,
+            "stats": {stat: (distribution.sorted, distribution.lower_is_better)
+                      for stat, distribution in self.distributions.items()},
+        }
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as context_file:
+            pickle.dump(state, context_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+
+
+# Per-game stats and the season performance score, one row per player
+def player_table(totals):
+    table = totals.copy()
+    games = table["GP"].where(table["GP"] > 0)
+    for stat in PLAYER_TOTALS:
+        table[f"{stat}/G"] = table[stat] / games
+    table["Performance_Score/G"] = score_frame(table, "season_per_game")
+    return table
+
+
+# Zone columns of the two-level shot location table, flattened to "<zone>_FG_PCT"
+def team_shooting_table(shot_locations):
+    table = shot_locations.copy()
+    table.columns = ['_'.join(col).strip() for col in table.columns.values]
+    return table
+
+
+# Table name -> (frame preparation, stat columns, stats where lower is better)
+LeagueTable = namedtuple("LeagueTable", ["prepare", "stats", "lower_is_better"])
+
+TABLES = {
+    "players": LeagueTable(player_table, [f"{stat}/G" for stat in PLAYER_TOTALS] + ["Performance_Score/G"], ("TOV/G",)),
+    "defense": LeagueTable(lambda frame: frame, ["D_FG_PCT", "PCT_PLUSMINUS"], ("D_FG_PCT", "PCT_PLUSMINUS")),
+    "team_shooting": LeagueTable(team_shooting_table, [f"{zone}_FG_PCT" for zone in SHOT_ZONES], ()),
+}
+
+
+def league_context_path(season, table):
+    return os.path.join(league_context_dir, f"league_context_{table}_{season}.pkl")
+
+
+# Context of a league table as the endpoint (or warehouse) returns it
+@traced("transform")
+def build_league_context(season, table, frame):
+    definition = TABLES[table]
+    return LeagueContext.from_frame(definition.prepare(frame), definition.stats, definition.lower_is_better,
+                                    season=season, table=table)
+
+
+# Fetch the league table a context is built from
+def fetch_league_table(context, season, table):
+    from nba_api.stats.endpoints import leaguedashptdefend
+
+    if table == "players":
+        return context.player_season_totals(season)
+    if table == "defense":
+        return context.get_frame(leaguedashptdefend.LeagueDashPtDefend, season=season)
+    return context.team_shot_locations(season)
+
+
+# Saved context if it is recent enough, otherwise None
+def load_league_context(season, table, path=None):
+    path = path or league_context_path(season, table)
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as context_file:
+        state = pickle.load(context_file)
+    if state.get("version") != CONTEXT_VERSION or time.time() - state["built_at"] > league_context_max_age_hours * 3600:
+        return None
+    distributions = {}
+    for stat, (values, lower_is_better) in state["stats"].items():
+        distributions[stat] = StatDistribution(values, lower_is_better)
+    return LeagueContext(state["season"], state["table"], distributions, state["built_at"])
+
+
+# Process-wide contexts: loaded from disk, or built (and saved) on first use
+_contexts = {}
+_key_locks = {}
+_contexts_lock = threading.Lock()
+
+
+def get_league_context(season, table, context=None, rebuild=False):
+    key = (season, table)
+    # The shared lock only guards the dictionaries; loading or building holds this key's lock, so a cold
+    # build does not block lookups of other seasons and tables
+    with _contexts_lock:
+        if not rebuild and key in _contexts:
+            return _contexts[key]
+        key_lock = _key_locks.setdefault(key, threading.Lock())
+
+    with key_lock:
+        # Another thread may have loaded it while we waited
+        with _contexts_lock:
+            league = None if rebuild else _contexts.get(key)
+        if league is not None:
+            return league
+        league = None if rebuild else load_league_context(season, table)
+        if league is None:
+            if context is None:
+                from data_context import DataContext
+                context = DataContext()
+            league = build_league_context(season, table, fetch_league_table(context, season, table))
+            league.save()
+            logging.info(f"Built {table} league context for {season} at {league_context_path(season, table)}")
+        with _contexts_lock:
+            _contexts[key] = league
+        return league
+
+
+def main():
+    from data_context import DataContext
+
+    # Configure logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="League distributions for percentile and z-score lookups.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="Rebuild and save league contexts")
+    build.add_argument("--season", default="2024-25")
+    build.add_argument("--tables", nargs="+", choices=list(TABLES), default=list(TABLES))
+    lookup = subparsers.add_parser("lookup", help="Percentiles and z-scores of values")
+    lookup.add_argument("--season", default="2024-25")
+    lookup.add_argument("--table", choices=list(TABLES), default="players")
+    lookup.add_argument("--stat", required=True)
+    lookup.add_argument("values", nargs="+", type=float)
+    args = parser.parse_args()
+
+    context = DataContext()
+    if args.command == "build":
+        for table in args.tables:
+            league = get_league_context(args.season, table, context, rebuild=True)
+            for stat, distribution in league.distributions.items():
+                print(f"{table:<14} {stat:<28} n={len(distribution):<5} mean={distribution.mean:.3f} std={distribution.std:.3f}")
+    else:
+        league = get_league_context(args.season, args.table, context)
+        if args.stat not in league:
+            parser.error(f"Unknown stat {args.stat}; {args.table} has {', '.join(league.distributions)}")
+        for value, percentile, z in zip(args.values, league.percentiles(args.stat, args.values), league.z_scores(args.stat, args.values)):
+            print(f"{args.stat} {value:g}: {percentile:.1f} percentile, z = {z:+.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+This module writes script outputs as CSV, Parquet or Arrow IPC, and reads them back.
+
+Key Features:
+1. `NBA_OUTPUT_FORMATS` (comma-separated, default `csv`) selects the formats every script writes, e.g.
+   `csv,parquet` or `arrow`. Each format gets its own extension next to the CSV path the script uses.
+2. CSV files get the presentation view (e.g. the `Formatted_Stats` strings). Parquet and Arrow files get
+   the numeric frame the view was built from, with numeric dtypes, so consumers filter and aggregate on
+   columns without parsing text.
+3. `read_output` loads any of the formats with column selection and row filters. Arrow IPC files are
+   memory-mapped and can be returned as a zero-copy `pyarrow.Table`; Parquet is read with memory mapping
+   and pushes column selection and filters down to the reader.
+4. Parquet and Arrow need pyarrow (in requirements.txt); CSV works without it.
+
+Usage:
+- paths = write_output(numeric_df, "output/top_100_season_performances.csv", view=format_season_rankings)
+- NBA_OUTPUT_FORMATS=csv,arrow python scripts/rank_season_players.py
+- df = read_output("output/top_100_season_performances.arrow", columns=["PLAYER_NAME", "PTS/G"],
+                   filters=[("PTS/G", ">=", 20)])
+"""
+
+import logging
+import operator
+import os
+import pandas as pd
+from instrumentation import span
+
+# Formats written by every script
+output_formats = [fmt.strip().lower() for fmt in os.environ.get("NBA_OUTPUT_FORMATS", "csv").split(",") if fmt.strip()]
+
+# Format -> file extension
+EXTENSIONS = {"csv": ".csv", "parquet": ".parquet", "arrow": ".arrow"}
+
+# Row filter operators, in pyarrow's (column, op, value) style
+FILTER_OPERATORS = {
+    "==": operator.eq, "=": operator.eq, "!=": operator.ne, "<": operator.lt, "<=": operator.le,
+    ">": operator.gt, ">=": operator.ge,
+}
+
+# The same operators as pyarrow.compute functions
+COMPUTE_FUNCTIONS = {
+    "==": "equal", "=": "equal", "!=": "not_equal", "<": "less", "<=": "less_equal", ">": "greater",
+    ">=": "greater_equal",
+}
+
+
+def import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("Parquet and Arrow outputs need pyarrow: pip install pyarrow") from e
+    return pyarrow
+
+
+def resolve_formats(formats=None):
+    formats = list(formats or output_formats)
+    unknown = [fmt for fmt in formats if fmt not in EXTENSIONS]
+    if unknown:
+        raise ValueError(f"Unknown output format(s) {', '.join(unknown)}; use {', '.join(EXTENSIONS)}")
+    return formats
+
+
+# Object columns holding only numbers (e.g. "12" or None) become numeric; text columns are left as-is
+def numeric_dtypes(df):
+    df = df.copy()
+    for column in df.columns[df.dtypes == object]:
+        values = df[column]
+        converted = pd.to_numeric(values, errors="coerce")
+        if converted.notna().sum() == values.notna().sum():
+            df[column] = converted
+    return df
+
+
+# Write df under output_file's base name in every selected format; returns the written paths.
+# view(df) builds the CSV presentation (formatted strings, rounding); binary formats get df itself.
+def write_output(df, output_file, view=None, formats=None):
+    base = os.path.splitext(output_file)[0]
+    paths = []
+    for fmt in resolve_formats(formats):
+        path = base + EXTENSIONS[fmt]
+        with span(os.path.basename(path), "write", rows=len(df)):
+            if fmt == "csv":
+                (view(df) if view else df).to_csv(path, index=False)
+            else:
+                pa = import_pyarrow()
+                table = pa.Table.from_pandas(numeric_dtypes(df), preserve_index=False)
+                if fmt == "parquet":
+                    pa.parquet.write_table(table, path)
+                else:
+                    with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                        writer.write_table(table)
+        paths.append(path)
+    logging.debug(f"Wrote {len(df)} rows to {', '.join(paths)}")
+    return paths
+
+
+def filter_frame(df, filters):
+    mask = pd.Series(True, index=df.index)
+    for column, op, value in filters:
+        if op == "in":
+            mask &= df[column].isin(value)
+        elif op == "not in":
+            mask &= ~df[column].isin(value)
+        else:
+            mask &= FILTER_OPERATORS[op](df[column], value)
+    return df[mask]
+
+
+# Read an output file written by write_output. filters is a list of (column, op, value) tuples that must
+# all hold. With as_table=True, Arrow and Parquet files are returned as a pyarrow.Table; for Arrow files
+# that table is backed by the memory-mapped file (no copy).
+def read_output(path, columns=None, filters=None, as_table=False):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == EXTENSIONS["csv"]:
+        if as_table:
+            raise ValueError("as_table is only available for Parquet and Arrow outputs")
+        usecols = None if columns is None else list(dict.fromkeys(list(columns) + [f[0] for f in filters or []]))
+        df = pd.read_csv(path, usecols=usecols)
+        df = filter_frame(df, filters) if filters else df
+        return df[list(columns)] if columns is not None else df
+
+    pa = import_pyarrow()
+    if extension == EXTENSIONS["parquet"]:
+        table = pa.parquet.read_table(path, columns=columns, filters=filters, memory_map=True)
+    elif extension == EXTENSIONS["arrow"]:
+        table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+        if filters:
+            import pyarrow.compute as pc
+            mask = None
+            for column, op, value in filters:
+                if op in ("in", "not in"):
+                    condition = pc.is_in(table[column], value_set=pa.array(value))
+                    condition = pc.invert(condition) if op == "not in" else condition
+                else:
+                    condition = pc.call_function(COMPUTE_FUNCTIONS[op], [table[column], pa.scalar(value)])
+                mask = condition if mask is None else pc.and_(mask, condition)
+            table = table.filter(mask)
+        if columns is not None:
+            table = table.select(list(columns))
+    else:
+        raise ValueError(f"Unknown output file type {path}")
+    return table if as_table else table.to_pandas()
@@ -0,0 +1,268 @@
+"""
+This module ingests play-by-play data and finds clutch performances: points, assists and turnovers in the
+last 5 minutes of the fourth quarter or overtime with the score within 5 points.
+
+Key Features:
+1. Fetches `PlayByPlayV2` for many games concurrently, through the response cache (or a `DataContext`).
+2. Parses every game into a compact, array-backed `EventTable` (game index, period, clock, event type,
+   players, points scored and the home margin before the event), about 20 bytes per event instead of
+   the ~35 object columns of the raw frames.
+3. Finds the clutch events of every game with one vectorized mask and attributes points (from the score
+   changes), assists and turnovers to players with `np.bincount`.
+4. A full season is ingested in batches of games whose size is chosen to keep the raw frames and the event
+   table under a memory budget (`NBA_PBP_MEMORY_MB`, default 512).
+
+Usage:
+- python scripts/play_by_play.py --season 2024-25 --top 25
+- python scripts/play_by_play.py --games 0022400001 0022400002 --memory-mb 256
+- events = load_events(game_ids); clutch_stats(events)
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+
+from nba_api.stats.endpoints import leaguegamelog, playbyplayv2
+import numpy as np
+import pandas as pd
+
+from concurrent_fetch import MAX_IN_FLIGHT_REQUESTS, fetch_concurrently, game_frame_call
+from instrumentation import traced
+from output_writer import write_output
+from response_cache import current_season, fetch_endpoint, log_cache_stats
+
+# Memory budget for a play-by-play ingestion (raw frames in flight plus the event table)
+pbp_memory_budget_mb = float(os.environ.get("NBA_PBP_MEMORY_MB", 512))
+
+# Raw frames are held next to the parsed JSON they came from; count them twice against the budget
+RAW_OVERHEAD = 2
+
+# EVENTMSGTYPE values
+MADE_SHOT = 1
+TURNOVER = 5
+
+# PERSONxTYPE values of players (home, visitor); other types are teams or officials
+PLAYER_PERSON_TYPES = (4, 5)
+
+# Clutch time: fourth quarter or overtime, this many seconds left or fewer, margin within CLUTCH_MARGIN
+CLUTCH_PERIOD = 4
+CLUTCH_SECONDS = 300
+CLUTCH_MARGIN = 5
+
+EVENT_DTYPES = {
+    "game": np.int32,          # Index into EventTable.game_ids
+    "period": np.int8,
+    "seconds_left": np.int16,  # Game clock, seconds left in the period
+    "event_type": np.int8,
+    "player1": np.int32,       # 0 when the event has no player (team turnovers, period starts, ...)
+    "player2": np.int32,       # The assisting player of a made shot
+    "points": np.int8,         # Points scored on the event
+    "margin": np.int16,        # Home score minus away score before the event
+}
+
+
+# Player IDs of one PLAYERx column, 0 where the person is not a player
+def player_ids(frame, slot):
+    person_type = pd.to_numeric(frame[f"PERSON{slot}TYPE"], errors="coerce").fillna(0)
+    ids = pd.to_numeric(frame[f"PLAYER{slot}_ID"], errors="coerce").fillna(0)
+    return np.where(person_type.isin(PLAYER_PERSON_TYPES), ids, 0).astype(np.int32)
+
+
+# Parse one game's PlayByPlayV2 frame into event arrays
+def parse_game(frame, game_index):
+    clock = frame["PCTIMESTRING"].astype(str).str.extract(r"(\d+):(\d+)").astype(float).fillna(0)
+    # SCORE is "AWAY - HOME" on scoring events only; carry it forward to every event
+    score = frame["SCORE"].astype(str).str.extract(r"(\d+)\s*-\s*(\d+)").astype(float).ffill().fillna(0)
+    away, home = score[0].to_numpy(), score[1].to_numpy()
+    total = away + home
+    margin = home - away
+    return {
+        "game": np.full(len(frame), game_index, dtype=np.int32),
+        "period": frame["PERIOD"].to_numpy(np.int8),
+        "seconds_left": (clock[0] * 60 + clock[1]).to_numpy(np.int16),
+        "event_type": pd.to_numeric(frame["EVENTMSGTYPE"], errors="coerce").fillna(0).to_numpy(np.int8),
+        "player1": player_ids(frame, 1),
+        "player2": player_ids(frame, 2),
+        "points": np.clip(np.diff(total, prepend=0), 0, 4).astype(np.int8),
+        "margin": np.concatenate([[0], margin[:-1]]).astype(np.int16),
+    }
+
+
+# Player names seen in a game's events
+def player_names(frame):
+    names = {}
+    for slot in (1, 2):
+        ids = player_ids(frame, slot)
+        mask = ids > 0
+        names.update(zip(ids[mask].tolist(), frame[f"PLAYER{slot}_NAME"].to_numpy()[mask].tolist()))
+    return names
+
+
+class EventTable:
+    def __init__(self, columns, game_ids, names):
+        self.columns = columns
+        self.game_ids = list(game_ids)
+        self.names = names
+
+    @classmethod
+    @traced("transform")
+    def from_frames(cls, frames, game_ids, first_index=0):
+        parsed = [parse_game(frame, first_index + i) for i, frame in enumerate(frames) if not frame.empty]
+        names = {}
+        for frame in frames:
+            if not frame.empty:
+                names.update(player_names(frame))
+        columns = {
+            name: np.concatenate([game[name] for game in parsed]) if parsed else np.empty(0, dtype=dtype)
+            for name, dtype in EVENT_DTYPES.items()
+        }
+        return cls(columns, game_ids, names)
+
+    # One table from batches parsed with consecutive game indexes
+    @classmethod
+    def concat(cls, tables):
+        columns = {name: np.concatenate([table.columns[name] for table in tables]) for name in EVENT_DTYPES}
+        names = {}
+        for table in tables:
+            names.update(table.names)
+        return cls(columns, [game_id for table in tables for game_id in table.game_ids], names)
+
+    def __len__(self):
+        return len(self.columns["game"])
+
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for array in self.columns.values())
+
+    # Content hash of the events, game IDs and names (report sections are cached by it)
+    def digest(self):
+        hasher = hashlib.sha1(repr((self.game_ids, sorted(self.names.items()))).encode("utf-8"))
+        for name in EVENT_DTYPES:
+            hasher.update(self.columns[name].tobytes())
+        return hasher.hexdigest()
+
+    def to_frame(self):
+        df = pd.DataFrame(self.columns)
+        df.insert(0, "GAME_ID", np.asarray(self.game_ids, dtype=object)[df["game"]] if len(df) else [])
+        return df
+
+
+# Fetch the play-by-play frames of the games, concurrently; through the context when one is given
+def fetch_play_by_play(game_ids, context=None, max_in_flight=MAX_IN_FLIGHT_REQUESTS, final=True):
+    if context is not None:
+        calls = [context.frame_call(playbyplayv2.PlayByPlayV2, 0, final=final, game_id=game_id) for game_id in game_ids]
+    else:
+        calls = [game_frame_call(playbyplayv2.PlayByPlayV2, game_id, 0, final=final) for game_id in game_ids]
+    return fetch_concurrently(calls, max_in_flight=max_in_flight)
+
+
+# Fetch and parse the games in batches sized to stay under the memory budget
+def load_events(game_ids, context=None, memory_mb=None, max_in_flight=MAX_IN_FLIGHT_REQUESTS, final=True):
+    budget = (memory_mb or pbp_memory_budget_mb) * 1e6
+    game_ids = list(game_ids)
+    tables, start, batch_size = [], 0, max_in_flight
+    while start < len(game_ids):
+        batch = game_ids[start:start + batch_size]
+        frames = fetch_play_by_play(batch, context, max_in_flight, final)
+        # Deep memory usage is slow on object columns; the largest of a few frames stands in for the batch
+        sample = sorted(frames, key=len)[-3:]
+        per_game = max(max((frame.memory_usage(deep=True).sum() for frame in sample), default=0) * RAW_OVERHEAD, 1)
+        tables.append(EventTable.from_frames(frames, batch, first_index=start))
+        del frames, sample
+        start += len(batch)
+
+        # Size the next batch from the raw bytes per game and the room the event table leaves
+        stored = sum(table.nbytes for table in tables)
+        if stored >= budget:
+            logging.warning(f"Event table ({stored / 1e6:.1f} MB) exceeds the {budget / 1e6:.0f} MB budget")
+        batch_size = max(1, int((budget - stored) // per_game))
+        logging.info(f"Parsed {start}/{len(game_ids)} games ({stored / 1e6:.1f} MB of events, "
+                     f"{per_game / 1e6:.2f} MB raw per game, next batch {batch_size})")
+    return EventTable.concat(tables) if tables else EventTable.from_frames([], [])
+
+
+# Events played in clutch time
+def clutch_mask(events, seconds=CLUTCH_SECONDS, margin=CLUTCH_MARGIN):
+    columns = events.columns
+    return (
+        (columns["period"] >= CLUTCH_PERIOD)
+        & (columns["seconds_left"] <= seconds)
+        & (np.abs(columns["margin"]) <= margin)
+    )
+
+
+# Clutch points, assists and turnovers per player, most points first
+@traced("transform")
+def clutch_stats(events, seconds=CLUTCH_SECONDS, margin=CLUTCH_MARGIN):
+    columns = events.columns
+    clutch = clutch_mask(events, seconds, margin)
+    player1, player2 = columns["player1"], columns["player2"]
+    scoring = clutch & (columns["points"] > 0) & (player1 > 0)
+    assists = clutch & (columns["event_type"] == MADE_SHOT) & (player2 > 0)
+    turnovers = clutch & (columns["event_type"] == TURNOVER) & (player1 > 0)
+
+    parts = [player1[scoring], player2[assists], player1[turnovers]]
+    players, codes = np.unique(np.concatenate(parts), return_inverse=True)
+    bounds = np.cumsum([len(part) for part in parts])
+    size = len(players)
+    points = np.bincount(codes[:bounds[0]], weights=columns["points"][scoring], minlength=size)
+    assist_counts = np.bincount(codes[bounds[0]:bounds[1]], minlength=size)
+    turnover_counts = np.bincount(codes[bounds[1]:], minlength=size)
+
+    # Games with any clutch event by the player
+    involved = clutch & (player1 > 0)
+    pairs = np.unique(np.concatenate([
+        columns["game"][involved].astype(np.int64) << 32 | player1[involved],
+        columns["game"][assists].astype(np.int64) << 32 | player2[assists],
+    ]))
+    pair_players = (pairs & 0xFFFFFFFF).astype(np.int32)
+    games = np.bincount(np.searchsorted(players, pair_players[np.isin(pair_players, players)]), minlength=size)
+
+    df = pd.DataFrame({
+        "PLAYER_ID": players,
+        "PLAYER_NAME": [events.names.get(player_id, "") for player_id in players.tolist()],
+        "CLUTCH_GAMES": games,
+        "CLUTCH_PTS": points.astype(np.int32),
+        "CLUTCH_AST": assist_counts,
+        "CLUTCH_TOV": turnover_counts,
+    })
+    return df.sort_values(["CLUTCH_PTS", "CLUTCH_AST"], ascending=False, kind="stable").reset_index(drop=True)
+
+
+# Game IDs of a season, from the team game log
+def season_game_ids(season):
+    games = fetch_endpoint(leaguegamelog.LeagueGameLog, season=season, player_or_team_abbreviation="T")
+    return list(dict.fromkeys(games.get_data_frames()[0]["GAME_ID"]))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Clutch points, assists and turnovers from play-by-play.")
+    parser.add_argument("--season", help="Season (e.g. 2024-25); defaults to the current season")
+    parser.add_argument("--games", nargs="+", help="Game IDs instead of a whole season")
+    parser.add_argument("--top", type=int, default=25, help="Players to print")
+    parser.add_argument("--memory-mb", type=float, help="Memory budget in MB (default NBA_PBP_MEMORY_MB)")
+    parser.add_argument("--output", help="Output file (default output/clutch_<season>.csv)")
+    return parser.parse_args()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    args = parse_args()
+    season = args.season or current_season()
+    game_ids = args.games or season_game_ids(season)
+    logging.info(f"Loading play-by-play for {len(game_ids)} games")
+    events = load_events(game_ids, memory_mb=args.memory_mb)
+    logging.info(f"{len(events):,} events in {events.nbytes / 1e6:.1f} MB")
+
+    stats = clutch_stats(events)
+    print(stats.head(args.top).to_string(index=False))
+    output_file = args.output or os.path.join("output", f"clutch_{'games' if args.games else season}.csv")
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    for path in write_output(stats, output_file):
+        logging.info(f"Clutch stats saved to {path}")
+    log_cache_stats()
+
+
+if __name__ == "__main__":
+    main()
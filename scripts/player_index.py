@@ -0,0 +1,238 @@
+"""
+This module resolves player names to player IDs from an in-memory index, instead of filtering the league
+stats table for every lookup and running difflib over every name on a miss.
+
+Key Features:
+1. Built from nba_api's bundled static player list (no network) plus the current season's league table
+   (through the shared data context and response cache), so rookies missing from the static list are
+   still found.
+2. Exact lookups are a single dict access on a normalized key: case, accents, punctuation and extra
+   spaces are ignored ("luka doncic" finds "Luka Dončić", "pj washington" finds "P.J. Washington").
+   When several players share a name, active players win, then the most recent player ID.
+3. Fuzzy suggestions come from a character trigram index. Candidates are scored by trigram overlap
+   (Jaccard) with one vectorized `np.bincount` over the posting lists, not a scan of every name.
+4. The player list is saved to `cache/player_index.pkl` and reused for `NBA_PLAYER_INDEX_MAX_AGE_HOURS`
+   (default 24), so resolution works offline once the index is built.
+
+Usage:
+- index = get_player_index(context); index.resolve("lebron james")  # -> (2544, "LeBron James")
+- index.suggest("Lebron Jams")                                      # -> ["LeBron James", ...]
+- resolve_player("Stephen Curry", context)                          # logs suggestions on a miss
+- python scripts/player_index.py build | lookup NAME [NAME ...]
+"""
+
+from nba_api.stats.static import players as static_players
+from functools import lru_cache
+import argparse
+import logging
+import os
+import pickle
+import re
+import threading
+import time
+import unicodedata
+import numpy as np
+
+# Where the player list is saved, and how long it is reused
+player_index_path = os.environ.get("NBA_PLAYER_INDEX_PATH", os.path.join("cache", "player_index.pkl"))
+player_index_max_age_hours = float(os.environ.get("NBA_PLAYER_INDEX_MAX_AGE_HOURS", 24))
+
+# Season whose league table supplements the static player list
+INDEX_SEASON = "2024-25"
+
+# Bump when the saved format changes
+INDEX_VERSION = 1
+
+
+# Lowercase, strip accents and punctuation, collapse whitespace
+@lru_cache(maxsize=65536)
+def normalize_name(name):
+    decomposed = unicodedata.normalize("NFKD", str(name))
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char)).lower()
+    stripped = re.sub(r"[.'’`]", "", stripped)
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", stripped).split())
+
+
+def trigrams(normalized):
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class PlayerIndex:
+    def __init__(self):
+        self.player_ids = []
+        self.names = []
+        self.active = []
+        self._exact = {}
+        self._by_id = {}
+        self._postings = {}
+        self._sizes = None
+
+    def __len__(self):
+        return len(self.player_ids)
+
+    # Add a player; a new spelling of an indexed player's name is kept as an alias
+    def add(self, player_id, full_name, is_active=False):
+        player_id = int(player_id)
+        for position in self._by_id.get(player_id, ()):
+            if normalize_name(self.names[position]) == normalize_name(full_name):
+                self.active[position] = self.active[position] or bool(is_active)
+                return
+        self._by_id.setdefault(player_id, []).append(len(self.player_ids))
+        self.player_ids.append(player_id)
+        self.names.append(full_name)
+        self.active.append(bool(is_active))
+
+    # Build the exact-match and trigram lookups; call after adding players
+    def build(self):
+        self._exact = {}
+        postings = {}
+        sizes = np.zeros(len(self.names), dtype=np.int32)
+        for position, name in enumerate(self.names):
+            key = normalize_name(name)
+            current = self._exact.get(key)
+            if current is None or self._preferred(position, current):
+                self._exact[key] = position
+            grams = trigrams(key)
+            sizes[position] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(position)
+        self._postings = {gram: np.array(positions, dtype=np.int32) for gram, positions in postings.items()}
+        self._sizes = sizes
+        return self
+
+    # Active players first, then the newer (higher) player ID
+    def _preferred(self, position, current):
+        return (self.active[position], self.player_ids[position]) > (self.active[current], self.player_ids[current])
+
+    # Exact (normalized) match -> (PLAYER_ID, canonical name), or None
+    def resolve(self, name):
+        position = self._exact.get(normalize_name(name))
+        if position is None:
+            return None
+        return self.player_ids[position], self.names[position]
+
+    def name_of(self, player_id):
+        positions = self._by_id.get(int(player_id))
+        return self.names[positions[0]] if positions else None
+
+    # Closest names by trigram overlap, best first
+    def suggest(self, name, limit=5, cutoff=0.3):
+        query = trigrams(normalize_name(name))
+        grams = [self._postings[gram] for gram in query if gram in self._postings]
+        if not grams:
+            return []
+        shared = np.bincount(np.concatenate(grams), minlength=len(self.names))
+        scores = shared / (len(query) + self._sizes - shared)
+        candidates = np.flatnonzero(scores >= cutoff)
+        if len(candidates) > limit * 2:
+            # Extra candidates leave room for aliases of the same player
+            candidates = candidates[np.argpartition(-scores[candidates], limit * 2)[:limit * 2]]
+        ordered = sorted(candidates, key=lambda position: (-scores[position], not self.active[position]))
+        suggestions, seen = [], set()
+        for position in ordered:
+            if self.player_ids[position] not in seen:
+                seen.add(self.player_ids[position])
+                suggestions.append(self.names[position])
+        return suggestions[:limit]
+
+    def save(self, path=None):
+        path = path or player_index_path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        state = {
+            "version": INDEX_VERSION,
+            "built_at": time.time(),
+            "players": list(zip(self.player_ids, self.names, self.active)),
+        }
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as index_file:
+            pickle.dump(state, index_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+
+
+# Index of the static player list plus the players in the season's league table
+def build_player_index(context=None, season=INDEX_SEASON):
+    index = PlayerIndex()
+    for player in static_players.get_players():
+        index.add(player["id"], player["full_name"], player["is_active"])
+    if context is not None:
+        try:
+            table = context.player_season_totals(season)
+            for player_id, player_name in zip(table["PLAYER_ID"], table["PLAYER_NAME"]):
+                index.add(player_id, player_name, is_active=True)
+        except Exception as e:
+            logging.warning(f"Player index built from the static player list only: {e}")
+    return index.build()
+
+
+# Saved index if it is recent enough, otherwise None
+def load_player_index(path=None):
+    path = path or player_index_path
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as index_file:
+        state = pickle.load(index_file)
+    if state.get("version") != INDEX_VERSION or time.time() - state["built_at"] > player_index_max_age_hours * 3600:
+        return None
+    index = PlayerIndex()
+    for player_id, name, active in state["players"]:
+        index.add(player_id, name, active)
+    return index.build()
+
+
+# Process-wide index: loaded from disk, or built (and saved) on first use
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_player_index(context=None, rebuild=False):
+    global _index
+    with _index_lock:
+        if _index is None or rebuild:
+            index = None if rebuild else load_player_index()
+            if index is None:
+                index = build_player_index(context)
+                index.save()
+                logging.info(f"Built player index with {len(index)} players at {player_index_path}")
+            _index = index
+        return _index
+
+
+# (PLAYER_ID, canonical name) for a name, or (None, None) after logging suggestions
+def resolve_player(player_name, context=None):
+    index = get_player_index(context)
+    match = index.resolve(player_name)
+    if match is not None:
+        return match
+    suggestions = index.suggest(player_name)
+    if suggestions:
+        logging.error(f"Player {player_name} not found. Did you mean: {', '.join(suggestions)}?")
+    else:
+        logging.error(f"Player {player_name} not found and no similar names were found.")
+    return None, None
+
+
+def main():
+    from data_context import DataContext
+
+    # Configure logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Player name index.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("build", help="Rebuild and save the index")
+    lookup = subparsers.add_parser("lookup", help="Resolve player names")
+    lookup.add_argument("names", nargs="+")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        get_player_index(DataContext(), rebuild=True)
+    else:
+        index = get_player_index(DataContext())
+        for name in args.names:
+            match = index.resolve(name)
+            print(f"{name}: {match if match else 'not found'}; suggestions: {index.suggest(name)}")
+
+
+if __name__ == "__main__":
+    main()
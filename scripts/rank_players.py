@@ -12,23 +12,34 @@ Key Features:
 4. Ranks players by their performance score and selects the top 35 players.
 5. Outputs the results to a CSV file in the `output` directory with the following columns:
    - Player Name, Games Played, Reformatted Stats, and Performance Score.
+   With `NBA_OUTPUT_FORMATS=parquet` (or `arrow`) the numeric per-game stats are written instead of the
+   formatted string.
+
+6. Streaming mode (`--stream`) handles large multi-season or per-game exports: every CSV in the directory
+   is read in chunks with only the needed columns and float dtypes, per-player totals and games are
+   accumulated across chunks and files, and a bounded top-K heap picks the final ranking. Memory grows
+   with the number of players, not the number of rows. Files without a `G` column count one game per row.
 
 Usage:
 - Place the input CSV file in the `storage` directory.
 - Run the script, and the results will be saved in the `output` directory as `top_35_performances_reformatted.csv`.
+- python scripts/rank_players.py --stream --chunksize 100000    # Every CSV in `storage`, in chunks
+- python benchmarks/benchmark_rank_players_stream.py to measure rows per second and peak memory.
 """
 
 import pandas as pd
+import numpy as np
+import argparse
+import heapq
 import os
 import logging
-
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(asctime)s - %(levelname)s - %(message)s')
+from instrumentation import traced
+from output_writer import write_output
+from scoring import score_frame
 
 # Directory containing the CSV file
 input_dir = "storage"
 output_dir = "output"
-os.makedirs(output_dir, exist_ok=True)
 
 # Find the CSV file in the input directory
 def find_csv_file(directory):
@@ -51,50 +62,114 @@ def calculate_per_game_averages(df):
     df['+/-/G'] = df['+/-'] / df['G']
     return df
 
-# Calculate performance score
-def calculate_performance_score(row):
-    score = (
-        row['PTS/G'] * 1.0 +
-        row['ORB/G'] * 1.5 +
-        row['DRB/G'] * 1.2 +
-        row['AST/G'] * 1.5 +
-        row['STL/G'] * 3.0 +
-        row['BLK/G'] * 3.0 -
-        row['TOV/G'] * 1.0 +
-        row['+/-/G'] * 0.5
+# Per-game stats shown for each ranked player
+PER_GAME_STATS = ['PTS/G', 'ORB/G', 'DRB/G', 'REB/G', 'AST/G', 'STL/G', 'BLK/G', 'TOV/G', 'PF/G', '+/-/G']
+
+# Presentation view of the ranking: the per-game stats as one formatted string
+def format_rankings(rankings):
+    formatted = rankings.copy()
+    formatted['Formatted_Stats'] = formatted.apply(
+        lambda row: f"{row['PTS/G']:.1f} ppg, {row['ORB/G']:.1f} orpg, {row['DRB/G']:.1f} drpg, {row['REB/G']:.1f} rpg, {row['AST/G']:.1f} apg, {row['STL/G']:.1f} spg, {row['BLK/G']:.1f} bpg, {row['TOV/G']:.1f} tov, {row['+/-/G']:.1f} +/-",
+        axis=1
     )
-    return score
 
-# Main execution
-csv_file = find_csv_file(input_dir)
-if csv_file:
-    logging.info(f"Reading CSV file: {csv_file}")
-    df = pd.read_csv(csv_file)
+    # Select relevant columns for the CSV file
+    return formatted[['Player', 'Games_Played', 'Formatted_Stats', 'Performance_Score']]
+
+# Totals read in streaming mode; per-game exports without a G column count one game per row
+TOTAL_COLUMNS = ['PTS', 'ORB', 'DRB', 'TRB', 'AST', 'STL', 'BLK', 'TOV', 'PF', '+/-']
 
+# Every CSV file in the input directory
+def find_csv_files(directory):
+    return sorted(os.path.join(directory, filename) for filename in os.listdir(directory) if filename.endswith(".csv"))
+
+# Top players of one table with totals and games, formatted columns kept numeric
+@traced("transform")
+def rank_table(df, limit=35):
     # Calculate per-game averages
     df = calculate_per_game_averages(df)
 
     # Calculate performance scores
-    df['Performance_Score'] = df.apply(calculate_performance_score, axis=1)
+    df['Performance_Score'] = score_frame(df, "monthly_csv")
 
-    # Rank and select top 35 performances
-    top_performances = df.nlargest(35, 'Performance_Score')
-
-    # Reformat the stats
-    top_performances['Formatted_Stats'] = top_performances.apply(
-        lambda row: f"{row['PTS/G']:.1f} ppg, {row['ORB/G']:.1f} orpg, {row['DRB/G']:.1f} drpg, {row['REB/G']:.1f} rpg, {row['AST/G']:.1f} apg, {row['STL/G']:.1f} spg, {row['BLK/G']:.1f} bpg, {row['TOV/G']:.1f} tov, {row['+/-/G']:.1f} +/-",
-        axis=1
-    )
+    # Rank and select top performances
+    top_performances = df.nlargest(limit, 'Performance_Score')
 
     # Add the number of games played to the DataFrame
     top_performances['Games_Played'] = top_performances['G']
+    return top_performances[['Player', 'Games_Played'] + PER_GAME_STATS + ['Performance_Score']]
+
+# Per-player totals and games over every file, read in chunks of chunksize rows.
+# Only the needed columns are parsed, and only one chunk plus one row per player is held at a time.
+@traced("transform")
+def stream_player_totals(csv_files, chunksize=100_000):
+    totals = None
+    rows = 0
+    for csv_file in csv_files:
+        header = pd.read_csv(csv_file, nrows=0).columns
+        has_games = 'G' in header
+        columns = ['Player'] + TOTAL_COLUMNS + (['G'] if has_games else [])
+        dtypes = {column: 'float64' for column in columns if column != 'Player'}
+        logging.info(f"Streaming {csv_file}")
+        for chunk in pd.read_csv(csv_file, usecols=columns, dtype=dtypes, chunksize=chunksize):
+            rows += len(chunk)
+            if not has_games:
+                chunk['G'] = 1.0
+            chunk_totals = chunk.groupby('Player', sort=False)[TOTAL_COLUMNS + ['G']].sum()
+            totals = chunk_totals if totals is None else totals.add(chunk_totals, fill_value=0)
+    if totals is None:
+        return pd.DataFrame(columns=['Player'] + TOTAL_COLUMNS + ['G']), rows
+    return totals.rename_axis('Player').reset_index(), rows
+
+# Streaming ranking: per-player totals over every CSV, then a bounded top-K heap over the scores
+def rank_streaming(csv_files, limit=35, chunksize=100_000):
+    totals, rows = stream_player_totals(csv_files, chunksize)
+    logging.info(f"Aggregated {rows} rows into {len(totals)} players")
+    totals = calculate_per_game_averages(totals)
+    scores = score_frame(totals, "monthly_csv").to_numpy()
+    # Ties go to the player seen first, as with DataFrame.nlargest
+    top_rows = [-negative_position for _, negative_position in heapq.nlargest(
+        limit, ((score, -position) for position, score in enumerate(scores) if not np.isnan(score))
+    )]
+    top_performances = totals.iloc[top_rows].copy()
+    top_performances['Performance_Score'] = scores[top_rows]
+    top_performances['Games_Played'] = top_performances['G'].astype('int64')
+    return top_performances[['Player', 'Games_Played'] + PER_GAME_STATS + ['Performance_Score']]
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Rank players from CSV exports in the storage directory.")
+    parser.add_argument("--stream", action="store_true",
+                        help="Aggregate every CSV in the directory in chunks instead of reading the first one whole")
+    parser.add_argument("--input-dir", default=input_dir, help="Directory with the CSV exports")
+    parser.add_argument("--top", type=int, default=35, help="Players to rank")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="Rows per chunk in streaming mode")
+    return parser.parse_args()
 
-    # Select relevant columns for the CSV file
-    top_performances = top_performances[['Player', 'Games_Played', 'Formatted_Stats', 'Performance_Score']]
-
-    # Save the top 35 performances to a CSV file
-    output_file = os.path.join(output_dir, 'top_35_performances_reformatted.csv')
-    top_performances.to_csv(output_file, index=False)
-    logging.info(f"Reformatted top 35 performances saved to {output_file}")
-else:
-    logging.error("No CSV file found in the input directory.")
\ No newline at end of file
+# Main execution
+def main():
+    args = parse_args()
+
+    # Configure logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    os.makedirs(output_dir, exist_ok=True)
+
+    if args.stream:
+        csv_files = find_csv_files(args.input_dir)
+        top_performances = rank_streaming(csv_files, args.top, args.chunksize) if csv_files else None
+    else:
+        csv_file = find_csv_file(args.input_dir)
+        top_performances = None
+        if csv_file:
+            logging.info(f"Reading CSV file: {csv_file}")
+            top_performances = rank_table(pd.read_csv(csv_file), args.top)
+
+    if top_performances is not None:
+        # Save the top performances (CSV shows the formatted view; Parquet/Arrow keep the numbers)
+        output_file = os.path.join(output_dir, f'top_{args.top}_performances_reformatted.csv')
+        paths = write_output(top_performances, output_file, view=format_rankings)
+        logging.info(f"Reformatted top {args.top} performances saved to {', '.join(paths)}")
+    else:
+        logging.error("No CSV file found in the input directory.")
+
+if __name__ == "__main__":
+    main()
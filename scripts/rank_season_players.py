@@ -1,65 +1,92 @@
-from nba_api.stats.endpoints import leaguedashplayerstats
+import argparse
 import pandas as pd
 import logging
 import os
-
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+from data_context import DataContext
+from instrumentation import traced
+from league_context import LeagueContext
+from output_writer import write_output
+from response_cache import log_cache_stats
+from scoring import score_frame
 
 # Directory to save CSV files
 output_dir = "output"
-os.makedirs(output_dir, exist_ok=True)
 
 # Fetch season averages for all players
-def fetch_season_averages():
-    logging.info("Fetching season averages for all players")
-    player_stats = leaguedashplayerstats.LeagueDashPlayerStats(season="2024-25").get_data_frames()[0]
+def fetch_season_averages(context, season="2024-25"):
+    logging.info(f"Fetching season averages for all players ({season})")
+    player_stats = context.player_season_totals(season)
     return player_stats
 
-# Calculate performance score per game
-def calculate_performance_score_per_game(row):
-    score = (
-        row['PTS/G'] * 1.0 +
-        row['OREB/G'] * 1.5 +
-        row['DREB/G'] * 1.2 +
-        row['AST/G'] * 1.5 +
-        row['STL/G'] * 3.0 +
-        row['BLK/G'] * 3.0 -
-        row['TOV/G'] * 1.0 +
-        row['PLUS_MINUS/G'] * 0.5
+# Per-game stats shown for each ranked player
+PER_GAME_STATS = ['PTS/G', 'OREB/G', 'DREB/G', 'REB/G', 'AST/G', 'STL/G', 'BLK/G', 'TOV/G', 'PLUS_MINUS/G']
+
+# Stats ranked against the whole league table, as "<stat> Pctl" columns
+PERCENTILE_STATS = ['PTS/G', 'REB/G', 'AST/G', 'Performance_Score/G']
+PERCENTILE_COLUMNS = [f"{stat} Pctl" for stat in PERCENTILE_STATS]
+
+# Top players by per-game performance score, as numbers, with league percentiles
+@traced("transform")
+def season_rankings(player_stats, limit=100):
+    # Calculate per-game stats
+    player_stats['PTS/G'] = player_stats['PTS'] / player_stats['GP']
+    player_stats['OREB/G'] = player_stats['OREB'] / player_stats['GP']
+    player_stats['DREB/G'] = player_stats['DREB'] / player_stats['GP']
+    player_stats['REB/G'] = player_stats['REB'] / player_stats['GP']
+    player_stats['AST/G'] = player_stats['AST'] / player_stats['GP']
+    player_stats['STL/G'] = player_stats['STL'] / player_stats['GP']
+    player_stats['BLK/G'] = player_stats['BLK'] / player_stats['GP']
+    player_stats['TOV/G'] = player_stats['TOV'] / player_stats['GP']
+    player_stats['PLUS_MINUS/G'] = player_stats['PLUS_MINUS'] / player_stats['GP']
+
+    # Calculate performance scores per game
+    player_stats['Performance_Score/G'] = score_frame(player_stats, "season_per_game")
+
+    # League distributions of the table being ranked (a split ranks against its own split)
+    league = LeagueContext.from_frame(player_stats, PERCENTILE_STATS)
+
+    # Rank and select top performances
+    top_performances = league.add_context(player_stats.nlargest(limit, 'Performance_Score/G'), PERCENTILE_STATS)
+    return top_performances[['PLAYER_ID', 'PLAYER_NAME', 'GP'] + PER_GAME_STATS + ['Performance_Score/G'] + PERCENTILE_COLUMNS]
+
+# Presentation view of season_rankings: the per-game stats as one formatted string
+@traced("transform")
+def format_season_rankings(rankings):
+    formatted = rankings.copy()
+    formatted['Formatted_Stats'] = formatted.apply(
+        lambda row: f"{row['PTS/G']:.1f} ppg, {row['OREB/G']:.1f} orpg, {row['DREB/G']:.1f} drpg, {row['REB/G']:.1f} rpg, {row['AST/G']:.1f} apg, {row['STL/G']:.1f} spg, {row['BLK/G']:.1f} bpg, {row['TOV/G']:.1f} tov, {row['PLUS_MINUS/G']:.1f} +/-",
+        axis=1
     )
-    return score
+
+    # Select relevant columns for the CSV file
+    return formatted[['PLAYER_NAME', 'Formatted_Stats', 'Performance_Score/G', 'Performance_Score/G Pctl']]
+
+# Top players by per-game performance score, formatted for output
+def rank_season_players(player_stats, limit=100):
+    return format_season_rankings(season_rankings(player_stats, limit))
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Rank players by per-game performance score over a season.")
+    parser.add_argument("--season", default="2024-25", help="Season to rank, e.g. 2024-25")
+    parser.add_argument("--limit", type=int, default=100, help="Number of players to keep")
+    return parser.parse_args()
 
 # Main execution
-player_stats = fetch_season_averages()
-
-# Calculate per-game stats
-player_stats['PTS/G'] = player_stats['PTS'] / player_stats['GP']
-player_stats['OREB/G'] = player_stats['OREB'] / player_stats['GP']
-player_stats['DREB/G'] = player_stats['DREB'] / player_stats['GP']
-player_stats['REB/G'] = player_stats['REB'] / player_stats['GP']
-player_stats['AST/G'] = player_stats['AST'] / player_stats['GP']
-player_stats['STL/G'] = player_stats['STL'] / player_stats['GP']
-player_stats['BLK/G'] = player_stats['BLK'] / player_stats['GP']
-player_stats['TOV/G'] = player_stats['TOV'] / player_stats['GP']
-player_stats['PLUS_MINUS/G'] = player_stats['PLUS_MINUS'] / player_stats['GP']
-
-# Calculate performance scores per game
-player_stats['Performance_Score/G'] = player_stats.apply(calculate_performance_score_per_game, axis=1)
-
-# Rank and select top 100 performances
-top_performances = player_stats.nlargest(100, 'Performance_Score/G')
-
-# Reformat the stats
-top_performances['Formatted_Stats'] = top_performances.apply(
-    lambda row: f"{row['PTS/G']:.1f} ppg, {row['OREB/G']:.1f} orpg, {row['DREB/G']:.1f} drpg, {row['REB/G']:.1f} rpg, {row['AST/G']:.1f} apg, {row['STL/G']:.1f} spg, {row['BLK/G']:.1f} bpg, {row['TOV/G']:.1f} tov, {row['PLUS_MINUS/G']:.1f} +/-",
-    axis=1
-)
-
-# Select relevant columns for the CSV file
-top_performances = top_performances[['PLAYER_NAME', 'Formatted_Stats', 'Performance_Score/G']]
-
-# Save the top 100 performances to a CSV file
-output_file = os.path.join(output_dir, 'top_100_season_performances.csv')
-top_performances.to_csv(output_file, index=False)
-logging.info(f"Top 100 season performances saved to {output_file}")
\ No newline at end of file
+def main():
+    args = parse_args()
+
+    # Configure logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    os.makedirs(output_dir, exist_ok=True)
+
+    player_stats = fetch_season_averages(DataContext(), args.season)
+    rankings = season_rankings(player_stats, args.limit)
+
+    # Save the top performances (CSV shows the formatted view; Parquet/Arrow keep the numbers)
+    output_file = os.path.join(output_dir, f'top_{args.limit}_season_performances.csv')
+    paths = write_output(rankings, output_file, view=format_season_rankings)
+    logging.info(f"Top {args.limit} season performances saved to {', '.join(paths)}")
+    log_cache_stats()
+
+if __name__ == "__main__":
+    main()
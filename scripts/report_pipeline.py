@@ -0,0 +1,207 @@
+"""
+This module evaluates report sections declared as a dependency graph.
+
+Key Features:
+1. Each node names the inputs it needs (other nodes or run inputs such as `context` or `season`), so a
+   run evaluates only the nodes the requested sections depend on.
+2. Nodes whose dependencies are ready run concurrently on a thread pool, so independent fetches (box
+   scores, season tables, shot locations) overlap.
+3. Every node runs at most once per run. Nodes with a `scope` (e.g. `("season",)`) are also memoized
+   across runs that share a memo dict, so a backfill computes season-wide sections once per season.
+4. Each run records a timing trace (start, duration, thread, memoized) per node.
+5. Content digests: `source` nodes (fetched data) are hashed by value, and every other node's digest is
+   derived from its name and its dependencies' digests. `digests` therefore keys each node by the data it
+   would be computed from, after evaluating only the sources, so callers can cache node outputs and
+   recompute only the nodes whose inputs changed.
+
+Usage:
+- pipeline = Pipeline([Node("game_ids", fetch_ids, ("context", "report_date")), ...])
+- results, trace = pipeline.run(["standout_performances"], inputs={"context": context, ...})
+- print(format_trace(trace)) for one run, print(summarize_trace(traces)) for many
+- sources, _ = pipeline.run(pipeline.sources(targets, inputs), inputs); keys = pipeline.digests(targets, {**inputs, **sources})
+"""
+
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import hashlib
+import threading
+import time
+import numpy as np
+import pandas as pd
+from instrumentation import span
+
+# func is called with one keyword argument per dependency. scope names the run inputs that key the node's
+# result in a shared memo (None: computed once per run only). A source node brings data in (a fetch), so its
+# digest is taken from its value rather than from its dependencies.
+Node = namedtuple("Node", ["name", "func", "deps", "scope", "source"], defaults=((), None, False))
+
+
+class PipelineError(Exception):
+    pass
+
+
+class Pipeline:
+    def __init__(self, nodes):
+        self.nodes = {}
+        for node in nodes:
+            if node.name in self.nodes:
+                raise PipelineError(f"Duplicate node {node.name}")
+            self.nodes[node.name] = node
+
+    # Names of the nodes needed for targets, given the values already provided
+    def required(self, targets, provided):
+        needed, stack = set(), list(targets)
+        while stack:
+            name = stack.pop()
+            if name in needed or name in provided:
+                continue
+            if name not in self.nodes:
+                raise PipelineError(f"Unknown node or missing input: {name}")
+            needed.add(name)
+            stack.extend(self.nodes[name].deps)
+        return needed
+
+    # Source nodes needed for targets: the nodes digests() hashes by value
+    def sources(self, targets, provided):
+        found, seen, stack = [], set(), list(targets)
+        while stack:
+            name = stack.pop()
+            if name in seen or name in provided:
+                continue
+            seen.add(name)
+            if name not in self.nodes:
+                raise PipelineError(f"Unknown node or missing input: {name}")
+            if self.nodes[name].source:
+                found.append(name)
+            else:
+                stack.extend(self.nodes[name].deps)
+        return found
+
+    # Content digest per target, from the values of its sources and run inputs (None: not cacheable,
+    # because a value it depends on is missing or cannot be hashed)
+    def digests(self, targets, values):
+        digests = {}
+
+        def digest(name):
+            if name not in digests:
+                node = self.nodes.get(name)
+                if node is None or node.source:
+                    digests[name] = digest_value(values[name]) if name in values else None
+                else:
+                    parts = [digest(dep) for dep in node.deps]
+                    digests[name] = None if None in parts else _hash(name, *parts)
+            return digests[name]
+
+        return {name: digest(name) for name in targets}
+
+    def _memo_key(self, node, values):
+        return (node.name,) + tuple(values[name] for name in node.scope)
+
+    # Evaluate targets; inputs are run values (and precomputed nodes). Returns ({name: value}, trace).
+    def run(self, targets, inputs=None, memo=None, max_workers=4):
+        values = dict(inputs or {})
+        needed = self.required(targets, values)
+        waiting = {name: {dep for dep in self.nodes[name].deps if dep in needed} for name in needed}
+        dependents = {name: [other for other in needed if name in waiting[other]] for name in needed}
+        trace = []
+        run_start = time.perf_counter()
+        memo_lock = threading.Lock()
+
+        def evaluate(node, kwargs):
+            start = time.perf_counter()
+            key = self._memo_key(node, values) if node.scope is not None and memo is not None else None
+            with memo_lock:
+                memoized = key is not None and key in memo
+                result = memo[key] if memoized else None
+            if not memoized:
+                with span(node.name, "section"):
+                    result = node.func(**kwargs)
+                if key is not None:
+                    with memo_lock:
+                        memo[key] = result
+            return result, {
+                "node": node.name,
+                "start": round(start - run_start, 6),
+                "seconds": round(time.perf_counter() - start, 6),
+                "thread": threading.current_thread().name,
+                "memoized": memoized,
+            }
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="section") as executor:
+            running = {}
+
+            def submit_ready():
+                for name in [name for name, deps in waiting.items() if not deps]:
+                    del waiting[name]
+                    node = self.nodes[name]
+                    running[executor.submit(evaluate, node, {dep: values[dep] for dep in node.deps})] = name
+
+            submit_ready()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        values[name], entry = future.result()
+                    except Exception as e:
+                        for pending in running:
+                            pending.cancel()
+                        raise PipelineError(f"Node {name} failed: {type(e).__name__}: {e}") from e
+                    trace.append(entry)
+                    for dependent in dependents[name]:
+                        waiting[dependent].discard(name)
+                submit_ready()
+
+        return {name: values[name] for name in targets}, trace
+
+
+def _hash(*parts):
+    hasher = hashlib.sha1()
+    for part in parts:
+        hasher.update(part.encode("utf-8") if isinstance(part, str) else part)
+        hasher.update(b"\0")
+    return hasher.hexdigest()
+
+
+# Digest of a value's content: frames and arrays by their data, containers item by item and objects by their
+# digest() method. Anything else (a data context, a rolling-stats book) has no digest.
+def digest_value(value):
+    if isinstance(value, pd.DataFrame):
+        rows = pd.util.hash_pandas_object(value, index=True).to_numpy() if len(value.columns) else np.empty(0)
+        return _hash("frame", repr(list(value.columns)), repr([str(dtype) for dtype in value.dtypes]), rows.tobytes())
+    if isinstance(value, np.ndarray):
+        data = value.tobytes() if value.dtype != object else repr(value.tolist()).encode("utf-8")
+        return _hash("array", str(value.dtype), repr(value.shape), data)
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return _hash(type(value).__name__, repr(value))
+    if isinstance(value, (list, tuple)):
+        parts = [digest_value(item) for item in value]
+        return None if None in parts else _hash("list", *parts)
+    if isinstance(value, dict):
+        parts = [digest_value(item) for pair in sorted(value.items(), key=lambda pair: repr(pair[0])) for item in pair]
+        return None if None in parts else _hash("dict", *parts)
+    if hasattr(value, "digest"):
+        return value.digest()
+    return None
+
+
+# Trace as an aligned table, in start order
+def format_trace(trace):
+    lines = [f"{'node':<24} {'start s':>8} {'seconds':>8} {'memo':>5}  thread"]
+    for entry in sorted(trace, key=lambda entry: entry["start"]):
+        lines.append(f"{entry['node']:<24} {entry['start']:>8.3f} {entry['seconds']:>8.3f} "
+                     f"{'yes' if entry['memoized'] else '':>5}  {entry['thread']}")
+    return "\n".join(lines)
+
+
+# Per-node totals over many runs (e.g. a backfill): runs, memoized runs, total and slowest seconds
+def summarize_trace(trace):
+    totals = {}
+    for entry in trace:
+        runs, memoized, seconds, slowest = totals.get(entry["node"], (0, 0, 0.0, 0.0))
+        totals[entry["node"]] = (runs + 1, memoized + entry["memoized"], seconds + entry["seconds"],
+                                 max(slowest, entry["seconds"]))
+    lines = [f"{'node':<24} {'runs':>5} {'memo':>5} {'total s':>8} {'max s':>8}"]
+    for name, (runs, memoized, seconds, slowest) in sorted(totals.items(), key=lambda item: -item[1][2]):
+        lines.append(f"{name:<24} {runs:>5} {memoized:>5} {seconds:>8.3f} {slowest:>8.3f}")
+    return "\n".join(lines)
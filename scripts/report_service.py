@@ -0,0 +1,273 @@
+"""
+This script runs a long-lived local HTTP service that exposes the project's analyses as JSON endpoints,
+keeping league tables, the player-name index and the nba_api HTTP session warm between requests.
+
+Key Features:
+1. Imports pandas and nba_api once and keeps one shared `DataContext`, so repeated queries reuse the
+   league tables already in memory. The context is replaced every `--refresh-minutes` (default 15) so
+   current-season data does not go stale.
+2. Resolves player names through the shared player index (player_index.py): case- and accent-insensitive,
+   with "did you mean" suggestions on a miss.
+3. Endpoints (GET, JSON responses):
+   - /top-performances?date=YYYY-MM-DD&limit=10
+   - /season-comparison?player1=NAME&player2=NAME
+   - /last-games?player=NAME&games=5           (games=1-30 or "season")
+   - /defensive-impact?limit=25
+   - /shooting-locations?season=2024-25
+   - /metrics                                  (per-endpoint request counts and latency percentiles)
+   - /health
+4. Records per-endpoint latency (count, errors, mean, p50, p95, p99, max).
+
+Usage:
+- python scripts/report_service.py --port 8765
+- curl "http://127.0.0.1:8765/season-comparison?player1=LeBron%20James&player2=Stephen%20Curry"
+- python benchmarks/load_test_service.py to load-test a running service.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from collections import deque
+from datetime import datetime
+import argparse
+import json
+import logging
+import threading
+import time
+import numpy as np
+from data_context import DataContext
+from defensive_impact_analysis import analyze_defensive_impact
+from last_x_games import get_last_x_games_stats
+from player_index import get_player_index
+from season_comparison import compare_players
+from team_shooting_locations import analyze_team_shooting_locations
+from top_performances import get_top_performances
+
+# Season served by the name index and the player analyses
+SEASON = "2024-25"
+
+
+# Bad request parameters; reported to the client as HTTP 400
+class RequestError(Exception):
+    pass
+
+
+# Latency samples and counters per endpoint
+class EndpointMetrics:
+    def __init__(self, max_samples=1000):
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._counts = {}
+        self._errors = {}
+
+    def record(self, endpoint, seconds, error=False):
+        with self._lock:
+            self._samples.setdefault(endpoint, deque(maxlen=self.max_samples)).append(seconds)
+            self._counts[endpoint] = self._counts.get(endpoint, 0) + 1
+            if error:
+                self._errors[endpoint] = self._errors.get(endpoint, 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            samples = {endpoint: np.array(values) * 1000 for endpoint, values in self._samples.items()}
+            counts, errors = dict(self._counts), dict(self._errors)
+        return {
+            endpoint: {
+                "count": counts[endpoint],
+                "errors": errors.get(endpoint, 0),
+                "mean_ms": round(float(values.mean()), 2),
+                "p50_ms": round(float(np.percentile(values, 50)), 2),
+                "p95_ms": round(float(np.percentile(values, 95)), 2),
+                "p99_ms": round(float(np.percentile(values, 99)), 2),
+                "max_ms": round(float(values.max()), 2),
+            }
+            for endpoint, values in samples.items()
+        }
+
+
+# Warm state shared by every request
+class ServiceState:
+    def __init__(self, refresh_minutes=15):
+        self.refresh_seconds = refresh_minutes * 60
+        self.metrics = EndpointMetrics()
+        self._lock = threading.Lock()
+        self._context = None
+        self._loaded_at = 0.0
+
+    # The shared context, replaced once it is older than the refresh interval
+    def context(self):
+        with self._lock:
+            if self._context is None or time.monotonic() - self._loaded_at > self.refresh_seconds:
+                self._context = DataContext()
+                self._loaded_at = time.monotonic()
+            return self._context
+
+    # Shared player-name index (built once per process, saved under cache/)
+    def name_index(self):
+        return get_player_index(self.context())
+
+    # (PLAYER_ID, canonical name) for a requested name
+    def resolve_player(self, name):
+        if not name:
+            raise RequestError("Missing player name")
+        match = self.name_index().resolve(name)
+        if match is None:
+            suggestions = self.name_index().suggest(name)
+            hint = f" Did you mean: {', '.join(suggestions)}?" if suggestions else ""
+            raise RequestError(f"Player {name} not found.{hint}")
+        return match
+
+    # Load the league tables up front so the first request is already warm
+    def warm_up(self):
+        start = time.perf_counter()
+        self.name_index()
+        self.context().player_season_totals(SEASON)
+        logging.info(f"Warmed up in {time.perf_counter() - start:.2f}s: {self.context().summary()}")
+
+
+def frame_rows(df):
+    # float32 columns (see schemas.py) go out as their shortest decimal form, e.g. 0.451 rather than 0.4510000050
+    float32_columns = df.columns[df.dtypes == np.float32]
+    if len(float32_columns):
+        df = df.astype({column: str for column in float32_columns}).astype({column: float for column in float32_columns})
+    return json.loads(df.to_json(orient="records"))
+
+
+# A positive whole-number query parameter, or a RequestError (400) for anything else
+def limit_param(params, default):
+    try:
+        limit = int(params.get("limit", default))
+    except ValueError:
+        raise RequestError("limit must be a positive whole number")
+    if limit < 1:
+        raise RequestError("limit must be a positive whole number")
+    return limit
+
+
+def handle_top_performances(state, params):
+    selected_date = params.get("date") or datetime.now().strftime('%Y-%m-%d')
+    limit = limit_param(params, 10)
+    final = selected_date < datetime.now().strftime('%Y-%m-%d')
+    # Today's games may still be in progress, so they bypass the warm context
+    context = state.context() if final else DataContext()
+    return {"date": selected_date, "rows": frame_rows(get_top_performances(selected_date, context, final, limit))}
+
+
+def handle_season_comparison(state, params):
+    _, player1_name = state.resolve_player(params.get("player1"))
+    _, player2_name = state.resolve_player(params.get("player2"))
+    comparison_df = compare_players(player1_name, player2_name, state.context())
+    if comparison_df is None:
+        raise RequestError("No season data for one of the players")
+    return {"rows": frame_rows(comparison_df)}
+
+
+def handle_last_games(state, params):
+    player_id, player_name = state.resolve_player(params.get("player"))
+    num_games = params.get("games", "5")
+    if num_games != "season":
+        try:
+            num_games = int(num_games)
+        except ValueError:
+            raise RequestError("games must be a number between 1 and 30 or 'season'")
+        if not 1 <= num_games <= 30:
+            raise RequestError("games must be a number between 1 and 30 or 'season'")
+    stats = get_last_x_games_stats(player_id, player_name, num_games, state.context())
+    if stats is None:
+        raise RequestError(f"No game log for {player_name}")
+    return {"stats": {key: value if isinstance(value, str) else float(value) for key, value in stats.items()}}
+
+
+def handle_defensive_impact(state, params):
+    limit = limit_param(params, 25)
+    return {"rows": frame_rows(analyze_defensive_impact(state.context()).head(limit))}
+
+
+def handle_shooting_locations(state, params):
+    season = params.get("season", SEASON)
+    return {"season": season, "rows": frame_rows(analyze_team_shooting_locations(state.context(), season))}
+
+
+def handle_metrics(state, params):
+    return {"endpoints": state.metrics.snapshot(), "context": state.context().summary()}
+
+
+def handle_health(state, params):
+    return {"status": "ok"}
+
+
+ROUTES = {
+    "/top-performances": handle_top_performances,
+    "/season-comparison": handle_season_comparison,
+    "/last-games": handle_last_games,
+    "/defensive-impact": handle_defensive_impact,
+    "/shooting-locations": handle_shooting_locations,
+    "/metrics": handle_metrics,
+    "/health": handle_health,
+}
+
+
+class ReportRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        handler = ROUTES.get(url.path)
+        if handler is None:
+            self.send_json(404, {"error": f"Unknown endpoint {url.path}", "endpoints": sorted(ROUTES)})
+            return
+
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        start = time.perf_counter()
+        error = False
+        try:
+            status, body = 200, handler(self.server.state, params)
+        except RequestError as e:
+            status, body, error = 400, {"error": str(e)}, True
+        except Exception as e:
+            logging.exception(f"Error handling {self.path}")
+            status, body, error = 500, {"error": str(e)}, True
+        elapsed = time.perf_counter() - start
+        if url.path != "/metrics":
+            self.server.state.metrics.record(url.path, elapsed, error=error)
+        body["elapsed_ms"] = round(elapsed * 1000, 2)
+        self.send_json(status, body)
+
+    def send_json(self, status, body):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    # Route the per-request access log through logging at DEBUG level
+    def log_message(self, format, *args):
+        logging.debug(f"{self.address_string()} - {format % args}")
+
+
+def main():
+    # Configure logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Local HTTP service for the NBA analyses.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--refresh-minutes", type=float, default=15, help="How long warm league tables are reused")
+    parser.add_argument("--no-warm-up", action="store_true", help="Skip loading the league tables at startup")
+    args = parser.parse_args()
+
+    state = ServiceState(refresh_minutes=args.refresh_minutes)
+    if not args.no_warm_up:
+        state.warm_up()
+    server = ThreadingHTTPServer((args.host, args.port), ReportRequestHandler)
+    server.state = state
+    logging.info(f"Report service listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logging.info("Shutting down report service")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
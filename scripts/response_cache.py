@@ -0,0 +1,260 @@
+"""
+This module is a persistent on-disk cache for nba_api endpoint responses, shared by every script.
+
+Key Features:
+1. Wraps any nba_api endpoint class: `fetch_endpoint(leaguedashplayerstats.LeagueDashPlayerStats, season="2024-25")`
+   returns a fully loaded endpoint object, from the cache when possible.
+2. Keys entries by endpoint name plus the normalized request parameters the endpoint would send.
+3. Stores the raw JSON responses zlib-compressed in a single SQLite file (`cache/nba_responses.sqlite`).
+4. Applies a TTL by kind of data:
+   - Final box scores, past scoreboards and past seasons never expire.
+   - Current-season dashboards and game logs expire after `NBA_CACHE_TTL_MINUTES` (default 60).
+   - Box scores of games that may still be in progress expire after one minute.
+5. Evicts the least recently used entries once the cache grows past `NBA_CACHE_MAX_MB` (default 256).
+   Hits only note the access time in memory; access times are written in one batch with the next store,
+   every 256 hits, and at exit, so a warm run does not write to the database on every hit. The database
+   runs in WAL mode, so concurrent scripts can read while one writes.
+6. Counts hits, misses, stores and evictions so a warm run can be checked for zero network calls.
+7. Misses go out through the shared transport (transport.py): pooled, rate-limited and retried.
+
+Usage:
+- Set `NBA_CACHE=off` to bypass the cache, or `NBA_CACHE_PATH` to move the SQLite file.
+- python scripts/response_cache.py stats   # Show entry count, size and counters
+- python scripts/response_cache.py clear   # Delete every cached response
+"""
+
+from nba_api.stats.library.http import NBAStatsResponse
+from datetime import datetime
+import argparse
+import atexit
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from instrumentation import span
+from transport import install_transport, log_transport_metrics
+
+# Cache settings
+cache_path = os.environ.get("NBA_CACHE_PATH", os.path.join("cache", "nba_responses.sqlite"))
+cache_enabled = os.environ.get("NBA_CACHE", "on").lower() not in ("off", "0", "false")
+current_season_ttl = float(os.environ.get("NBA_CACHE_TTL_MINUTES", 60)) * 60
+live_game_ttl = 60
+max_cache_bytes = int(float(os.environ.get("NBA_CACHE_MAX_MB", 256)) * 1024 * 1024)
+
+# Hits whose access times are held in memory before they are written
+max_pending_touches = 256
+
+# Parameter names that carry the season across endpoints
+SEASON_PARAMETERS = ("Season", "SeasonNullable", "SeasonYear")
+
+
+# Season string ("2024-25") for the season in progress on the given date
+def current_season(today=None):
+    today = today or datetime.now()
+    start_year = today.year if today.month >= 10 else today.year - 1
+    return f"{start_year}-{str(start_year + 1)[-2:]}"
+
+
+# Seconds until an entry expires, or None if it never does
+def resolve_ttl(parameters, final=False):
+    if "GameID" in parameters:
+        return None if final else live_game_ttl
+    if "GameDate" in parameters:
+        game_date = str(parameters["GameDate"])[:10]
+        return None if game_date < datetime.now().strftime("%Y-%m-%d") else live_game_ttl
+    for name in SEASON_PARAMETERS:
+        season = parameters.get(name)
+        if season and season != current_season():
+            return None
+    return current_season_ttl
+
+
+# Build the cache key for an endpoint name and its request parameters
+def make_cache_key(endpoint_name, parameters):
+    normalized = json.dumps(
+        {key: "" if value is None else str(value) for key, value in parameters.items()}, sort_keys=True
+    )
+    return endpoint_name, normalized, hashlib.sha1(f"{endpoint_name}?{normalized}".encode("utf-8")).hexdigest()
+
+
+# SQLite-backed response store with TTLs, LRU eviction and hit/miss counters
+class ResponseCache:
+    def __init__(self, path=cache_path, max_bytes=max_cache_bytes):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.counters = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "expired": 0}
+        self._lock = threading.Lock()
+        # Access times of hits not written yet, by key
+        self._touched = {}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                parameters TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+        self._conn.commit()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT body, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.counters["misses"] += 1
+                return None
+            body, expires_at = row
+            if expires_at is not None and expires_at < now:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self._touched.pop(key, None)
+                self.counters["expired"] += 1
+                self.counters["misses"] += 1
+                return None
+            self._touched[key] = now
+            if len(self._touched) >= max_pending_touches:
+                self._write_touches()
+                self._conn.commit()
+            self.counters["hits"] += 1
+        return zlib.decompress(body).decode("utf-8")
+
+    def put(self, key, endpoint_name, parameters, response, ttl=None):
+        now = time.time()
+        body = zlib.compress(response.encode("utf-8"))
+        expires_at = None if ttl is None else now + ttl
+        with self._lock:
+            self._touched.pop(key, None)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, endpoint_name, parameters, body, len(body), now, expires_at, now),
+            )
+            self.counters["stores"] += 1
+            self._evict()
+            self._conn.commit()
+
+    # Write the pending access times (the caller holds the lock and commits)
+    def _write_touches(self):
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE responses SET last_access = ? WHERE key = ?",
+                [(last_access, key) for key, last_access in self._touched.items()],
+            )
+            self._touched.clear()
+
+    # Write the pending access times now
+    def flush(self):
+        with self._lock:
+            if self._touched:
+                self._write_touches()
+                self._conn.commit()
+
+    # Drop least recently used entries until the cache fits in max_bytes
+    def _evict(self):
+        self._write_touches()
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_access").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            self.counters["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._touched.clear()
+
+    def stats(self):
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {"entries": entries, "bytes": size, **self.counters}
+
+
+# Process-wide cache instance, opened on first use
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+            atexit.register(_cache.flush)
+        return _cache
+
+
+# Return a loaded endpoint object, served from the cache when a fresh entry exists.
+# Pass final=True for per-game endpoints once the game is over so the entry never expires.
+# Pass refresh=True to always call the API (the response is still cached).
+def fetch_endpoint(endpoint_class, final=False, refresh=False, **kwargs):
+    install_transport()
+    with span(endpoint_class.__name__, "endpoint", **kwargs) as endpoint_span:
+        if not cache_enabled:
+            endpoint_span.set(cache="off")
+            return endpoint_class(**kwargs)
+
+        endpoint = endpoint_class(get_request=False, **kwargs)
+        endpoint_name, parameters, key = make_cache_key(endpoint.endpoint, endpoint.parameters)
+        cache = get_cache()
+
+        # refresh skips the lookup (live polling) but still stores the new response
+        with span("cache.get", "cache"):
+            response = None if refresh else cache.get(key)
+        if response is not None:
+            endpoint_span.set(cache="hit")
+            with span(endpoint_name, "decode"):
+                endpoint.nba_response = NBAStatsResponse(response=response, status_code=200, url=None)
+                endpoint.load_response()
+            return endpoint
+
+        # The request's network time is its own span (transport.py); the rest is decoding
+        endpoint_span.set(cache="miss")
+        endpoint.get_request()
+        with span("cache.put", "cache"):
+            cache.put(key, endpoint_name, parameters, endpoint.nba_response.get_response(),
+                      ttl=resolve_ttl(endpoint.parameters, final=final))
+        return endpoint
+
+
+# Log the cache and transport counters for this run
+def log_cache_stats():
+    if cache_enabled and _cache is not None:
+        logging.info(f"Response cache: {_cache.stats()}")
+    log_transport_metrics()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Inspect or clear the shared response cache.")
+    parser.add_argument("command", nargs="?", choices=["stats", "clear"], default="stats")
+    command = parser.parse_args().command
+    if command == "clear":
+        get_cache().clear()
+        logging.info(f"Cleared response cache at {cache_path}")
+    else:
+        logging.info(f"Response cache at {cache_path}: {get_cache().stats()}")
+
+
+if __name__ == "__main__":
+    main()
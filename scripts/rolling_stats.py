@@ -0,0 +1,272 @@
+"""
+This module keeps incremental rolling-window stats per player, so last-N-games averages can be answered
+without rescanning a player's game history.
+
+Key Features:
+1. `PlayerRollingStats` stores running (prefix) sums of every stat, one row per game played.
+   Appending a game is O(1) per stat, and the sum over any last-N window (or the season) is the
+   difference of two prefix rows, so every window query is O(1) per stat as well.
+2. `RollingStatsBook` holds one `PlayerRollingStats` per player for a season. It can be seeded from the
+   league-wide game log and then refreshed from one night's box scores. Games already applied are skipped,
+   so rerunning a night is harmless, and a game older than a player's last one is inserted in date order.
+3. Windows can be answered as of a date (`as_of`): the games after it are left out by bisecting the game
+   dates, so a past night's form lines are the same whether or not later nights were applied since.
+4. Books are saved per season to `cache/rolling_stats_<season>.pkl`.
+
+Usage:
+- python scripts/rolling_stats.py seed --season 2024-25   # Build the book from the league game log
+- book = load_book("2024-25"); book.update_from_box_scores(box_scores); book.save()
+- book.form_line(player_id)  # Last 5/10/15/30 games and season averages
+"""
+
+import argparse
+import bisect
+import logging
+import os
+import pickle
+import numpy as np
+import pandas as pd
+from instrumentation import traced
+
+# Stats tracked per game, in game log column names
+STATS = ("PTS", "REB", "AST", "STL", "BLK", "MIN", "FGM", "FGA", "FG3M", "FG3A", "FTM", "FTA", "TOV", "PF", "PLUS_MINUS")
+
+# Named windows reported in form lines (None = season)
+WINDOWS = (5, 10, 15, 30)
+
+# Directory holding the saved books
+rolling_stats_dir = os.environ.get("NBA_ROLLING_STATS_DIR", "cache")
+
+
+# Box score minutes come as "MM:SS" strings; game logs already use numbers
+def minutes_to_float(value):
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return np.nan
+    if isinstance(value, str):
+        if ":" in value:
+            minutes, seconds = value.split(":", 1)
+            return float(minutes) + float(seconds) / 60
+        return float(value) if value else np.nan
+    return float(value)
+
+
+class PlayerRollingStats:
+    def __init__(self, player_id, player_name=None):
+        self.player_id = player_id
+        self.player_name = player_name
+        self.games = 0
+        self.game_ids = set()
+        self.last_game_date = None
+        # Date of each game in prefix order (None when the game came without a date)
+        self.game_dates = []
+        # Row i holds the sums over the first i games, so row 0 is all zeros
+        self._prefix = np.zeros((16, len(STATS)))
+
+    # Add one game; values are in STATS order. Returns False if the game was already applied.
+    def append(self, game_id, values, game_date=None):
+        if game_id in self.game_ids:
+            return False
+        if game_date is not None and self.last_game_date is not None and game_date < self.last_game_date:
+            self._insert(game_id, values, game_date)
+            return True
+        if self.games + 1 >= len(self._prefix):
+            grown = np.zeros((len(self._prefix) * 2, len(STATS)))
+            grown[:len(self._prefix)] = self._prefix
+            self._prefix = grown
+        self._prefix[self.games + 1] = self._prefix[self.games] + np.nan_to_num(np.asarray(values, dtype=np.float64))
+        self.games += 1
+        self.game_ids.add(game_id)
+        self.game_dates.append(game_date)
+        if game_date is not None:
+            self.last_game_date = max(game_date, self.last_game_date or game_date)
+        return True
+
+    # A game older than the last applied one (e.g. a backfill after a later night): rebuild the prefix sums
+    # with the game in date order
+    def _insert(self, game_id, values, game_date):
+        position = bisect.bisect_right(self.game_dates, game_date)
+        per_game = np.insert(np.diff(self._prefix[:self.games + 1], axis=0), position,
+                             np.nan_to_num(np.asarray(values, dtype=np.float64)), axis=0)
+        self.games += 1
+        self._prefix = np.zeros((max(16, (self.games + 1) * 2), len(STATS)))
+        self._prefix[1:self.games + 1] = np.cumsum(per_game, axis=0)
+        self.game_ids.add(game_id)
+        self.game_dates.insert(position, game_date)
+
+    # Games played up to and including `as_of` (None = every game); dated games are kept in date order
+    def games_through(self, as_of=None):
+        if as_of is None or self.last_game_date is None:
+            return self.games
+        return bisect.bisect_right(self.game_dates, as_of)
+
+    # Sums over the last `num_games` games (None = season) up to `as_of`
+    def window_sums(self, num_games=None, as_of=None):
+        end = self.games_through(as_of)
+        start = 0 if num_games is None else max(end - num_games, 0)
+        return self._prefix[end] - self._prefix[start]
+
+    # Averages over the last `num_games` games (None = season) up to `as_of`, keyed by stat
+    def window_means(self, num_games=None, as_of=None):
+        end = self.games_through(as_of)
+        played = end if num_games is None else min(num_games, end)
+        if played == 0:
+            return {stat: np.nan for stat in STATS}
+        return dict(zip(STATS, self.window_sums(num_games, as_of) / played))
+
+
+# Running sums for one player from their game log (PlayerGameLog order: newest game first)
+def player_rolling_stats(player_id, player_name, gamelog):
+    rolling = PlayerRollingStats(player_id, player_name)
+    values = gamelog[list(STATS)].to_numpy(dtype=np.float64)
+    game_id_column = "GAME_ID" if "GAME_ID" in gamelog.columns else "Game_ID"
+    for game_id, row in zip(gamelog[game_id_column].iloc[::-1], values[::-1]):
+        rolling.append(game_id, row)
+    return rolling
+
+
+class RollingStatsBook:
+    def __init__(self, season):
+        self.season = season
+        self.players = {}
+
+    def player(self, player_id, player_name=None):
+        stats = self.players.get(player_id)
+        if stats is None:
+            stats = self.players[player_id] = PlayerRollingStats(player_id, player_name)
+        elif player_name:
+            stats.player_name = player_name
+        return stats
+
+    # Apply game-log rows (any order); returns the number of new player-games
+    @traced("transform")
+    def update_from_game_log(self, gamelog):
+        gamelog = gamelog.sort_values("GAME_DATE", kind="stable")
+        values = gamelog[list(STATS)].to_numpy(dtype=np.float64)
+        applied = 0
+        for row, (player_id, player_name, game_id, game_date) in enumerate(
+            zip(gamelog["PLAYER_ID"], gamelog["PLAYER_NAME"], gamelog["GAME_ID"], gamelog["GAME_DATE"])
+        ):
+            applied += self.player(player_id, player_name).append(game_id, values[row], str(game_date)[:10])
+        return applied
+
+    # Date of the newest game in the book, or None for an empty book
+    def last_game_date(self):
+        return max((player.last_game_date for player in self.players.values() if player.last_game_date), default=None)
+
+    # Apply the league-wide game log, only the games after `after` and before `before` if given (the nights
+    # from `before` on are applied from their box scores)
+    def seed(self, gamelog, before=None, after=None):
+        dates = gamelog["GAME_DATE"].astype(str).str[:10]
+        if before is not None:
+            gamelog, dates = gamelog[dates < before], dates[dates < before]
+        if after is not None:
+            gamelog = gamelog[dates > after]
+        applied = self.update_from_game_log(gamelog)
+        limits = f"{f' after {after}' if after else ''}{f' before {before}' if before else ''}"
+        logging.info(f"Rolling stats: seeded {applied} player-games for {self.season}{limits}")
+        return applied
+
+    # Apply one night of BoxScoreTraditionalV2 rows; players who did not play are skipped
+    @traced("transform")
+    def update_from_box_scores(self, box_scores, game_date):
+        played = box_scores[box_scores["MIN"].notna()].copy()
+        played["MIN"] = played["MIN"].map(minutes_to_float)
+        played = played[played["MIN"] > 0].rename(columns={"TO": "TOV"})
+        played["GAME_DATE"] = game_date
+        applied = self.update_from_game_log(played)
+        logging.info(f"Rolling stats: applied {applied} player-games from {game_date}")
+        return applied
+
+    # Last 5/10/15/30 games and season averages for one player, as of a date if given
+    def form_line(self, player_id, stats=("PTS", "REB", "AST"), as_of=None):
+        player = self.players.get(player_id)
+        if player is None or player.games_through(as_of) == 0:
+            return None
+        line = {"PLAYER_NAME": player.player_name, "GP": player.games_through(as_of)}
+        for window in WINDOWS + (None,):
+            means = player.window_means(window, as_of)
+            label = "Season" if window is None else f"L{window}"
+            for stat in stats:
+                line[f"{label} {stat}"] = round(means[stat], 1)
+        return line
+
+    # Form lines for many players as a DataFrame, as of a date if given
+    def form_lines(self, player_ids, stats=("PTS", "REB", "AST"), as_of=None):
+        lines = [self.form_line(player_id, stats, as_of) for player_id in player_ids]
+        return pd.DataFrame([line for line in lines if line is not None])
+
+    # Saved as plain dicts and arrays so the file does not depend on how this module was imported
+    @traced("write")
+    def save(self, path=None):
+        path = path or book_path(self.season)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        state = {
+            "season": self.season,
+            "stats": STATS,
+            "players": {
+                player_id: {
+                    "player_name": player.player_name,
+                    "game_ids": player.game_ids,
+                    "last_game_date": player.last_game_date,
+                    "game_dates": player.game_dates,
+                    "prefix": player._prefix[:player.games + 1],
+                }
+                for player_id, player in self.players.items()
+            },
+        }
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as book_file:
+            pickle.dump(state, book_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+
+
+def book_path(season):
+    return os.path.join(rolling_stats_dir, f"rolling_stats_{season}.pkl")
+
+
+# Load the saved book for a season, or start an empty one
+def load_book(season):
+    path = book_path(season)
+    book = RollingStatsBook(season)
+    if not os.path.exists(path):
+        return book
+    with open(path, "rb") as book_file:
+        state = pickle.load(book_file)
+    if tuple(state["stats"]) != STATS:
+        logging.warning(f"Rolling stats book {path} tracks different stats; starting a new one")
+        return book
+    if any("game_dates" not in saved for saved in state["players"].values()):
+        logging.warning(f"Rolling stats book {path} has no game dates; starting a new one")
+        return book
+    for player_id, saved in state["players"].items():
+        player = book.player(player_id, saved["player_name"])
+        player.game_ids = set(saved["game_ids"])
+        player.last_game_date = saved["last_game_date"]
+        player.game_dates = list(saved["game_dates"])
+        player.games = len(saved["prefix"]) - 1
+        player._prefix = np.zeros((max(16, len(saved["prefix"]) * 2), len(STATS)))
+        player._prefix[:len(saved["prefix"])] = saved["prefix"]
+    return book
+
+
+def main():
+    from data_context import DataContext
+
+    # Configure logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Incremental rolling-window player stats.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    seed = subparsers.add_parser("seed", help="Build the season book from the league-wide game log")
+    seed.add_argument("--season", default="2024-25")
+    args = parser.parse_args()
+
+    context = DataContext()
+    book = load_book(args.season)
+    applied = book.seed(context.league_player_game_log(args.season))
+    book.save()
+    logging.info(f"Seeded {applied} player-games for {len(book.players)} players into {book_path(args.season)}")
+
+
+if __name__ == "__main__":
+    main()
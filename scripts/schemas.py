@@ -0,0 +1,148 @@
+"""
+This module holds the compact column types of the endpoint tables the scripts use, and applies them once
+when a table is loaded.
+
+Key Features:
+1. One schema per endpoint (`LeagueDashPlayerStats`, `BoxScoreTraditionalV2`, `PlayerGameLog`,
+   `LeagueGameLog`, ...), built from the column headers of every result set nba_api expects from it.
+2. Column kinds:
+   - `id` (player and team IDs): int32.
+   - `count` (GP, PTS, REB, ranks, ...): the smallest integer type from int16 up that holds the values;
+     float32 when a value is missing or fractional (e.g. DNP rows in a box score).
+   - `float` (percentages, minutes, age, fantasy points): float32.
+   - `name` (player and team names, abbreviations, matchups): categorical.
+   - `key` (game IDs, game dates, seasons): categorical, so they keep their string values.
+   Text that is not a number stays text, and columns outside the schema are left as they are.
+3. `DataContext` applies the schema to every frame it fetches or reads from the warehouse, so consumers
+   no longer convert columns themselves.
+4. `memory_report(df, typed, endpoint_name)` summarizes the saving per column kind.
+
+Usage:
+- typed = apply_schema(df, "LeagueGameLog")
+- python benchmarks/benchmark_schemas.py for the memory report on a multi-season game log.
+"""
+
+from functools import lru_cache
+import importlib
+import numpy as np
+import pandas as pd
+from instrumentation import traced
+
+ID_COLUMNS = {"PLAYER_ID", "Player_ID", "PERSON_ID", "TEAM_ID", "HOME_TEAM_ID", "VISITOR_TEAM_ID", "CLOSE_DEF_PERSON_ID"}
+
+COUNT_COLUMNS = {
+    "GP", "G", "W", "L", "FGM", "FGA", "FG3M", "FG3A", "FTM", "FTA", "OREB", "DREB", "REB", "AST", "TOV", "TO",
+    "STL", "BLK", "BLKA", "PF", "PFD", "PTS", "PLUS_MINUS", "DD2", "TD3", "WNBA_FANTASY_PTS_RANK", "D_FGM", "D_FGA",
+}
+
+FLOAT_COLUMNS = {"MIN", "AGE", "NBA_FANTASY_PTS", "WNBA_FANTASY_PTS", "FREQ"}
+
+NAME_COLUMNS = {
+    "PLAYER_NAME", "PLAYER_NAME_LAST_FIRST", "NICKNAME", "TEAM_NAME", "TEAM_ABBREVIATION", "TEAM_CITY",
+    "TEAM_NICKNAME", "MATCHUP", "WL", "START_POSITION", "PLAYER_POSITION",
+}
+
+# Repeated string keys; the warehouse adds SEASON and GAME_DATE partition columns to every table
+KEY_COLUMNS = {"GAME_ID", "Game_ID", "GAME_DATE", "SEASON_ID", "SEASON"}
+
+# Endpoint name -> nba_api module, for endpoints whose tables are typed
+SCHEMA_ENDPOINTS = {
+    "LeagueDashPlayerStats": "leaguedashplayerstats",
+    "LeagueDashTeamStats": "leaguedashteamstats",
+    "LeagueDashPtDefend": "leaguedashptdefend",
+    "LeagueGameLog": "leaguegamelog",
+    "PlayerGameLog": "playergamelog",
+    "BoxScoreTraditionalV2": "boxscoretraditionalv2",
+}
+
+# Columns an endpoint returns beyond nba_api's expected headers (LeagueGameLog in player mode)
+EXTRA_COLUMNS = {"LeagueGameLog": ["PLAYER_ID", "PLAYER_NAME"]}
+
+
+def column_kind(column):
+    if column in ID_COLUMNS:
+        return "id"
+    if column in NAME_COLUMNS:
+        return "name"
+    if column in KEY_COLUMNS:
+        return "key"
+    if column in COUNT_COLUMNS or column.endswith("_RANK"):
+        return "count"
+    if column in FLOAT_COLUMNS or "PCT" in column or column.endswith("_PLUSMINUS"):
+        return "float"
+    return None
+
+
+# {column: kind} for every result set of an endpoint; empty for endpoints without a schema
+@lru_cache(maxsize=None)
+def endpoint_schema(endpoint_name):
+    module_name = SCHEMA_ENDPOINTS.get(endpoint_name)
+    if module_name is None:
+        return {}
+    module = importlib.import_module(f"nba_api.stats.endpoints.{module_name}")
+    schema = {"SEASON": "key", "GAME_DATE": "key"}
+    headers = [column for columns in getattr(module, endpoint_name).expected_data.values() for column in columns]
+    for column in headers + EXTRA_COLUMNS.get(endpoint_name, []):
+        kind = column_kind(column)
+        if kind:
+            schema[column] = kind
+    return schema
+
+
+def smallest_integer(values):
+    low, high = (values.min(), values.max()) if len(values) else (0, 0)
+    for dtype in (np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return dtype
+    return np.int64
+
+
+def convert_column(series, kind):
+    if kind in ("name", "key"):
+        return series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype("category")
+    if series.dtype == object:
+        # Only columns that hold numbers are converted; text such as a box score's "32:10" minutes stays text
+        numbers = pd.to_numeric(series, errors="coerce")
+        if numbers.notna().sum() != series.notna().sum():
+            return series
+        series = numbers
+    if not pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+        return series
+    if kind == "float":
+        return series.astype(np.float32)
+    values = series.to_numpy()
+    if values.dtype.kind == "f" and (np.isnan(values).any() or not np.array_equal(values, np.round(values))):
+        # IDs keep their precision; counts with gaps or fractions become float32
+        return series if kind == "id" else series.astype(np.float32)
+    dtype = smallest_integer(values)
+    if kind == "id":
+        return series.astype(np.int32) if dtype != np.int64 else series
+    return series.astype(dtype)
+
+
+# A copy of df with the endpoint's column types; frames of endpoints without a schema are returned as-is
+@traced("transform")
+def apply_schema(df, endpoint_name):
+    schema = endpoint_schema(endpoint_name)
+    if not schema or df.empty or df.columns.nlevels > 1:
+        return df
+    columns = [column for column in df.columns if column in schema]
+    if not columns:
+        return df
+    typed = df.copy(deep=False)
+    for column in columns:
+        typed[column] = convert_column(df[column], schema[column])
+    return typed
+
+
+# Memory (MB) of a frame before and after typing, grouped by column kind
+def memory_report(df, typed, endpoint_name):
+    schema = endpoint_schema(endpoint_name)
+    before = df.memory_usage(index=False, deep=True)
+    after = typed.memory_usage(index=False, deep=True)
+    kinds = pd.Series({column: schema.get(column, "other") for column in df.columns})
+    report = pd.DataFrame({"before_mb": before.groupby(kinds).sum() / 1e6, "after_mb": after.groupby(kinds).sum() / 1e6})
+    report.loc["total"] = report.sum()
+    report["saved"] = 1 - report["after_mb"] / report["before_mb"]
+    return report.round({"before_mb": 1, "after_mb": 1, "saved": 3})
@@ -0,0 +1,99 @@
+"""
+This module computes player performance scores as a single NumPy matrix-vector product over the stat
+columns, replacing the row-by-row `DataFrame.apply` scoring in the ranking scripts.
+
+Key Features:
+1. Holds the named weight profiles used across the project:
+   - `game_score`: single-game box score lines (top_performances.py).
+   - `season_per_game`: per-game season averages from LeagueDashPlayerStats (rank_season_players.py).
+   - `monthly_csv`: per-game averages from the monthly CSV export (rank_players.py).
+2. `score_frame` scores a DataFrame with one profile.
+3. `score_profiles` scores a DataFrame with several profiles in one pass, using one matrix-matrix product
+   over the union of the stat columns.
+
+Usage:
+- df['Performance_Score'] = score_frame(df, "game_score")
+- scores = score_profiles(df, ["season_per_game", "monthly_csv"])  # One column per profile
+"""
+
+import numpy as np
+import pandas as pd
+from instrumentation import traced
+
+# Stat column -> weight, per profile. Negative weights penalize the stat.
+WEIGHT_PROFILES = {
+    "game_score": {
+        "PTS": 1.0,
+        "REB": 1.2,
+        "AST": 1.5,
+        "STL": 3.0,
+        "BLK": 3.0,
+    },
+    "season_per_game": {
+        "PTS/G": 1.0,
+        "OREB/G": 1.5,
+        "DREB/G": 1.2,
+        "AST/G": 1.5,
+        "STL/G": 3.0,
+        "BLK/G": 3.0,
+        "TOV/G": -1.0,
+        "PLUS_MINUS/G": 0.5,
+    },
+    "monthly_csv": {
+        "PTS/G": 1.0,
+        "ORB/G": 1.5,
+        "DRB/G": 1.2,
+        "AST/G": 1.5,
+        "STL/G": 3.0,
+        "BLK/G": 3.0,
+        "TOV/G": -1.0,
+        "+/-/G": 0.5,
+    },
+}
+
+
+# Look up a profile by name, or accept a {column: weight} dict directly
+def get_profile(profile):
+    if isinstance(profile, dict):
+        return profile
+    if profile not in WEIGHT_PROFILES:
+        raise KeyError(f"Unknown weight profile '{profile}'. Available profiles: {', '.join(WEIGHT_PROFILES)}")
+    return WEIGHT_PROFILES[profile]
+
+
+# Stat columns as a float64 matrix (rows = players, columns = stats)
+def stat_matrix(df, columns):
+    missing = [column for column in columns if column not in df.columns]
+    if missing:
+        raise KeyError(f"Missing stat columns for scoring: {', '.join(missing)}")
+    return df[columns].to_numpy(dtype=np.float64)
+
+
+# Score every row of df with one profile
+@traced("transform")
+def score_frame(df, profile):
+    weights = get_profile(profile)
+    columns = list(weights)
+    scores = stat_matrix(df, columns) @ np.array([weights[column] for column in columns], dtype=np.float64)
+    return pd.Series(scores, index=df.index)
+
+
+# Score every row of df with several profiles in one pass; returns one column per profile
+def score_profiles(df, profiles):
+    profiles = list(profiles)
+    resolved = [get_profile(profile) for profile in profiles]
+    columns = list(dict.fromkeys(column for weights in resolved for column in weights))
+    weight_matrix = np.zeros((len(columns), len(resolved)), dtype=np.float64)
+    for j, weights in enumerate(resolved):
+        for column, weight in weights.items():
+            weight_matrix[columns.index(column), j] = weight
+    stats = stat_matrix(df, columns)
+    missing = np.isnan(stats)
+    if missing.any():
+        # NaN * 0 is still NaN, so only let a NaN reach the profiles that actually use that stat
+        scores = np.where(missing, 0.0, stats) @ weight_matrix
+        scores[(missing @ (weight_matrix != 0)) > 0] = np.nan
+    else:
+        scores = stats @ weight_matrix
+    names = [profile if isinstance(profile, str) else f"profile_{j}" for j, profile in enumerate(profiles)]
+    return pd.DataFrame(scores, index=df.index, columns=names)
@@ -1,46 +1,26 @@
 # This script compares the season averages of two NBA players side by side.
-# The user is prompted to enter the names of two players for comparison.
+# Pass the names of the two players to compare:
+#   python scripts/season_comparison.py "LeBron James" "Stephen Curry"
 # The script then fetches the players' season statistics, calculates per-game averages, and saves the comparison to a CSV file.
 
-from nba_api.stats.endpoints import leaguedashplayerstats
+import argparse
 import pandas as pd
 import logging
 import os
-from difflib import get_close_matches
-
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+from data_context import DataContext
+from output_writer import write_output
+from player_index import resolve_player
+from response_cache import log_cache_stats
 
 # Directory to save CSV files
 output_dir = "output"
-os.makedirs(output_dir, exist_ok=True)
-
-# Prompt for player selection
-player1_name = input("Enter the name of the first player for comparison: ")
-player2_name = input("Enter the name of the second player for comparison: ")
 
-# Fetch player ID for the selected player
-def get_player_id(player_name):
-    player_stats = leaguedashplayerstats.LeagueDashPlayerStats(season="2024-25").get_data_frames()[0]
-    player = player_stats[player_stats['PLAYER_NAME'] == player_name]
-    if not player.empty:
-        return player.iloc[0]['PLAYER_ID']
-    else:
-        # Provide suggestions for similar player names
-        all_player_names = player_stats['PLAYER_NAME'].tolist()
-        suggestions = get_close_matches(player_name, all_player_names, n=5, cutoff=0.6)
-        if suggestions:
-            logging.error(f"Player {player_name} not found. Did you mean: {', '.join(suggestions)}?")
-        else:
-            logging.error(f"Player {player_name} not found and no similar names were found.")
-        return None
-
-# Fetch season averages for the player
-def get_season_averages(player_name):
+# Fetch season averages for the player, looked up by player ID
+def get_season_averages(player_id, player_name, context):
     try:
         logging.info(f"Fetching season averages for {player_name}")
-        player_stats = leaguedashplayerstats.LeagueDashPlayerStats(season="2024-25").get_data_frames()[0]
-        player_stats = player_stats[player_stats['PLAYER_NAME'] == player_name]
+        player_stats = context.player_season_totals("2024-25")
+        player_stats = player_stats[player_stats['PLAYER_ID'] == int(player_id)]
         if not player_stats.empty:
             games_played = player_stats['GP'].values[0]
             avg_points = player_stats['PTS'].sum() / games_played
@@ -82,31 +62,61 @@ def get_season_averages(player_name):
         logging.error(f"Error fetching season averages for {player_name}: {e}")
         return None
 
+# Side-by-side season averages for two players, or None if either player is missing
+def compare_players(player1_name, player2_name, context):
+    player1_id, player1_canonical = resolve_player(player1_name, context)
+    player2_id, player2_canonical = resolve_player(player2_name, context)
+
+    if player1_id and player2_id:
+        # Label the columns with the resolved names
+        player1_name, player2_name = player1_canonical, player2_canonical
+        player1_stats = get_season_averages(player1_id, player1_name, context)
+        player2_stats = get_season_averages(player2_id, player2_name, context)
+
+        if player1_stats and player2_stats:
+            logging.info(f"Season averages for {player1_name}: {player1_stats}")
+            logging.info(f"Season averages for {player2_name}: {player2_stats}")
+            # Combine the stats for comparison
+            comparison_stats = {
+                "Stat": list(player1_stats.keys())[1:],  # Skip the "Player" key
+                player1_name: list(player1_stats.values())[1:],  # Skip the "Player" value
+                player2_name: list(player2_stats.values())[1:]  # Skip the "Player" value
+            }
+            # Create a DataFrame for the comparison
+            return pd.DataFrame(comparison_stats)
+    else:
+        if not player1_id:
+            logging.error(f"Player {player1_name} not found.")
+        if not player2_id:
+            logging.error(f"Player {player2_name} not found.")
+    return None
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare the season averages of two players side by side.")
+    parser.add_argument("player1", help="Name of the first player")
+    parser.add_argument("player2", help="Name of the second player")
+    return parser.parse_args()
+
 # Main execution
-player1_id = get_player_id(player1_name)
-player2_id = get_player_id(player2_name)
+def main():
+    args = parse_args()
 
-if player1_id and player2_id:
-    player1_stats = get_season_averages(player1_name)
-    player2_stats = get_season_averages(player2_name)
+    # Configure logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    os.makedirs(output_dir, exist_ok=True)
+    player1_name, player2_name = args.player1, args.player2
 
-    if player1_stats and player2_stats:
-        logging.info(f"Season averages for {player1_name}: {player1_stats}")
-        logging.info(f"Season averages for {player2_name}: {player2_stats}")
-        # Combine the stats for comparison
-        comparison_stats = {
-            "Stat": list(player1_stats.keys())[1:],  # Skip the "Player" key
-            player1_name: list(player1_stats.values())[1:],  # Skip the "Player" value
-            player2_name: list(player2_stats.values())[1:]  # Skip the "Player" value
-        }
-        # Create a DataFrame for the comparison
-        comparison_df = pd.DataFrame(comparison_stats)
+    # One league table fetch shared by every lookup in this run
+    context = DataContext()
+    comparison_df = compare_players(player1_name, player2_name, context)
+    if comparison_df is not None:
         # Save the comparison to CSV
         output_file = os.path.join(output_dir, f'{player1_name}_vs_{player2_name}_season_comparison.csv')
-        comparison_df.to_csv(output_file, index=False)
-        logging.info(f"Season comparison saved to {output_file}")
-else:
-    if not player1_id:
-        logging.error(f"Player {player1_name} not found.")
-    if not player2_id:
-        logging.error(f"Player {player2_name} not found.")
\ No newline at end of file
+        paths = write_output(comparison_df, output_file)
+        logging.info(f"Season comparison saved to {', '.join(paths)}")
+
+    logging.info(f"Data context: {context.summary()}")
+    log_cache_stats()
+
+if __name__ == "__main__":
+    main()
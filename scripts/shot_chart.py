@@ -0,0 +1,463 @@
+"""
+This module ingests shot-level data from the ShotChartDetail endpoint and answers FG% questions for any
+court zone, player, team or date range, instead of reading the pre-aggregated zone percentages of
+LeagueDashTeamShotLocations.
+
+Key Features:
+1. Fetches every team's shot attempts for a season (one ShotChartDetail request per team) concurrently,
+   through the response cache (or a `DataContext`). Each response is parsed as soon as it arrives, so
+   only the compact arrays are kept.
+2. Stores the shots in an array-backed `ShotTable`: court coordinates (LOC_X/LOC_Y, tenths of a foot from
+   the hoop), made and 3-point flags, player, team, game, date, period and clock, about 25 bytes per shot.
+3. `ShotIndex` assigns every shot to a cell of the court grid once. A zone is any vectorized function of
+   court coordinates; it is evaluated once per grid cell, and each cell keeps a bit set of the zones it is
+   in, reused by every query. A query is a filter mask, one lookup of the filtered shots' zone bits and a
+   count per zone. With the default one-unit grid every shot coordinate is its own cell, so zone
+   boundaries are exact.
+4. Filters (players, teams, games, dates, periods) are vectorized masks, and grouped queries (per player
+   or team) come from the same bincounts over group codes.
+5. A season's table is saved to `cache/shots_<season>.pkl` and reused: past seasons for good, the current
+   one for `NBA_SHOT_CHART_MAX_AGE_HOURS` (default 6).
+
+Usage:
+- python scripts/shot_chart.py --season 2024-25 --by team
+- python scripts/shot_chart.py --season 2024-25 --player "Stephen Curry" --start 2025-01-01 --zones distance
+- shots = load_season_shots("2024-25"); index = ShotIndex(shots)
+- index.zone_totals(STANDARD_ZONES, shots.mask(teams=[1610612744], start="2025-01-01"))
+"""
+
+from collections import namedtuple
+import argparse
+import logging
+import os
+import pickle
+import threading
+import time
+
+from nba_api.stats.endpoints import shotchartdetail
+from nba_api.stats.static import teams as static_teams
+import numpy as np
+import pandas as pd
+
+from concurrent_fetch import MAX_IN_FLIGHT_REQUESTS, fetch_concurrently
+from data_context import DataContext
+from instrumentation import span, traced
+from output_writer import write_output
+from player_index import resolve_player
+from response_cache import current_season, fetch_endpoint, log_cache_stats
+
+# Where season tables are saved, and how long the current season's table is reused
+shot_chart_dir = os.environ.get("NBA_SHOT_CHART_DIR", "cache")
+shot_chart_max_age_hours = float(os.environ.get("NBA_SHOT_CHART_MAX_AGE_HOURS", 6))
+
+# Bump when the saved format changes
+SHOTS_VERSION = 1
+
+SHOT_DTYPES = {
+    "game": np.int32,          # Index into ShotTable.game_ids
+    "date": np.int32,          # YYYYMMDD
+    "team": np.int32,
+    "player": np.int32,
+    "period": np.int8,
+    "seconds_left": np.int16,  # Game clock, seconds left in the period
+    "x": np.int16,             # LOC_X: tenths of a foot, left (-) or right (+) of the hoop
+    "y": np.int16,             # LOC_Y: tenths of a foot from the hoop towards half court
+    "made": np.bool_,
+    "three": np.bool_,
+}
+
+# Court coordinates covered by the grid; shots outside it (heaves from the backcourt) go to its edge cells
+COURT_X = (-250, 250)
+COURT_Y = (-52, 887)
+
+# Court geometry, in tenths of a foot from the hoop
+RESTRICTED_AREA_RADIUS = 40
+PAINT_HALF_WIDTH = 80
+PAINT_TOP = 142.5
+THREE_POINT_RADIUS = 237.5
+CORNER_THREE_X = 220
+CORNER_THREE_TOP = 92.5
+HALF_COURT = 417.5
+
+
+# contains(x, y) takes coordinate arrays and returns a boolean array
+Zone = namedtuple("Zone", ["name", "contains"])
+
+
+def is_restricted_area(x, y):
+    return np.hypot(x, y) <= RESTRICTED_AREA_RADIUS
+
+
+def is_paint(x, y):
+    return (np.abs(x) < PAINT_HALF_WIDTH) & (y < PAINT_TOP)
+
+
+def is_corner_three(x, y):
+    return (np.abs(x) >= CORNER_THREE_X) & (y <= CORNER_THREE_TOP)
+
+
+def is_three(x, y):
+    return is_corner_three(x, y) | ((np.hypot(x, y) >= THREE_POINT_RADIUS) & (y > CORNER_THREE_TOP))
+
+
+# The zones of LeagueDashTeamShotLocations, from the coordinates
+STANDARD_ZONES = [
+    Zone("Restricted Area", is_restricted_area),
+    Zone("In The Paint (Non-RA)", lambda x, y: is_paint(x, y) & ~is_restricted_area(x, y)),
+    Zone("Mid-Range", lambda x, y: ~is_paint(x, y) & ~is_three(x, y)),
+    Zone("Corner 3", is_corner_three),
+    Zone("Above the Break 3", lambda x, y: is_three(x, y) & ~is_corner_three(x, y) & (y < HALF_COURT)),
+    Zone("Backcourt", lambda x, y: y >= HALF_COURT),
+]
+
+
+# Shots at least low_ft and less than high_ft (if given) feet from the hoop
+def distance_zone(low_ft, high_ft=None):
+    def contains(x, y):
+        distance = np.hypot(x, y)
+        inside = distance >= low_ft * 10
+        return inside if high_ft is None else inside & (distance < high_ft * 10)
+    return Zone(f"{low_ft}-{high_ft} ft" if high_ft is not None else f"{low_ft}+ ft", contains)
+
+
+# Distance bands from the hoop, e.g. distance_zones([0, 3, 10, 16, 24]) -> "0-3 ft", ..., "24+ ft"
+def distance_zones(edges_ft):
+    return [distance_zone(low, high) for low, high in zip(edges_ft, list(edges_ft[1:]) + [None])]
+
+
+ZONE_SETS = {
+    "standard": STANDARD_ZONES,
+    "distance": distance_zones([0, 3, 10, 16, 24]),
+}
+
+
+# YYYYMMDD integer of a date string ("2025-01-15" or "20250115")
+def date_key(date):
+    return int(str(date).replace("-", "")[:8])
+
+
+# Parse one ShotChartDetail frame into shot arrays; "game" holds indexes into the returned game IDs
+def parse_shots(frame):
+    game_codes, game_ids = pd.factorize(frame["GAME_ID"].astype(str))
+    columns = {
+        "game": game_codes.astype(np.int32),
+        "date": pd.to_numeric(frame["GAME_DATE"], errors="coerce").fillna(0).to_numpy(np.int32),
+        "team": frame["TEAM_ID"].to_numpy(np.int32),
+        "player": frame["PLAYER_ID"].to_numpy(np.int32),
+        "period": frame["PERIOD"].to_numpy(np.int8),
+        "seconds_left": (frame["MINUTES_REMAINING"] * 60 + frame["SECONDS_REMAINING"]).to_numpy(np.int16),
+        "x": frame["LOC_X"].to_numpy(np.int16),
+        "y": frame["LOC_Y"].to_numpy(np.int16),
+        "made": frame["SHOT_MADE_FLAG"].to_numpy() == 1,
+        "three": frame["SHOT_TYPE"].astype(str).str.startswith("3").to_numpy(),
+    }
+    names = {
+        "players": dict(zip(frame["PLAYER_ID"].tolist(), frame["PLAYER_NAME"].tolist())),
+        "teams": dict(zip(frame["TEAM_ID"].tolist(), frame["TEAM_NAME"].tolist())),
+    }
+    return columns, list(game_ids), names
+
+
+class ShotTable:
+    def __init__(self, columns, game_ids, names):
+        self.columns = columns
+        self.game_ids = list(game_ids)
+        self.names = names
+
+    @classmethod
+    def empty(cls):
+        return cls({name: np.empty(0, dtype=dtype) for name, dtype in SHOT_DTYPES.items()}, [],
+                   {"players": {}, "teams": {}})
+
+    # One table from parsed parts (columns, game IDs, names); game indexes are remapped to the shared list
+    @classmethod
+    @traced("transform")
+    def concat(cls, parts):
+        if not parts:
+            return cls.empty()
+        game_index, games = {}, []
+        names = {"players": {}, "teams": {}}
+        for columns, game_ids, part_names in parts:
+            mapping = np.array([game_index.setdefault(game_id, len(game_index)) for game_id in game_ids], dtype=np.int32)
+            games.append(mapping[columns["game"]] if len(mapping) else columns["game"])
+            for kind in names:
+                names[kind].update(part_names[kind])
+        merged = {name: np.concatenate([part[0][name] for part in parts]).astype(dtype, copy=False)
+                  for name, dtype in SHOT_DTYPES.items() if name != "game"}
+        merged["game"] = np.concatenate(games).astype(np.int32, copy=False)
+        return cls({name: merged[name] for name in SHOT_DTYPES}, list(game_index), names)
+
+    def __len__(self):
+        return len(self.columns["x"])
+
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for array in self.columns.values())
+
+    # Shots matching every given filter; dates are inclusive ("YYYY-MM-DD")
+    def mask(self, players=None, teams=None, games=None, start=None, end=None, periods=None):
+        columns = self.columns
+        mask = np.ones(len(self), dtype=bool)
+        if players is not None:
+            mask &= np.isin(columns["player"], np.asarray(list(players), dtype=np.int32))
+        if teams is not None:
+            mask &= np.isin(columns["team"], np.asarray(list(teams), dtype=np.int32))
+        if games is not None:
+            wanted = {game_id: index for index, game_id in enumerate(self.game_ids)}
+            mask &= np.isin(columns["game"], [wanted[game_id] for game_id in games if game_id in wanted])
+        if start is not None:
+            mask &= columns["date"] >= date_key(start)
+        if end is not None:
+            mask &= columns["date"] <= date_key(end)
+        if periods is not None:
+            mask &= np.isin(columns["period"], list(periods))
+        return mask
+
+    def to_frame(self):
+        df = pd.DataFrame(self.columns)
+        df.insert(0, "GAME_ID", np.asarray(self.game_ids, dtype=object)[df["game"]] if len(df) else [])
+        return df
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        state = {"version": SHOTS_VERSION, "built_at": time.time(), "columns": self.columns,
+                 "game_ids": self.game_ids, "names": self.names}
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as shots_file:
+            pickle.dump(state, shots_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+
+
+class ShotIndex:
+    def __init__(self, shots, cell=1):
+        self.shots = shots
+        self.cell = cell
+        self.width = (COURT_X[1] - COURT_X[0]) // cell + 1
+        self.height = (COURT_Y[1] - COURT_Y[0]) // cell + 1
+        with span("ShotIndex.build", "transform"):
+            column = (np.clip(shots.columns["x"], *COURT_X) - COURT_X[0]) // cell
+            row = (np.clip(shots.columns["y"], *COURT_Y) - COURT_Y[0]) // cell
+            self.cells = (row.astype(np.int32) * self.width + column).astype(np.int32)
+        self._memberships = {}
+        self._groups = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self.width * self.height
+
+    # Court coordinates of each cell's centre
+    def cell_centres(self):
+        offset = (self.cell - 1) / 2
+        x = COURT_X[0] + np.arange(self.width) * self.cell + offset
+        y = COURT_Y[0] + np.arange(self.height) * self.cell + offset
+        return np.tile(x, self.height), np.repeat(y, self.width)
+
+    # Per cell, the bit set of the zones it is in (bit i: zones[i]); computed once per zone set
+    def membership(self, zones):
+        if len(zones) > 64:
+            raise ValueError(f"At most 64 zones per query, got {len(zones)}")
+        key = tuple(zones)
+        with self._lock:
+            bits = self._memberships.get(key)
+            if bits is None:
+                with span("ShotIndex.membership", "transform"):
+                    x, y = self.cell_centres()
+                    dtype = next(dtype for dtype in (np.uint8, np.uint16, np.uint32, np.uint64)
+                                 if np.iinfo(dtype).bits >= len(zones))
+                    bits = np.zeros(len(self), dtype=dtype)
+                    for position, zone in enumerate(zones):
+                        bits[np.asarray(zone.contains(x, y), dtype=bool)] |= dtype(1 << position)
+                self._memberships[key] = bits
+        return bits
+
+    # (sorted IDs, code per shot) of the shots' players or teams
+    def groups(self, by):
+        with self._lock:
+            if by not in self._groups:
+                self._groups[by] = np.unique(self.shots.columns[by], return_inverse=True)
+            return self._groups[by]
+
+    # Attempts and makes per (group, zone) of the selected shots; groups are codes from 0 to size - 1
+    def _zone_counts(self, zones, mask, groups=None, size=1):
+        zone_bits = self.membership(zones)
+        selected = np.flatnonzero(mask) if mask is not None else slice(None)
+        cells = self.cells[selected]
+        made = self.shots.columns["made"][selected]
+        bits = zone_bits[cells]
+        codes = groups[selected] if groups is not None else None
+        attempts = np.empty((size, len(zones)), dtype=np.int64)
+        makes = np.empty((size, len(zones)), dtype=np.int64)
+        for position in range(len(zones)):
+            in_zone = (bits >> position) & 1 == 1
+            if codes is None:
+                attempts[0, position] = np.count_nonzero(in_zone)
+                makes[0, position] = np.count_nonzero(in_zone & made)
+            else:
+                attempts[:, position] = np.bincount(codes[in_zone], minlength=size)
+                makes[:, position] = np.bincount(codes[in_zone & made], minlength=size)
+        return attempts, makes
+
+    # FGM, FGA, FG% and share of the attempts per zone, for the shots in mask (default: all)
+    @traced("transform", "ShotIndex.zone_totals")
+    def zone_totals(self, zones, mask=None):
+        attempts, makes = self._zone_counts(zones, mask)
+        total = int(mask.sum()) if mask is not None else len(self.shots)
+        return pd.DataFrame({
+            "Zone": [zone.name for zone in zones],
+            "FGM": makes[0],
+            "FGA": attempts[0],
+            "FG%": np.where(attempts[0] > 0, makes[0] / np.maximum(attempts[0], 1), np.nan).round(3),
+            "Share of FGA": (attempts[0] / max(total, 1)).round(3),
+        })
+
+    # One row per player or team ("player" or "team"): FGA plus FGM, FGA and FG% per zone
+    @traced("transform", "ShotIndex.zone_table")
+    def zone_table(self, zones, by="player", mask=None, min_attempts=0):
+        ids, codes = self.groups(by)
+        attempts, makes = self._zone_counts(zones, mask, codes, len(ids))
+        shots = np.bincount(codes[mask] if mask is not None else codes, minlength=len(ids))
+        names = self.shots.names["players" if by == "player" else "teams"]
+        table = pd.DataFrame({
+            "PLAYER_ID" if by == "player" else "TEAM_ID": ids,
+            "PLAYER_NAME" if by == "player" else "TEAM_NAME": [names.get(value, "") for value in ids.tolist()],
+            "FGA": shots,
+        })
+        for position, zone in enumerate(zones):
+            table[f"{zone.name} FGM"] = makes[:, position]
+            table[f"{zone.name} FGA"] = attempts[:, position]
+            table[f"{zone.name} FG%"] = np.where(attempts[:, position] > 0,
+                                                 makes[:, position] / np.maximum(attempts[:, position], 1), np.nan).round(3)
+        table = table[table["FGA"] >= max(min_attempts, 1)]
+        return table.sort_values("FGA", ascending=False, kind="stable").reset_index(drop=True)
+
+    # Attempts and makes per square of cell_ft feet, as (rows, columns) arrays from the baseline up
+    def heatmap(self, mask=None, cell_ft=1):
+        size = cell_ft * 10
+        columns = self.shots.columns
+        selected = mask if mask is not None else slice(None)
+        x = (np.clip(columns["x"][selected], *COURT_X) - COURT_X[0]) // size
+        y = (np.clip(columns["y"][selected], *COURT_Y) - COURT_Y[0]) // size
+        width, height = (COURT_X[1] - COURT_X[0]) // size + 1, (COURT_Y[1] - COURT_Y[0]) // size + 1
+        cells = y.astype(np.int64) * width + x
+        attempts = np.bincount(cells, minlength=width * height).reshape(height, width)
+        makes = np.bincount(cells, weights=columns["made"][selected], minlength=width * height).reshape(height, width)
+        return attempts, makes.astype(np.int64)
+
+
+# Zero-argument call that fetches one team's shot attempts for a season and parses them
+def team_shots_call(team_id, season, context=None):
+    params = {"team_id": team_id, "player_id": 0, "season_nullable": season, "context_measure_simple": "FGA",
+              "season_type_all_star": "Regular Season"}
+
+    def call():
+        if context is not None:
+            frame = context.get_frame(shotchartdetail.ShotChartDetail, **params)
+        else:
+            endpoint = fetch_endpoint(shotchartdetail.ShotChartDetail, **params)
+            with span("ShotChartDetail", "decode"):
+                frame = endpoint.get_data_frames()[0]
+        with span("parse_shots", "transform"):
+            return parse_shots(frame)
+    return call
+
+
+# Every team's shots for a season, fetched concurrently
+def fetch_season_shots(season, context=None, team_ids=None, max_in_flight=MAX_IN_FLIGHT_REQUESTS):
+    team_ids = team_ids or [team["id"] for team in static_teams.get_teams()]
+    parts = fetch_concurrently([team_shots_call(team_id, season, context) for team_id in team_ids],
+                               max_in_flight=max_in_flight)
+    return ShotTable.concat(parts)
+
+
+def shot_table_path(season):
+    return os.path.join(shot_chart_dir, f"shots_{season}.pkl")
+
+
+# Saved table if it is still valid (past seasons never expire), otherwise None
+def load_shot_table(season, path=None):
+    path = path or shot_table_path(season)
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as shots_file:
+        state = pickle.load(shots_file)
+    if state.get("version") != SHOTS_VERSION:
+        return None
+    if season >= current_season() and time.time() - state["built_at"] > shot_chart_max_age_hours * 3600:
+        return None
+    return ShotTable(state["columns"], state["game_ids"], state["names"])
+
+
+# A season's shots: the saved table, or fetched (and saved)
+def load_season_shots(season, context=None, rebuild=False):
+    shots = None if rebuild else load_shot_table(season)
+    if shots is None:
+        shots = fetch_season_shots(season, context)
+        shots.save(shot_table_path(season))
+        logging.info(f"Saved {len(shots):,} shots ({shots.nbytes / 1e6:.1f} MB) to {shot_table_path(season)}")
+    return shots
+
+
+# Team IDs of abbreviations ("GSW") from nba_api's static team list
+def team_ids_of(abbreviations):
+    by_abbreviation = {team["abbreviation"]: team["id"] for team in static_teams.get_teams()}
+    unknown = [abbreviation for abbreviation in abbreviations if abbreviation.upper() not in by_abbreviation]
+    if unknown:
+        raise SystemExit(f"Unknown team abbreviations: {', '.join(unknown)}")
+    return [by_abbreviation[abbreviation.upper()] for abbreviation in abbreviations]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Shot-level FG% by court zone, player, team or date range.")
+    parser.add_argument("--season", help="Season (e.g. 2024-25); defaults to the current season")
+    parser.add_argument("--zones", choices=list(ZONE_SETS), default="standard", help="Zone definitions")
+    parser.add_argument("--by", choices=["zone", "player", "team"], default="zone",
+                        help="One row per zone, or per player or team with a column group per zone")
+    parser.add_argument("--player", nargs="+", help="Only these players' shots")
+    parser.add_argument("--teams", nargs="+", help="Only these teams' shots (abbreviations)")
+    parser.add_argument("--start", help="First game date (YYYY-MM-DD)")
+    parser.add_argument("--end", help="Last game date (YYYY-MM-DD)")
+    parser.add_argument("--min-fga", type=int, default=50, help="Minimum attempts per player or team row")
+    parser.add_argument("--rebuild", action="store_true", help="Fetch the season again instead of the saved table")
+    parser.add_argument("--output", help="Output file (default output/shot_zones_<season>_<by>.csv)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    # Configure logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    season = args.season or current_season()
+    context = DataContext()
+    shots = load_season_shots(season, context, rebuild=args.rebuild)
+    logging.info(f"{len(shots):,} shots in {len(shots.game_ids):,} games, {shots.nbytes / 1e6:.1f} MB")
+
+    players = None
+    if args.player:
+        players = [player_id for player_id, _ in (resolve_player(name, context) for name in args.player) if player_id]
+        if not players:
+            return
+    teams = team_ids_of(args.teams) if args.teams else None
+
+    index = ShotIndex(shots)
+    zones = ZONE_SETS[args.zones]
+    start = time.perf_counter()
+    mask = shots.mask(players=players, teams=teams, start=args.start, end=args.end)
+    if args.by == "zone":
+        result = index.zone_totals(zones, mask)
+    else:
+        result = index.zone_table(zones, args.by, mask, min_attempts=args.min_fga)
+    logging.info(f"Zone query over {int(mask.sum()):,} of {len(shots):,} shots took "
+                 f"{(time.perf_counter() - start) * 1000:.1f} ms")
+
+    print(result.head(30).to_string(index=False))
+    output_file = args.output or os.path.join("output", f"shot_zones_{season}_{args.by}.csv")
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    for path in write_output(result, output_file):
+        logging.info(f"Shot zones saved to {path}")
+    log_cache_stats()
+
+
+if __name__ == "__main__":
+    main()
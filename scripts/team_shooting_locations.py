@@ -1,68 +1,96 @@
 """
 This script analyzes team shooting percentages from different areas of the court for the entire NBA season
-using the LeagueDashTeamShotLocations endpoint. It ranks teams based on their shooting efficiency by location.
+using the LeagueDashTeamShotLocations endpoint. It ranks teams based on their shooting efficiency by location, with each
+team's league percentile in every zone.
 
 Usage:
 - Run the script, and the results will be saved in the `output` directory.
 """
 
-from nba_api.stats.endpoints import leaguedashteamshotlocations
+import argparse
 import pandas as pd
 import logging
 import os
-
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+from data_context import DataContext
+from instrumentation import traced
+from league_context import build_league_context
+from output_writer import write_output
+from response_cache import log_cache_stats
 
 # Directory to save CSV files
 output_dir = "output"
-os.makedirs(output_dir, exist_ok=True)
+
+# Flattened zone FG% columns and their names in the output
+ZONE_COLUMNS = {
+    "Restricted Area_FG_PCT": "Restricted Area FG%",
+    "In The Paint (Non-RA)_FG_PCT": "Paint (Non-RA) FG%",
+    "Mid-Range_FG_PCT": "Mid-Range FG%",
+    "Corner 3_FG_PCT": "Corner 3 FG%",
+    "Above the Break 3_FG_PCT": "Above the Break 3 FG%"
+}
 
 # Fetch team shooting location stats
-def fetch_team_shooting_locations(season="2024-25"):
+def fetch_team_shooting_locations(context, season="2024-25"):
     logging.info(f"Fetching team shooting location stats for the {season} season...")
-    shooting_data = leaguedashteamshotlocations.LeagueDashTeamShotLocations(season=season).get_data_frames()[0]
+    shooting_data = context.team_shot_locations(season)
     return shooting_data
 
-# Main execution
-try:
+# Rank teams by shooting efficiency in each court zone
+@traced("transform")
+def analyze_team_shooting_locations(context, season="2024-25"):
     # Fetch team shooting location stats
-    team_shooting_stats = fetch_team_shooting_locations()
+    team_shooting_stats = fetch_team_shooting_locations(context, season)
 
-    # Debug: Print available columns
-    print("Available columns in team shooting stats:")
-    print(team_shooting_stats.columns)
+    # Debug: Log available columns
+    logging.debug("Available columns in team shooting stats: %s", team_shooting_stats.columns)
+
+    # League distribution of each zone's FG%
+    league = build_league_context(season, "team_shooting", team_shooting_stats)
 
     # Flatten the MultiIndex columns
     team_shooting_stats.columns = ['_'.join(col).strip() for col in team_shooting_stats.columns.values]
 
-    # Debug: Print flattened columns
-    print("Flattened columns in team shooting stats:")
-    print(team_shooting_stats.columns)
+    # Debug: Log flattened columns
+    logging.debug("Flattened columns in team shooting stats: %s", team_shooting_stats.columns)
+
+    # League percentile of every zone's FG%
+    team_shooting_stats = league.add_context(team_shooting_stats, list(ZONE_COLUMNS), names=ZONE_COLUMNS)
 
     # Select relevant columns
-    team_shooting_stats = team_shooting_stats[[
-        "_TEAM_NAME", "Restricted Area_FG_PCT", "In The Paint (Non-RA)_FG_PCT",
-        "Mid-Range_FG_PCT", "Corner 3_FG_PCT", "Above the Break 3_FG_PCT"
-    ]]
+    team_shooting_stats = team_shooting_stats[
+        ["_TEAM_NAME"] + list(ZONE_COLUMNS) + [f"{name} Pctl" for name in ZONE_COLUMNS.values()]
+    ]
 
     # Rename columns for clarity
-    team_shooting_stats.rename(columns={
-        "_TEAM_NAME": "Team Name",
-        "Restricted Area_FG_PCT": "Restricted Area FG%",
-        "In The Paint (Non-RA)_FG_PCT": "Paint (Non-RA) FG%",
-        "Mid-Range_FG_PCT": "Mid-Range FG%",
-        "Corner 3_FG_PCT": "Corner 3 FG%",
-        "Above the Break 3_FG_PCT": "Above the Break 3 FG%"
-    }, inplace=True)
+    team_shooting_stats = team_shooting_stats.rename(columns={"_TEAM_NAME": "Team Name", **ZONE_COLUMNS})
 
     # Sort teams by Restricted Area FG% (descending)
-    team_shooting_stats = team_shooting_stats.sort_values(by="Restricted Area FG%", ascending=False)
+    return team_shooting_stats.sort_values(by="Restricted Area FG%", ascending=False)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Rank teams by shooting efficiency in each court zone.")
+    parser.add_argument("--season", default="2024-25", help="Season to analyze, e.g. 2024-25")
+    return parser.parse_args()
+
+# Main execution
+def main():
+    args = parse_args()
+
+    # Configure logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    os.makedirs(output_dir, exist_ok=True)
+
+    try:
+        team_shooting_stats = analyze_team_shooting_locations(DataContext(), args.season)
+
+        # Save the results (CSV, plus Parquet/Arrow if NBA_OUTPUT_FORMATS asks for them)
+        output_file = os.path.join(output_dir, "team_shooting_locations_analysis.csv")
+        paths = write_output(team_shooting_stats, output_file)
+        logging.info(f"Team shooting locations analysis saved to {', '.join(paths)}")
+        log_cache_stats()
 
-    # Save the results to a CSV file
-    output_file = os.path.join(output_dir, "team_shooting_locations_analysis.csv")
-    team_shooting_stats.to_csv(output_file, index=False)
-    logging.info(f"Team shooting locations analysis saved to {output_file}")
+    except Exception as e:
+        logging.error(f"An error occurred: {e}")
 
-except Exception as e:
-    logging.error(f"An error occurred: {e}")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -1,78 +1,260 @@
-# Returns top performances from the previous day's or today's games
+# Returns top performances from the previous day's or today's games:
+#   python scripts/top_performances.py --day today        (or --date 2025-01-15; defaults to yesterday)
+#
+# Live mode follows tonight's games as they are played and keeps a top-10 leaderboard up to date:
+#   python scripts/top_performances.py --live --interval 30
+# Each poll makes one scoreboard call plus one box score call per game in progress; final games are fetched
+# once more and then dropped. Only changed box scores are rescored, and the leaderboard is printed (and
+# saved) only when it changes. `--record DIR` saves every polled response so a night can be replayed with
+# benchmarks/replay_server.py (set NBA_STATS_BASE_URL to point nba_api at the replay server).
 
 from nba_api.stats.endpoints import scoreboardv2, boxscoretraditionalv2
 import pandas as pd
+import argparse
+import heapq
 import logging
 import os
+import time
 from datetime import datetime, timedelta
-
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+from data_context import DataContext
+from instrumentation import traced
+from output_writer import write_output
+from response_cache import fetch_endpoint, log_cache_stats
+from scoring import score_frame
 
 # Directory to save CSV files
 output_dir = "output"
-os.makedirs(output_dir, exist_ok=True)
-
-# Prompt the user to choose between today or yesterday
-while True:
-    date_choice = input("Do you want to fetch top performers for 'today' or 'yesterday'? ").strip().lower()
-    if date_choice == "today":
-        selected_date = datetime.now().strftime('%Y-%m-%d')
-        break
-    elif date_choice == "yesterday":
-        selected_date = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
-        break
-    else:
-        print("Invalid input. Please enter 'today' or 'yesterday'.")
+
+# Date of the games from --date or --day ('today' or 'yesterday'); returns (date, whether its games are final)
+def select_date(day="yesterday", date=None):
+    today = datetime.now().strftime('%Y-%m-%d')
+    if date:
+        return date, date < today
+    if day == "today":
+        return today, False
+    return (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d'), True
 
 # Fetch game IDs for the selected date
-def fetch_game_ids(date):
+def fetch_game_ids(date, context):
     logging.info(f"Fetching game IDs for {date}")
-    scoreboard = scoreboardv2.ScoreboardV2(game_date=date).get_data_frames()[0]
+    scoreboard = context.get_frame(scoreboardv2.ScoreboardV2, game_date=date)
     game_ids = scoreboard['GAME_ID'].tolist()
     return game_ids
 
 # Fetch game logs for the selected date
-def fetch_game_logs(game_ids):
+def fetch_game_logs(game_ids, context, final=False):
     all_game_logs = []
     for game_id in game_ids:
         logging.info(f"Fetching game logs for game ID {game_id}")
-        boxscore = boxscoretraditionalv2.BoxScoreTraditionalV2(game_id=game_id).get_data_frames()[0]
+        # Yesterday's games are final; today's may still be in progress
+        boxscore = context.get_frame(boxscoretraditionalv2.BoxScoreTraditionalV2, final=final, game_id=game_id)
         all_game_logs.append(boxscore)
     return pd.concat(all_game_logs, ignore_index=True)
 
-# Calculate performance score
-def calculate_performance_score(row):
-    score = (
-        row['PTS'] * 1.0 +
-        row['REB'] * 1.2 +
-        row['AST'] * 1.5 +
-        row['STL'] * 3.0 +
-        row['BLK'] * 3.0
+# Box score columns kept for each top performance
+PERFORMANCE_COLUMNS = ['PLAYER_ID', 'PLAYER_NAME', 'PTS', 'REB', 'AST', 'STL', 'BLK', 'Performance_Score']
+
+# Top performances of a date, scored, as numbers
+def top_performance_lines(selected_date, context, final=False, limit=10):
+    game_ids = fetch_game_ids(selected_date, context)
+    if not game_ids:
+        return pd.DataFrame(columns=PERFORMANCE_COLUMNS)
+
+    # Fetch game logs for the selected date
+    game_logs = fetch_game_logs(game_ids, context, final=final)
+
+    # Calculate performance scores
+    game_logs['Performance_Score'] = score_frame(game_logs, "game_score")
+
+    # Rank and select top performances
+    return game_logs.nlargest(limit, 'Performance_Score')[PERFORMANCE_COLUMNS]
+
+# Presentation view of top performance lines
+@traced("transform")
+def format_performances(lines):
+    formatted = lines.copy()
+    if formatted.empty:
+        return pd.DataFrame(columns=['PLAYER_NAME', 'Formatted_Stats', 'Performance_Score'])
+
+    # Format the top performances for the CSV file
+    formatted['Formatted_Stats'] = formatted.apply(
+        lambda row: f"{row['PTS']} pts, {row['REB']} reb, {row['AST']} ast, {row['STL']} stl, {row['BLK']} blk", axis=1
     )
-    return score
 
-# Fetch game IDs for the selected date
-game_ids = fetch_game_ids(selected_date)
+    # Select relevant columns for the CSV file
+    return formatted[['PLAYER_NAME', 'Formatted_Stats', 'Performance_Score']]
 
-# Fetch game logs for the selected date
-game_logs = fetch_game_logs(game_ids)
+# Top performances of a date, scored and formatted
+def get_top_performances(selected_date, context, final=False, limit=10):
+    return format_performances(top_performance_lines(selected_date, context, final, limit))
+
+# Game status in ScoreboardV2
+IN_PROGRESS_STATUS = 2
+FINAL_STATUS = 3
+
+# Top-K scores over a changing set of players; updates are O(log n) pushes, stale entries are skipped lazily
+class Leaderboard:
+    def __init__(self, limit=10):
+        self.limit = limit
+        self.entries = {}
+        self._heap = []
 
-# Calculate performance scores
-game_logs['Performance_Score'] = game_logs.apply(calculate_performance_score, axis=1)
+    # Set a player's current score and display row; returns False if nothing changed
+    def update(self, player_id, score, row):
+        current = self.entries.get(player_id)
+        if current is not None and current[0] == score:
+            self.entries[player_id] = (score, row)
+            return False
+        self.entries[player_id] = (score, row)
+        heapq.heappush(self._heap, (-score, player_id))
+        # Rebuild once stale entries outnumber live ones
+        if len(self._heap) > 4 * len(self.entries) + 64:
+            self._heap = [(-score, player_id) for player_id, (score, _) in self.entries.items()]
+            heapq.heapify(self._heap)
+        return True
 
-# Rank and select top 10 performances
-top_performances = game_logs.nlargest(10, 'Performance_Score')
+    # Current top-K as (player_id, score, row), best first
+    def top(self):
+        result, taken, seen = [], [], set()
+        while self._heap and len(result) < self.limit:
+            entry = heapq.heappop(self._heap)
+            negative_score, player_id = entry
+            if player_id in seen or self.entries.get(player_id, (None,))[0] != -negative_score:
+                continue  # Stale: the player's score changed since this entry was pushed
+            seen.add(player_id)
+            taken.append(entry)
+            result.append((player_id, -negative_score, self.entries[player_id][1]))
+        for entry in taken:
+            heapq.heappush(self._heap, entry)
+        return result
 
-# Format the top performances for the CSV file
-top_performances['Formatted_Stats'] = top_performances.apply(
-    lambda row: f"{row['PTS']} pts, {row['REB']} reb, {row['AST']} ast, {row['STL']} stl, {row['BLK']} blk", axis=1
-)
+# Polls tonight's games and maintains the top performances as box scores change
+class LiveTracker:
+    def __init__(self, game_date, limit=10, record_dir=None):
+        self.game_date = game_date
+        self.leaderboard = Leaderboard(limit)
+        self.record_dir = record_dir
+        self.finished_games = set()
+        self.polls = 0
+        self.requests = 0
+        self._last_snapshot = {}
+        self._last_top = None
+
+    def _record(self, name, endpoint):
+        if self.record_dir:
+            step_dir = os.path.join(self.record_dir, f"step_{self.polls:04d}")
+            os.makedirs(step_dir, exist_ok=True)
+            with open(os.path.join(step_dir, f"{name}.json"), "w", encoding="utf-8") as record_file:
+                record_file.write(endpoint.nba_response.get_response())
+
+    def _fetch(self, endpoint_class, name, final=False, **params):
+        endpoint = fetch_endpoint(endpoint_class, final=final, refresh=True, **params)
+        self.requests += 1
+        self._record(name, endpoint)
+        return endpoint.get_data_frames()[0]
+
+    # Rescore one game's box score; only players whose lines changed touch the leaderboard
+    @traced("transform")
+    def apply_box_score(self, game_id, box_score):
+        played = box_score[box_score['MIN'].notna()].copy()
+        if played.empty:
+            return 0
+        played['Performance_Score'] = score_frame(played, "game_score")
+        played = played[played['Performance_Score'].notna()]
+        snapshot = self._last_snapshot.setdefault(game_id, {})
+        changed = 0
+        for player_id, name, pts, reb, ast, stl, blk, score in zip(
+            played['PLAYER_ID'], played['PLAYER_NAME'], played['PTS'], played['REB'], played['AST'],
+            played['STL'], played['BLK'], played['Performance_Score']
+        ):
+            line = (pts, reb, ast, stl, blk, score)
+            if snapshot.get(player_id) == line:
+                continue
+            snapshot[player_id] = line
+            changed += self.leaderboard.update(player_id, float(score), (name, pts, reb, ast, stl, blk))
+        return changed
+
+    # One polling cycle; returns the leaderboard lines if they changed, otherwise None
+    def poll(self):
+        self.polls += 1
+        scoreboard = self._fetch(scoreboardv2.ScoreboardV2, "scoreboardv2", game_date=self.game_date)
+        statuses = dict(zip(scoreboard['GAME_ID'], scoreboard['GAME_STATUS_ID']))
+        to_fetch = [
+            game_id for game_id, status in statuses.items()
+            if status in (IN_PROGRESS_STATUS, FINAL_STATUS) and game_id not in self.finished_games
+        ]
+        for game_id in to_fetch:
+            final = statuses[game_id] == FINAL_STATUS
+            box_score = self._fetch(boxscoretraditionalv2.BoxScoreTraditionalV2, f"boxscoretraditionalv2_{game_id}",
+                                    final=final, game_id=game_id)
+            self.apply_box_score(game_id, box_score)
+            if final:
+                # Last fetch after the final buzzer; the game is not polled again
+                self.finished_games.add(game_id)
+                self._last_snapshot.pop(game_id, None)
+
+        in_progress = sum(status == IN_PROGRESS_STATUS for status in statuses.values())
+        logging.debug(f"Poll {self.polls}: {len(to_fetch)} box scores, {in_progress} in progress, "
+                      f"{len(self.finished_games)}/{len(statuses)} final")
+        self.all_final = bool(statuses) and len(self.finished_games) == len(statuses)
+
+        top = self.leaderboard.top()
+        signature = [(player_id, round(score, 1)) for player_id, score, _ in top]
+        if signature == self._last_top:
+            return None
+        self._last_top = signature
+        return pd.DataFrame(
+            [(player_id, *row, round(score, 1)) for player_id, score, row in top], columns=PERFORMANCE_COLUMNS
+        )
+
+    # Poll until every game is final (or max_polls), printing the leaderboard whenever it changes
+    def run(self, interval=30, max_polls=None, output_file=None):
+        self.all_final = False
+        while not self.all_final and (max_polls is None or self.polls < max_polls):
+            started = time.monotonic()
+            leaderboard = self.poll()
+            if leaderboard is not None:
+                logging.info(f"Leaderboard after poll {self.polls} ({self.requests} requests so far):\n"
+                             f"{format_performances(leaderboard).to_string(index=False)}")
+                if output_file:
+                    write_output(leaderboard, output_file, view=format_performances)
+            if not self.all_final:
+                time.sleep(max(0.0, interval - (time.monotonic() - started)))
+        logging.info(f"Live tracking finished after {self.polls} polls and {self.requests} requests")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Top performances of today's or yesterday's games.")
+    parser.add_argument("--day", choices=["today", "yesterday"], default="yesterday", help="Rank today's or yesterday's games")
+    parser.add_argument("--date", help="Game date (YYYY-MM-DD) instead of --day; live mode defaults to today")
+    parser.add_argument("--live", action="store_true", help="Follow tonight's games until they are all final")
+    parser.add_argument("--interval", type=float, default=30, help="Seconds between polls in live mode")
+    parser.add_argument("--limit", type=int, default=10, help="Leaderboard size")
+    parser.add_argument("--max-polls", type=int, help="Stop live mode after this many polls")
+    parser.add_argument("--record", help="Directory to save every polled response for replay")
+    return parser.parse_args()
+
+# Main execution
+def main():
+    args = parse_args()
+
+    # Configure logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    os.makedirs(output_dir, exist_ok=True)
+
+    if args.live:
+        game_date = args.date or datetime.now().strftime('%Y-%m-%d')
+        tracker = LiveTracker(game_date, limit=args.limit, record_dir=args.record)
+        tracker.run(args.interval, args.max_polls, os.path.join(output_dir, f'top_{args.limit}_performances_live_{game_date}.csv'))
+        log_cache_stats()
+    else:
+        selected_date, final = select_date(args.day, args.date)
+        top_performances = top_performance_lines(selected_date, DataContext(), final=final)
 
-# Select relevant columns for the CSV file
-top_performances = top_performances[['PLAYER_NAME', 'Formatted_Stats', 'Performance_Score']]
+        # Save the top 10 performances (CSV shows the formatted view; Parquet/Arrow keep the numbers)
+        output_file = os.path.join(output_dir, f'top_10_performances_{selected_date}.csv')
+        paths = write_output(top_performances, output_file, view=format_performances)
+        logging.info(f"Top 10 performances saved to {', '.join(paths)}")
+        log_cache_stats()
 
-# Save the top 10 performances to a CSV file
-output_file = os.path.join(output_dir, f'top_10_performances_{selected_date}.csv')
-top_performances.to_csv(output_file, index=False)
-logging.info(f"Top 10 performances saved to {output_file}")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+This module is the shared HTTP transport for every nba_api call: a pooled `requests.Session` with
+rate limiting, retries and per-call timeout budgets, installed as nba_api's session.
+
+Key Features:
+1. Keep-alive connection pooling sized for the concurrent fetch pool (`NBA_POOL_SIZE`, default 16).
+   Callers that run several fetch pools at once grow it with `reserve_connections`.
+2. A token-bucket rate limiter per host (`NBA_REQUESTS_PER_SECOND`, default 5, bursts of `NBA_BURST`).
+   Every HTTP attempt takes a token, including retries; cache hits never reach the transport.
+3. Exponential backoff with full jitter on 429 and 5xx responses and on connection errors/timeouts,
+   honouring `Retry-After` (`NBA_MAX_RETRIES`, `NBA_BACKOFF_BASE`, `NBA_BACKOFF_CAP`).
+4. A timeout budget per call (`NBA_CALL_TIMEOUT`, default 120s) shared by all attempts, so retries
+   never stretch one call past its budget.
+5. Metrics: requests, attempts, retries, failures, responses by status and a latency histogram.
+6. `NBA_STATS_BASE_URL` points nba_api at another server, e.g. `http://127.0.0.1:8767/stats/{endpoint}`
+   for a local replay server.
+7. `NBA_RECORD_DIR` saves every response as a fixture and `NBA_REPLAY_DIR` answers requests from the
+   fixtures instead of the network (see fixtures.py).
+
+Usage:
+- `install_transport()` (called by `fetch_endpoint`) routes nba_api through the shared session.
+- `get_transport_metrics()` returns the counters; `log_transport_metrics()` logs them.
+"""
+
+from nba_api.stats.library.http import NBAStatsHTTP
+from urllib.parse import urlparse
+import logging
+import os
+import random
+import threading
+import time
+import requests
+from fixtures import transport_adapter
+from instrumentation import span
+
+# Transport settings
+requests_per_second = float(os.environ.get("NBA_REQUESTS_PER_SECOND", 5))
+burst = int(os.environ.get("NBA_BURST", 5))
+max_retries = int(os.environ.get("NBA_MAX_RETRIES", 5))
+backoff_base = float(os.environ.get("NBA_BACKOFF_BASE", 1.0))
+backoff_cap = float(os.environ.get("NBA_BACKOFF_CAP", 30.0))
+call_timeout = float(os.environ.get("NBA_CALL_TIMEOUT", 120))
+pool_size = int(os.environ.get("NBA_POOL_SIZE", 16))
+
+# Alternative stats server (e.g. a local replay server), as a URL template with an {endpoint} placeholder
+stats_base_url = os.environ.get("NBA_STATS_BASE_URL")
+
+# Responses worth retrying
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, float("inf"))
+
+
+# Allows `rate` requests per second on average, with bursts of up to `capacity`
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = max(capacity, 1)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    # Block until a token is available or the deadline passes; returns False on timeout
+    def acquire(self, deadline=None):
+        if not self.rate:
+            return True
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if deadline is not None and now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class TransportMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.attempts = 0
+        self.retries = 0
+        self.failures = 0
+        self.statuses = {}
+        self.latency_histogram = [0] * len(LATENCY_BUCKETS)
+
+    def record_attempt(self, seconds, status):
+        with self._lock:
+            self.attempts += 1
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    self.latency_histogram[i] += 1
+                    break
+
+    def increment(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "attempts": self.attempts,
+                "retries": self.retries,
+                "failures": self.failures,
+                "statuses": dict(self.statuses),
+                "latency_histogram": {
+                    ("inf" if bound == float("inf") else f"<={bound}s"): count
+                    for bound, count in zip(LATENCY_BUCKETS, self.latency_histogram)
+                },
+            }
+
+
+# Session that rate-limits, retries and enforces a timeout budget on every request
+class ResilientSession(requests.Session):
+    def __init__(self, rate=requests_per_second, capacity=burst, retries=max_retries,
+                 budget=call_timeout, pool=pool_size):
+        super().__init__()
+        self.rate = rate
+        self.capacity = capacity
+        self.max_retries = retries
+        self.budget = budget
+        self.metrics = TransportMetrics()
+        self._buckets = {}
+        self._buckets_lock = threading.Lock()
+        # The network, or recorded fixtures (NBA_REPLAY_DIR / NBA_RECORD_DIR, see fixtures.py)
+        adapter = transport_adapter(pool)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def bucket(self, host):
+        with self._buckets_lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate, self.capacity)
+            return self._buckets[host]
+
+    # Seconds to wait before retry number `attempt` (0-based), with full jitter
+    def backoff(self, attempt, response=None):
+        if response is not None and response.headers.get("Retry-After", "").isdigit():
+            return float(response.headers["Retry-After"])
+        return random.uniform(0, min(backoff_cap, backoff_base * 2 ** attempt))
+
+    def request(self, method, url, **kwargs):
+        self.metrics.increment("requests")
+        deadline = time.monotonic() + self.budget
+        bucket = self.bucket(urlparse(url).netloc)
+        attempt_timeout = kwargs.pop("timeout", None)
+        response, error = None, None
+
+        for attempt in range(self.max_retries + 1):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not bucket.acquire(deadline):
+                break
+            remaining = deadline - time.monotonic()
+            timeout = remaining if attempt_timeout is None else min(attempt_timeout, remaining)
+            start = time.monotonic()
+            with span(urlparse(url).path, "network", attempt=attempt) as request_span:
+                try:
+                    response = super().request(method, url, timeout=timeout, **kwargs)
+                    error = None
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    response, error = None, e
+                request_span.set(status=response.status_code if response is not None else type(error).__name__)
+            self.metrics.record_attempt(time.monotonic() - start, response.status_code if response is not None else "error")
+
+            if error is None and response.status_code not in RETRY_STATUSES:
+                return response
+            if attempt == self.max_retries:
+                break
+            delay = self.backoff(attempt, response)
+            if time.monotonic() + delay >= deadline:
+                break
+            reason = error if error is not None else f"HTTP {response.status_code}"
+            logging.warning(f"Retrying {urlparse(url).path} in {delay:.1f}s after {reason} (attempt {attempt + 1})")
+            self.metrics.increment("retries")
+            time.sleep(delay)
+
+        self.metrics.increment("failures")
+        if response is not None:
+            return response
+        if error is not None:
+            raise error
+        raise requests.Timeout(f"Timeout budget of {self.budget:.0f}s exhausted for {url}")
+
+
+# Process-wide session, installed into nba_api on first use
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = ResilientSession(pool=pool_size)
+        return _session
+
+
+# Grow the connection pool to at least `count` connections, e.g. for several fetch pools running at once
+def reserve_connections(count):
+    global pool_size
+    with _session_lock:
+        if count <= pool_size:
+            return
+        pool_size = count
+        if _session is not None:
+            adapter = transport_adapter(pool_size)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+
+
+def install_transport():
+    session = get_session()
+    if NBAStatsHTTP.get_session() is not session:
+        NBAStatsHTTP.set_session(session)
+        if stats_base_url:
+            NBAStatsHTTP.base_url = stats_base_url
+    return session
+
+
+def get_transport_metrics():
+    return get_session().metrics.snapshot()
+
+
+def log_transport_metrics():
+    if _session is not None:
+        logging.info(f"Transport: {_session.metrics.snapshot()}")
@@ -0,0 +1,357 @@
+"""
+This module is a local multi-season stats warehouse: a single SQLite file holding player game logs,
+team game logs, box scores and line scores, partitioned by season and game date.
+
+Key Features:
+1. Every table carries SEASON and GAME_DATE columns and is indexed on (SEASON, GAME_DATE) and GAME_ID.
+2. Incremental ingestion: for each date, one ScoreboardV2 call lists the games, and only final games whose
+   IDs are not stored yet are fetched (box score and line score per game, concurrently, plus one
+   league-wide player and team game log call for the date).
+3. Read helpers that return frames shaped like the live endpoints, so scripts can read from the warehouse
+   instead of stats.nba.com. Set `NBA_DATA_SOURCE=warehouse` to make `DataContext` use them. Season-wide
+   reads need the whole season so far (from the opener to the last stored game, every date ingested with
+   all of its games final); a partly ingested season is read from the live endpoints.
+4. After an ingest adds games, the `players` league context (per-game stat distributions for percentile
+   and z-score lookups, see league_context.py) of each affected season is rebuilt from the stored totals.
+
+Usage:
+- python scripts/warehouse.py ingest                                   # Yesterday's games
+- python scripts/warehouse.py ingest --date 2025-03-18
+- python scripts/warehouse.py ingest --start 2024-10-22 --end 2025-04-13
+- python scripts/warehouse.py summary                                  # Games and rows per season
+"""
+
+from nba_api.stats.endpoints import scoreboardv2, boxscoretraditionalv2, boxscoresummaryv2, leaguegamelog
+from datetime import datetime, timedelta
+import argparse
+import logging
+import os
+import sqlite3
+import threading
+import pandas as pd
+from concurrent_fetch import fetch_concurrently, game_frame_call
+from instrumentation import span
+from league_context import build_league_context
+from response_cache import current_season, fetch_endpoint, log_cache_stats
+
+# Warehouse location
+warehouse_path = os.environ.get("NBA_WAREHOUSE_PATH", os.path.join("warehouse", "nba_warehouse.sqlite"))
+
+# Fact tables, all partitioned by SEASON and GAME_DATE
+TABLES = ("player_game_logs", "team_game_logs", "box_scores", "line_scores")
+
+# Game status in ScoreboardV2 for a finished game
+FINAL_STATUS = 3
+
+# Stat columns summed into season totals
+TOTAL_COLUMNS = [
+    "MIN", "FGM", "FGA", "FG3M", "FG3A", "FTM", "FTA", "OREB", "DREB", "REB",
+    "AST", "STL", "BLK", "TOV", "PF", "PTS", "PLUS_MINUS"
+]
+
+
+class Warehouse:
+    def __init__(self, path=warehouse_path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        # Partly ingested seasons already warned about
+        self._partial_seasons = set()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS games (
+                GAME_ID TEXT PRIMARY KEY,
+                SEASON TEXT NOT NULL,
+                GAME_DATE TEXT NOT NULL,
+                HOME_TEAM_ID INTEGER,
+                VISITOR_TEAM_ID INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS games_partition ON games (SEASON, GAME_DATE);
+            CREATE TABLE IF NOT EXISTS ingested_dates (
+                GAME_DATE TEXT PRIMARY KEY,
+                GAME_COUNT INTEGER NOT NULL,
+                COMPLETE INTEGER NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+
+    def _table_exists(self, table):
+        return self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone() is not None
+
+    # Append rows to a fact table, creating it and its partition indexes on first write
+    def _append(self, table, df):
+        if df.empty:
+            return
+        with span(table, "write", rows=len(df)):
+            df.to_sql(table, self._conn, if_exists="append", index=False)
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_partition ON {table} (SEASON, GAME_DATE)")
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_game ON {table} (GAME_ID)")
+
+    def stored_game_ids(self, game_ids):
+        if not game_ids:
+            return set()
+        placeholders = ", ".join("?" for _ in game_ids)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT GAME_ID FROM games WHERE GAME_ID IN ({placeholders})", list(game_ids)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    # Store every dataset of newly ingested games in one transaction
+    def store_games(self, games, frames):
+        with self._lock:
+            try:
+                for table in TABLES:
+                    self._append(table, frames[table])
+                games[["GAME_ID", "SEASON", "GAME_DATE", "HOME_TEAM_ID", "VISITOR_TEAM_ID"]].to_sql(
+                    "games", self._conn, if_exists="append", index=False
+                )
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+
+    # Record that a date was ingested; complete means every game of the date was final
+    def mark_date(self, game_date, complete):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ingested_dates VALUES (?, (SELECT COUNT(*) FROM games WHERE GAME_DATE = ?), ?)",
+                (game_date, game_date, int(complete)),
+            )
+            self._conn.commit()
+
+    def is_date_complete(self, game_date):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COMPLETE FROM ingested_dates WHERE GAME_DATE = ?", (game_date,)
+            ).fetchone()
+        return bool(row and row[0])
+
+    # Rows of a fact table, filtered by partition and/or game IDs
+    def read(self, table, season=None, game_date=None, game_ids=None, where=None, params=()):
+        clauses, values = [], []
+        if season is not None:
+            clauses.append("SEASON = ?")
+            values.append(season)
+        if game_date is not None:
+            clauses.append("GAME_DATE = ?")
+            values.append(game_date)
+        if game_ids is not None:
+            clauses.append(f"GAME_ID IN ({', '.join('?' for _ in game_ids)})")
+            values.extend(game_ids)
+        if where:
+            clauses.append(where)
+            values.extend(params)
+        query = f"SELECT * FROM {table}"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        with self._lock, span(table, "read"):
+            if table != "games" and not self._table_exists(table):
+                return pd.DataFrame()
+            return pd.read_sql_query(query, self._conn, params=values)
+
+    def has_season(self, season):
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM games WHERE SEASON = ? LIMIT 1", (season,)).fetchone() is not None
+
+    # Whether the whole season so far is stored: the opener is, and every date from the opener to the last
+    # stored game was ingested with all of its games final
+    def has_full_season(self, season):
+        with self._lock:
+            opener = self._conn.execute(
+                "SELECT GAME_DATE FROM games WHERE GAME_ID = ?", (opener_game_id(season),)
+            ).fetchone()
+            if opener is None:
+                return False
+            last = self._conn.execute("SELECT MAX(GAME_DATE) FROM games WHERE SEASON = ?", (season,)).fetchone()[0]
+            covered = self._conn.execute(
+                "SELECT COUNT(*) FROM ingested_dates WHERE GAME_DATE BETWEEN ? AND ? AND COMPLETE = 1",
+                (opener[0], last),
+            ).fetchone()[0]
+        days = (datetime.strptime(last, "%Y-%m-%d") - datetime.strptime(opener[0], "%Y-%m-%d")).days + 1
+        return covered == days
+
+    # Whether season-wide reads can come from the warehouse. A partly ingested season is read from the live
+    # endpoints instead, with a warning the first time.
+    def can_read_season(self, season):
+        if self.has_full_season(season):
+            return True
+        if self.has_season(season) and season not in self._partial_seasons:
+            self._partial_seasons.add(season)
+            logging.warning(f"The warehouse holds only part of {season}; reading the season from the live endpoints")
+        return False
+
+    # Scoreboard-shaped frame of the games stored for a date
+    def scoreboard(self, game_date):
+        return self.read("games", game_date=game_date)
+
+    # PlayerGameLog-shaped frame (newest game first) for one player and season
+    def player_game_log(self, player_id, season):
+        log = self.read("player_game_logs", season=season, where="PLAYER_ID = ?", params=(int(player_id),))
+        if log.empty:
+            return log
+        return log.sort_values("GAME_DATE", ascending=False, ignore_index=True)
+
+    # LeagueDashPlayerStats-shaped season totals aggregated from the stored game logs
+    def player_season_totals(self, season):
+        return aggregate_season_totals(self.read("player_game_logs", season=season))
+
+    def summary(self):
+        with self._lock:
+            return pd.read_sql_query(
+                "SELECT SEASON, COUNT(*) AS GAMES, MIN(GAME_DATE) AS FIRST_DATE, MAX(GAME_DATE) AS LAST_DATE "
+                "FROM games GROUP BY SEASON ORDER BY SEASON",
+                self._conn,
+            )
+
+    # Frames for an endpoint call the warehouse can answer, keyed by frame index, or None
+    def read_endpoint(self, endpoint_name, params):
+        if endpoint_name == "ScoreboardV2" and "game_date" in params:
+            game_date = str(params["game_date"])[:10]
+            if self.is_date_complete(game_date):
+                return {0: self.scoreboard(game_date)}
+        elif endpoint_name in ("BoxScoreTraditionalV2", "BoxScoreSummaryV2") and "game_id" in params:
+            game_id = str(params["game_id"])
+            if self.stored_game_ids([game_id]):
+                if endpoint_name == "BoxScoreTraditionalV2":
+                    return {0: self.read("box_scores", game_ids=[game_id])}
+                return {5: self.read("line_scores", game_ids=[game_id])}  # LineScore DataFrame
+        elif endpoint_name == "PlayerGameLog" and "player_id" in params and "season" in params:
+            if self.can_read_season(params["season"]):
+                return {0: self.player_game_log(params["player_id"], params["season"])}
+        return None
+
+
+# Process-wide warehouse, opened on first use
+_warehouse = None
+_warehouse_lock = threading.Lock()
+
+
+def get_warehouse():
+    global _warehouse
+    with _warehouse_lock:
+        if _warehouse is None:
+            _warehouse = Warehouse()
+        return _warehouse
+
+
+# Regular-season game IDs are "002", the season's two-digit start year and the game number
+def opener_game_id(season):
+    return f"002{season[2:4]}00001"
+
+
+# LeagueDashPlayerStats-shaped totals (one row per player) from player game log rows
+def aggregate_season_totals(logs):
+    if logs.empty:
+        return logs
+    logs = logs.sort_values("GAME_DATE")
+    totals = logs.groupby("PLAYER_ID").agg(
+        PLAYER_NAME=("PLAYER_NAME", "last"),
+        TEAM_ID=("TEAM_ID", "last"),
+        TEAM_ABBREVIATION=("TEAM_ABBREVIATION", "last"),
+        GP=("GAME_ID", "count"),
+        **{column: (column, "sum") for column in TOTAL_COLUMNS},
+    )
+    return totals.reset_index()
+
+
+# Tag a frame with its partition columns
+def with_partition(df, season, game_date):
+    df = df.copy()
+    df["SEASON"] = season
+    df["GAME_DATE"] = game_date
+    return df
+
+
+# Ingest the final games of one date that are not stored yet; returns the number of new games
+def ingest_date(warehouse, game_date):
+    season = current_season(datetime.strptime(game_date, "%Y-%m-%d"))
+    scoreboard = fetch_endpoint(scoreboardv2.ScoreboardV2, game_date=game_date).get_data_frames()[0]
+    final_games = scoreboard[scoreboard["GAME_STATUS_ID"] == FINAL_STATUS]
+    complete = len(final_games) == len(scoreboard)
+
+    game_ids = final_games["GAME_ID"].tolist()
+    stored_ids = warehouse.stored_game_ids(game_ids)
+    new_ids = [game_id for game_id in game_ids if game_id not in stored_ids]
+    if not new_ids:
+        logging.info(f"{game_date}: nothing new ({len(game_ids)} final games already stored)")
+        warehouse.mark_date(game_date, complete)
+        return 0
+
+    calls = [game_frame_call(boxscoretraditionalv2.BoxScoreTraditionalV2, game_id, 0, final=True) for game_id in new_ids]
+    calls += [game_frame_call(boxscoresummaryv2.BoxScoreSummaryV2, game_id, 5, final=True) for game_id in new_ids]
+    # One league-wide call per date for player and team game logs
+    log_date = datetime.strptime(game_date, "%Y-%m-%d").strftime("%m/%d/%Y")
+    for mode in ("P", "T"):
+        calls.append(lambda mode=mode: fetch_endpoint(
+            leaguegamelog.LeagueGameLog, final=complete, season=season, player_or_team_abbreviation=mode,
+            date_from_nullable=log_date, date_to_nullable=log_date,
+        ).get_data_frames()[0])
+    results = fetch_concurrently(calls)
+
+    count = len(new_ids)
+    box_scores = pd.concat(results[:count], ignore_index=True)
+    line_scores = pd.concat(results[count:2 * count], ignore_index=True)
+    player_logs, team_logs = results[2 * count], results[2 * count + 1]
+    frames = {
+        "box_scores": with_partition(box_scores, season, game_date),
+        "line_scores": with_partition(line_scores.drop(columns=["GAME_DATE_EST"], errors="ignore"), season, game_date),
+        # The game logs carry their own GAME_DATE; keep only the new games
+        "player_game_logs": with_partition(player_logs[player_logs["GAME_ID"].isin(new_ids)], season, game_date),
+        "team_game_logs": with_partition(team_logs[team_logs["GAME_ID"].isin(new_ids)], season, game_date),
+    }
+    games = final_games[final_games["GAME_ID"].isin(new_ids)].assign(SEASON=season, GAME_DATE=game_date)
+    warehouse.store_games(games, frames)
+    warehouse.mark_date(game_date, complete)
+    logging.info(f"{game_date}: stored {count} new games")
+    return count
+
+
+def date_range(start, end):
+    day = datetime.strptime(start, "%Y-%m-%d")
+    last = datetime.strptime(end, "%Y-%m-%d")
+    while day <= last:
+        yield day.strftime("%Y-%m-%d")
+        day += timedelta(days=1)
+
+
+def main():
+    # Configure logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Local NBA stats warehouse.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    ingest = subparsers.add_parser("ingest", help="Fetch and store games that are not in the warehouse yet")
+    ingest.add_argument("--date", help="Single date (YYYY-MM-DD); defaults to yesterday")
+    ingest.add_argument("--start", help="First date of a range (YYYY-MM-DD)")
+    ingest.add_argument("--end", help="Last date of a range (YYYY-MM-DD); defaults to yesterday")
+    subparsers.add_parser("summary", help="Show stored games per season")
+    args = parser.parse_args()
+
+    warehouse = get_warehouse()
+    if args.command == "summary":
+        print(warehouse.summary().to_string(index=False))
+        return
+
+    yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+    dates = list(date_range(args.start, args.end or yesterday)) if args.start else [args.date or yesterday]
+    new_games = {game_date: ingest_date(warehouse, game_date) for game_date in dates}
+    logging.info(f"Ingested {sum(new_games.values())} new games across {len(dates)} dates into {warehouse.path}")
+
+    # Rebuild the league distributions of the seasons that changed, once per ingest
+    seasons = {current_season(datetime.strptime(game_date, "%Y-%m-%d")) for game_date, count in new_games.items() if count}
+    for season in sorted(seasons):
+        league = build_league_context(season, "players", warehouse.player_season_totals(season))
+        league.save()
+        logging.info(f"Rebuilt the players league context for {season}")
+    log_cache_stats()
+
+
+if __name__ == "__main__":
+    main()